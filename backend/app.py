@@ -4,7 +4,7 @@ VenueBook Backend Application
 Main entry point for the Flask application.
 Registers all route blueprints and configures the application.
 """
-from flask import Flask, jsonify
+from flask import Flask, jsonify, send_from_directory
 from flask_cors import CORS
 
 from extensions import socketio
@@ -27,6 +27,10 @@ def create_app():
     # Load configuration
     app.config.from_object(Config)
     
+    # Serialize responses with orjson
+    from utils.json_provider import OrjsonProvider
+    app.json = OrjsonProvider(app)
+    
     # Initialize CORS
     CORS(app, origins=Config.CORS_ORIGINS)
     
@@ -35,10 +39,40 @@ def create_app():
     # but sticking to Config is safer first.
     socketio.init_app(app, cors_allowed_origins=Config.CORS_ORIGINS, async_mode='eventlet')
     
+    # Size the native thread pool used by bcrypt and photo uploads
+    from utils.password_utils import configure_thread_pool
+    configure_thread_pool(app)
+    
     # Configure Cloudinary
     from utils.image_utils import configure_cloudinary
     configure_cloudinary(app)
     
+    # Per-request SQL statistics, Server-Timing header and slow-query log
+    from utils import query_stats
+    query_stats.init_app(app)
+    
+    # Prometheus metrics at /metrics
+    from utils import metrics
+    metrics.init_app(app)
+    
+    # Read replicas: keep callers on the primary right after their own writes
+    from utils import db
+    db.init_app(app)
+    
+    # Background delivery of outbox events (notifications, audit logs)
+    from utils import outbox
+    outbox.init_app(app)
+    
+    # Token bucket rate limits and priority load shedding
+    from utils import rate_limit
+    rate_limit.init_app(app)
+    
+    # Serve locally stored images when the local storage backend is used
+    if app.config['IMAGE_STORAGE'] == 'local':
+        @app.route(f"{app.config['IMAGE_LOCAL_URL'].rstrip('/')}/<path:filename>")
+        def local_media(filename):
+            return send_from_directory(app.config['IMAGE_LOCAL_ROOT'], filename)
+    
     # Register blueprints
     app.register_blueprint(auth_bp)
     app.register_blueprint(venues_bp)
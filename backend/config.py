@@ -15,11 +15,68 @@ class Config:
     # Flask Configuration
     SECRET_KEY = os.environ.get('SECRET_KEY')
     
+    # Authentication Configuration
+    JWT_EXPIRY_DAYS = int(os.environ.get('JWT_EXPIRY_DAYS', 7))
+    PRINCIPAL_CACHE_TTL = int(os.environ.get('PRINCIPAL_CACHE_TTL', 60))
+    PRINCIPAL_CACHE_SIZE = int(os.environ.get('PRINCIPAL_CACHE_SIZE', 10000))
+    PRINCIPAL_CHANGES_POLL_INTERVAL = int(os.environ.get('PRINCIPAL_CHANGES_POLL_INTERVAL', 5))
+    
+    # Password Hashing Configuration
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 4))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 64))
+    
     # Database Configuration
     DB_HOST = os.environ.get('DB_HOST')
     DB_USER = os.environ.get('DB_USER')
     DB_PASSWORD = os.environ.get('DB_PASSWORD')
     DB_NAME = os.environ.get('DB_NAME')
+    DB_PORT = int(os.environ.get('DB_PORT', 3306))
+    
+    # Read Replica Configuration (get_db_connection(read_only=True); DB_REPLICA_HOSTS="host[:port],...")
+    DB_REPLICA_HOSTS = os.environ.get('DB_REPLICA_HOSTS')
+    DB_REPLICA_USER = os.environ.get('DB_REPLICA_USER')
+    DB_REPLICA_PASSWORD = os.environ.get('DB_REPLICA_PASSWORD')
+    REPLICA_MAX_LAG = int(os.environ.get('REPLICA_MAX_LAG', 5))
+    REPLICA_CHECK_INTERVAL = int(os.environ.get('REPLICA_CHECK_INTERVAL', 5))
+    READ_YOUR_WRITES_SECONDS = int(os.environ.get('READ_YOUR_WRITES_SECONDS', 10))
+    
+    # Admin Listing Totals (filter-wide count/sum memo, seconds)
+    LISTING_TOTALS_TTL = int(os.environ.get('LISTING_TOTALS_TTL', 30))
+    LISTING_TOTALS_SIZE = int(os.environ.get('LISTING_TOTALS_SIZE', 1000))
+    
+    # Audit Log Retention (months kept in the logs table; older partitions are archived)
+    LOG_RETENTION_MONTHS = int(os.environ.get('LOG_RETENTION_MONTHS', 12))
+    LOG_ARCHIVE_DIR = os.environ.get('LOG_ARCHIVE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'archive', 'logs'))
+    LOG_ARCHIVE_MAX_DAYS = int(os.environ.get('LOG_ARCHIVE_MAX_DAYS', 92))
+    
+    # SQL Instrumentation Configuration (can be changed at runtime via /api/admin/sql-stats)
+    SQL_STATS_ENABLED = os.environ.get('SQL_STATS_ENABLED', 'false').lower() == 'true'
+    SQL_STATS_SAMPLE_RATE = float(os.environ.get('SQL_STATS_SAMPLE_RATE', 1.0))
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 200))
+    SLOW_QUERY_LOG = os.environ.get('SLOW_QUERY_LOG')
+    
+    # Outbox Dispatcher Configuration (post-commit notifications and audit logs)
+    OUTBOX_DISPATCHER_ENABLED = os.environ.get('OUTBOX_DISPATCHER_ENABLED', 'true').lower() == 'true'
+    OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', 100))
+    OUTBOX_POLL_INTERVAL = float(os.environ.get('OUTBOX_POLL_INTERVAL', 1.0))
+    OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', 5))
+    
+    # Rate Limiting Configuration ('memory' per worker, or 'mysql' shared across workers)
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')
+    RATE_LIMITS = os.environ.get('RATE_LIMITS')
+    SHED_MAX_IN_FLIGHT = int(os.environ.get('SHED_MAX_IN_FLIGHT', 200))
+    
+    # Recommendations Configuration (seconds between reloads of the precomputed neighbours)
+    RECOMMENDATIONS_RELOAD_INTERVAL = float(os.environ.get('RECOMMENDATIONS_RELOAD_INTERVAL', 900))
+    
+    # Presence Configuration (seconds before a disconnected user is reported offline)
+    PRESENCE_OFFLINE_GRACE = float(os.environ.get('PRESENCE_OFFLINE_GRACE', 5))
+    PRESENCE_MAX_SUBSCRIPTIONS = int(os.environ.get('PRESENCE_MAX_SUBSCRIPTIONS', 200))
+    
+    # Metrics Configuration (if set, /metrics requires "Authorization: Bearer <token>")
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
     
     # CORS Configuration
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:5173').split(',')
@@ -27,4 +84,20 @@ class Config:
     # Cloudinary Configuration
     CLOUDINARY_CLOUD_NAME = os.environ.get('CLOUDINARY_CLOUD_NAME')
     CLOUDINARY_API_KEY = os.environ.get('CLOUDINARY_API_KEY')
-    CLOUDINARY_API_SECRET = os.environ.get('CLOUDINARY_API_SECRET') 
\ No newline at end of file
+    CLOUDINARY_API_SECRET = os.environ.get('CLOUDINARY_API_SECRET')
+    
+    # Geocoding Configuration ('offline' city centroids or 'nominatim')
+    GEOCODER = os.environ.get('GEOCODER', 'offline')
+    GEOCODER_USER_AGENT = os.environ.get('GEOCODER_USER_AGENT', 'VenueBook/1.0')
+    GEOCODER_COUNTRY_CODES = os.environ.get('GEOCODER_COUNTRY_CODES', 'pk')
+    GEOCODER_TIMEOUT = float(os.environ.get('GEOCODER_TIMEOUT', 3.0))
+    
+    # Image Storage Configuration ('cloudinary' or 'local')
+    IMAGE_STORAGE = os.environ.get('IMAGE_STORAGE', 'cloudinary')
+    IMAGE_LOCAL_ROOT = os.environ.get('IMAGE_LOCAL_ROOT', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'media'))
+    IMAGE_LOCAL_URL = os.environ.get('IMAGE_LOCAL_URL', '/media')
+    
+    # Photo Upload Pipeline Configuration
+    PHOTO_UPLOAD_CONCURRENCY = int(os.environ.get('PHOTO_UPLOAD_CONCURRENCY', 4))
+    PHOTO_UPLOAD_RETRIES = int(os.environ.get('PHOTO_UPLOAD_RETRIES', 2))
+    PHOTO_UPLOAD_BACKOFF = float(os.environ.get('PHOTO_UPLOAD_BACKOFF', 0.5))
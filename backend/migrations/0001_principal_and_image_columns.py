@@ -0,0 +1,31 @@
+"""
+Schema deltas added since the baseline schema:
+
+- users.status (blocked accounts are refused at login and by token_required)
+- venues.cover_image_id (listing cover image)
+- venue_images thumb/card/full derivative URLs and content_hash
+- image_assets (content-addressed index of stored images)
+"""
+from utils.migrations import add_column, add_index
+
+
+def upgrade(cursor):
+    add_column(cursor, 'users', 'status', "ENUM('active','blocked') DEFAULT 'active' AFTER role")
+    add_column(cursor, 'venues', 'cover_image_id', "INT NULL AFTER status")
+
+    add_column(cursor, 'venue_images', 'thumb_url', "VARCHAR(1000) NULL AFTER image_url")
+    add_column(cursor, 'venue_images', 'card_url', "VARCHAR(1000) NULL AFTER thumb_url")
+    add_column(cursor, 'venue_images', 'full_url', "VARCHAR(1000) NULL AFTER card_url")
+    add_column(cursor, 'venue_images', 'content_hash', "CHAR(64) NULL AFTER full_url")
+    add_index(cursor, 'venue_images', 'idx_venue_content_hash', 'venue_id, content_hash')
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS image_assets (
+            content_hash CHAR(64) PRIMARY KEY,
+            url VARCHAR(1000) NOT NULL,
+            thumb_url VARCHAR(1000) NULL,
+            card_url VARCHAR(1000) NULL,
+            full_url VARCHAR(1000) NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
@@ -0,0 +1,55 @@
+"""
+Secondary indexes for the route queries.
+
+Each index is listed with the queries it serves. scripts/check_query_plans.py
+EXPLAINs the SQL of every GET route and fails on full table scans.
+"""
+from utils.migrations import add_index
+
+INDEXES = [
+    # Owner/admin booking lists and analytics by venue, availability checks by date
+    ('bookings', 'idx_bookings_venue_date_status', 'venue_id, event_date, status'),
+    # User booking history, newest first
+    ('bookings', 'idx_bookings_user_created', 'user_id, created_at'),
+    # Admin bookings list, default ORDER BY b.created_at DESC
+    ('bookings', 'idx_bookings_created', 'created_at'),
+    # Public venue search: status = 'active' AND city = ? [AND type = ?] ORDER BY rating
+    ('venues', 'idx_venues_status_city_type_rating', 'status, city, type, rating'),
+    # Notification bell: WHERE user_id = ? [AND is_read = 0] ORDER BY created_at DESC
+    ('notifications', 'idx_notifications_user_read_created', 'user_id, is_read, created_at'),
+    # Revenue: payment_status = 'completed' by payment_date
+    ('booking_payments', 'idx_payments_status_date', 'payment_status, payment_date'),
+    # Admin logs, newest first, optionally by target table
+    ('logs', 'idx_logs_created_table', 'created_at, target_table'),
+    # Venue detail reviews, newest first
+    ('venue_reviews', 'idx_reviews_venue_date', 'venue_id, review_date'),
+    # Recent reviews on the landing page and the admin reviews list
+    ('venue_reviews', 'idx_reviews_date', 'review_date'),
+    # Public stats user count and admin user list filtered by role
+    ('users', 'idx_users_role_created', 'role, created_at'),
+]
+
+
+def upgrade(cursor):
+    for table, index, columns in INDEXES:
+        add_index(cursor, table, index, columns)
+
+    # create_booking upserts availability with ON DUPLICATE KEY UPDATE, which needs a
+    # unique key. Merge duplicate slots first, keeping the row and its "booked" state.
+    cursor.execute("""
+        UPDATE venue_availability va
+        JOIN (
+            SELECT venue_id, date, slot, MIN(is_available) as is_available
+            FROM venue_availability
+            GROUP BY venue_id, date, slot
+            HAVING COUNT(*) > 1
+        ) dup ON dup.venue_id = va.venue_id AND dup.date = va.date AND dup.slot <=> va.slot
+        SET va.is_available = dup.is_available
+    """)
+    cursor.execute("""
+        DELETE newer FROM venue_availability newer
+        JOIN venue_availability older
+          ON older.venue_id = newer.venue_id AND older.date = newer.date
+         AND older.slot <=> newer.slot AND older.availability_id < newer.availability_id
+    """)
+    add_index(cursor, 'venue_availability', 'uq_availability_venue_date_slot', 'venue_id, date, slot', unique=True)
@@ -0,0 +1,50 @@
+"""
+Daily venue fact table for revenue and booking time series, backfilled from
+the existing bookings and payments.
+
+The backfill is the daily_stats.rebuild() SQL as of this migration, kept
+inline so later changes to utils/daily_stats.py do not change it.
+"""
+
+
+def upgrade(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS venue_daily_stats (
+            venue_id INT NOT NULL,
+            day DATE NOT NULL,
+            bookings_created INT NOT NULL DEFAULT 0,
+            bookings_confirmed INT NOT NULL DEFAULT 0,
+            bookings_completed INT NOT NULL DEFAULT 0,
+            revenue_completed DECIMAL(14,2) NOT NULL DEFAULT 0,
+            revenue_pending DECIMAL(14,2) NOT NULL DEFAULT 0,
+            PRIMARY KEY (venue_id, day),
+            INDEX idx_daily_stats_day (day)
+        )
+    """)
+
+    cursor.execute("DELETE FROM venue_daily_stats")
+
+    cursor.execute("""
+        INSERT INTO venue_daily_stats (venue_id, day, bookings_created, bookings_confirmed, bookings_completed)
+        SELECT venue_id, DATE(created_at),
+               COUNT(*),
+               SUM(status = 'confirmed'),
+               SUM(status = 'completed')
+        FROM bookings
+        WHERE created_at IS NOT NULL
+        GROUP BY venue_id, DATE(created_at)
+    """)
+
+    cursor.execute("""
+        INSERT INTO venue_daily_stats (venue_id, day, revenue_completed, revenue_pending)
+        SELECT b.venue_id, DATE(bp.payment_date),
+               COALESCE(SUM(CASE WHEN bp.payment_status = 'completed' THEN bp.amount END), 0),
+               COALESCE(SUM(CASE WHEN bp.payment_status = 'pending' THEN bp.amount END), 0)
+        FROM booking_payments bp
+        JOIN bookings b ON bp.booking_id = b.booking_id
+        WHERE bp.payment_date IS NOT NULL
+        GROUP BY b.venue_id, DATE(bp.payment_date)
+        ON DUPLICATE KEY UPDATE
+            revenue_completed = VALUES(revenue_completed),
+            revenue_pending = VALUES(revenue_pending)
+    """)
@@ -0,0 +1,17 @@
+"""
+Indexes for keyset pagination of the owner and user booking lists
+(ORDER BY sort column DESC, booking_id DESC).
+"""
+from utils.migrations import add_index
+
+INDEXES = [
+    # Owner bookings per venue, newest first
+    ('bookings', 'idx_bookings_venue_created', 'venue_id, created_at'),
+    # User bookings by event date
+    ('bookings', 'idx_bookings_user_event_date', 'user_id, event_date'),
+]
+
+
+def upgrade(cursor):
+    for table, index, columns in INDEXES:
+        add_index(cursor, table, index, columns)
@@ -0,0 +1,76 @@
+"""
+Partition logs by month (see utils/log_archive.py).
+
+MySQL requires every unique key of a partitioned table to include the
+partitioning column and does not allow foreign keys on partitioned InnoDB
+tables, so the primary key becomes (log_id, created_at) and the
+action_by -> users foreign key is dropped (logs outlive deleted users
+anyway once archived).
+
+The partitioning is log_archive.partition_table() as of this migration,
+kept inline so later changes to utils/log_archive.py do not change it:
+one pYYYYMM partition per month from the oldest row to two months ahead,
+plus the catch-all pmax.
+"""
+from datetime import date
+
+
+def _month_add(month, count):
+    index = month[0] * 12 + month[1] - 1 + count
+    return index // 12, index % 12 + 1
+
+
+def _partition_sql(month):
+    upper = _month_add(month, 1)
+    return (f"PARTITION p{month[0]:04d}{month[1]:02d} VALUES LESS THAN "
+            f"(UNIX_TIMESTAMP('{upper[0]:04d}-{upper[1]:02d}-01 00:00:00'))")
+
+
+def _partition_table(cursor):
+    cursor.execute("""
+        SELECT COUNT(*) as count FROM information_schema.partitions
+        WHERE table_schema = DATABASE() AND table_name = 'logs'
+          AND partition_name IS NOT NULL
+    """)
+    if cursor.fetchone()['count']:
+        return
+
+    today = date.today()
+    cursor.execute("SELECT MIN(created_at) as oldest FROM logs")
+    oldest = cursor.fetchone()['oldest'] or today
+    months = []
+    month, last = (oldest.year, oldest.month), _month_add((today.year, today.month), 2)
+    while month <= last:
+        months.append(month)
+        month = _month_add(month, 1)
+
+    cursor.execute(f"""
+        ALTER TABLE logs PARTITION BY RANGE (UNIX_TIMESTAMP(created_at)) (
+            {', '.join(_partition_sql(month) for month in months)},
+            PARTITION pmax VALUES LESS THAN MAXVALUE
+        )
+    """)
+
+
+def upgrade(cursor):
+    cursor.execute("""
+        SELECT constraint_name as name FROM information_schema.referential_constraints
+        WHERE constraint_schema = DATABASE() AND table_name = 'logs'
+    """)
+    for row in cursor.fetchall():
+        cursor.execute(f"ALTER TABLE logs DROP FOREIGN KEY {row['name']}")
+
+    cursor.execute("""
+        SELECT GROUP_CONCAT(column_name ORDER BY seq_in_index) as columns
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = 'logs' AND index_name = 'PRIMARY'
+    """)
+    if cursor.fetchone()['columns'] != 'log_id,created_at':
+        cursor.execute("""
+            ALTER TABLE logs
+                MODIFY created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                DROP PRIMARY KEY,
+                ADD PRIMARY KEY (log_id, created_at)
+        """)
+
+    _partition_table(cursor)
@@ -0,0 +1,33 @@
+"""
+Structured audit log columns: actor_role, target_id and a JSON payload,
+indexed on (target_table, target_id, created_at) for per-record timelines.
+
+target_id is backfilled from the "Booking #123: ..." style details that
+the log_* helpers have always written, and from action_by for user rows.
+"""
+from utils.migrations import add_column, add_index
+
+
+def upgrade(cursor):
+    add_column(cursor, 'logs', 'actor_role', "VARCHAR(20) NULL AFTER action_by")
+    add_column(cursor, 'logs', 'target_id', "INT NULL AFTER target_table")
+    add_column(cursor, 'logs', 'payload', "JSON NULL AFTER details")
+
+    cursor.execute("""
+        UPDATE logs
+        SET target_id = CAST(SUBSTRING_INDEX(SUBSTRING_INDEX(details, ':', 1), '#', -1) AS UNSIGNED)
+        WHERE target_id IS NULL
+          AND details REGEXP '^(Booking|Venue|Payment|Review) #[0-9]+:'
+    """)
+    cursor.execute("""
+        UPDATE logs SET target_id = action_by
+        WHERE target_id IS NULL AND target_table = 'users' AND action_by IS NOT NULL
+    """)
+    cursor.execute("""
+        UPDATE logs l
+        JOIN users u ON l.action_by = u.user_id
+        SET l.actor_role = u.role
+        WHERE l.actor_role IS NULL
+    """)
+
+    add_index(cursor, 'logs', 'idx_logs_target', 'target_table, target_id, created_at')
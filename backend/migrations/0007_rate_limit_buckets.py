@@ -0,0 +1,16 @@
+"""
+Shared token buckets for utils.rate_limit (RATE_LIMIT_BACKEND='mysql').
+
+A MEMORY table: bucket state is disposable and hot, and losing it on a
+server restart only hands every caller a fresh burst.
+"""
+
+
+def upgrade(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+            bucket_key VARCHAR(120) NOT NULL PRIMARY KEY,
+            tokens DOUBLE NOT NULL,
+            updated_at DATETIME(6) NOT NULL
+        ) ENGINE=MEMORY
+    """)
@@ -0,0 +1,23 @@
+"""
+Transactional outbox (utils/outbox.py): side effects recorded in the same
+transaction as the business change, delivered by the background dispatcher.
+"""
+
+
+def upgrade(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS outbox_events (
+            event_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            event_type VARCHAR(50) NOT NULL,
+            payload JSON NOT NULL,
+            dedupe_key VARCHAR(150) NULL,
+            status ENUM('pending', 'delivered', 'failed') NOT NULL DEFAULT 'pending',
+            attempts INT NOT NULL DEFAULT 0,
+            last_error TEXT NULL,
+            available_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            delivered_at TIMESTAMP NULL,
+            UNIQUE KEY uq_outbox_dedupe (dedupe_key),
+            INDEX idx_outbox_status_available (status, available_at, event_id)
+        )
+    """)
@@ -0,0 +1,40 @@
+"""
+Incremental rating aggregates on venues (review_count, rating_sum and a
+1-5 star histogram), backfilled from venue_reviews, plus an index for the
+review feed filtered by star rating.
+
+The backfill is the review_stats.rebuild() SQL as of this migration, kept
+inline so later changes to utils/review_stats.py do not change it.
+"""
+from utils.migrations import add_column, add_index
+
+
+def upgrade(cursor):
+    add_column(cursor, 'venues', 'review_count', "INT NOT NULL DEFAULT 0 AFTER rating")
+    add_column(cursor, 'venues', 'rating_sum', "INT NOT NULL DEFAULT 0 AFTER review_count")
+    previous = 'rating_sum'
+    for star in range(1, 6):
+        add_column(cursor, 'venues', f'rating_{star}', f"INT NOT NULL DEFAULT 0 AFTER {previous}")
+        previous = f'rating_{star}'
+
+    # Venues without reviews keep their current rating
+    cursor.execute("""
+        UPDATE venues v
+        LEFT JOIN (
+            SELECT venue_id, COUNT(*) as review_count, SUM(rating) as rating_sum,
+                   SUM(rating = 1) as r1, SUM(rating = 2) as r2, SUM(rating = 3) as r3,
+                   SUM(rating = 4) as r4, SUM(rating = 5) as r5
+            FROM venue_reviews
+            GROUP BY venue_id
+        ) r ON r.venue_id = v.venue_id
+        SET v.review_count = COALESCE(r.review_count, 0),
+            v.rating_sum = COALESCE(r.rating_sum, 0),
+            v.rating_1 = COALESCE(r.r1, 0),
+            v.rating_2 = COALESCE(r.r2, 0),
+            v.rating_3 = COALESCE(r.r3, 0),
+            v.rating_4 = COALESCE(r.r4, 0),
+            v.rating_5 = COALESCE(r.r5, 0),
+            v.rating = IF(r.review_count > 0, r.rating_sum / r.review_count, v.rating)
+    """)
+
+    add_index(cursor, 'venue_reviews', 'idx_reviews_venue_rating_date', 'venue_id, rating, review_date')
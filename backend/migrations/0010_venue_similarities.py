@@ -0,0 +1,34 @@
+"""
+Precomputed venue neighbours (utils/venue_similarity.py) behind "similar
+venues" and "recommended for you".
+"""
+
+
+def upgrade(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS venue_similarities (
+            venue_id INT NOT NULL,
+            position SMALLINT NOT NULL,
+            neighbour_id INT NOT NULL,
+            score FLOAT NOT NULL,
+            PRIMARY KEY (venue_id, position)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS venue_similarity_inputs (
+            venue_id INT PRIMARY KEY,
+            signature VARCHAR(255) NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS venue_similarity_runs (
+            run_id INT AUTO_INCREMENT PRIMARY KEY,
+            started_at TIMESTAMP NOT NULL,
+            finished_at TIMESTAMP NULL,
+            mode ENUM('full', 'incremental') NOT NULL,
+            venues INT NOT NULL DEFAULT 0,
+            recomputed INT NOT NULL DEFAULT 0,
+            written INT NOT NULL DEFAULT 0
+        )
+    """)
@@ -0,0 +1,87 @@
+"""
+Venue coordinates and geohash for "near me" search. Existing venues are
+placed like the offline geocoder does (city centre plus an address offset);
+scripts/backfill_geocodes.py re-geocodes them with the configured geocoder.
+
+The placement and geohash encoding are copies of utils/geocoding.py and
+utils/geo.py as of this migration, kept inline so later changes to those
+modules do not change it.
+"""
+import hashlib
+import math
+
+from utils.migrations import add_column, add_index
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+KM_PER_DEGREE_LAT = 111.32
+SPREAD_KM = 8.0
+
+CITY_CENTROIDS = {
+    'karachi': (24.8607, 67.0011),
+    'lahore': (31.5204, 74.3587),
+    'islamabad': (33.6844, 73.0479),
+    'rawalpindi': (33.5651, 73.0169),
+    'faisalabad': (31.4504, 73.1350),
+    'multan': (30.1575, 71.5249),
+    'peshawar': (34.0151, 71.5249),
+    'hyderabad': (25.3960, 68.3578),
+    'quetta': (30.1798, 66.9750),
+    'sialkot': (32.4945, 74.5229),
+    'gujranwala': (32.1877, 74.1945),
+    'sukkur': (27.7052, 68.8574),
+    'bahawalpur': (29.3544, 71.6911),
+    'abbottabad': (34.1688, 73.2215),
+}
+
+
+def _place(address, city):
+    """(latitude, longitude) near the city centre, or None for unknown cities."""
+    centre = CITY_CENTROIDS.get((city or '').strip().lower())
+    if not centre:
+        return None
+    digest = hashlib.sha1((address or '').strip().lower().encode('utf-8')).digest()
+    distance = SPREAD_KM * math.sqrt(int.from_bytes(digest[:4], 'big') / 2 ** 32)
+    bearing = 2 * math.pi * int.from_bytes(digest[4:8], 'big') / 2 ** 32
+    latitude = centre[0] + distance * math.cos(bearing) / KM_PER_DEGREE_LAT
+    longitude = centre[1] + distance * math.sin(bearing) / (KM_PER_DEGREE_LAT * math.cos(math.radians(centre[0])))
+    return round(latitude, 6), round(longitude, 6)
+
+
+def _geohash(latitude, longitude, precision=9):
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def upgrade(cursor):
+    add_column(cursor, 'venues', 'latitude', "DECIMAL(9,6) NULL AFTER city")
+    add_column(cursor, 'venues', 'longitude', "DECIMAL(9,6) NULL AFTER latitude")
+    add_column(cursor, 'venues', 'geohash', "CHAR(9) NULL AFTER longitude")
+
+    cursor.execute("SELECT venue_id, address, city FROM venues WHERE latitude IS NULL")
+    updates = []
+    for venue in cursor.fetchall():
+        point = _place(venue['address'], venue['city'])
+        if point:
+            updates.append((point[0], point[1], _geohash(*point), venue['venue_id']))
+    if updates:
+        cursor.executemany("""
+            UPDATE venues SET latitude = %s, longitude = %s, geohash = %s
+            WHERE venue_id = %s
+        """, updates)
+
+    add_index(cursor, 'venues', 'idx_venues_status_geohash', 'status, geohash')
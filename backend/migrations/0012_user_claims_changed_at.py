@@ -0,0 +1,12 @@
+"""
+users.claims_changed_at: when an account change (status, owner
+verification) made the claims embedded in earlier tokens stale. Every
+worker reads it, so a blocked user is refused by all of them, including
+after a restart.
+"""
+from utils.migrations import add_column, add_index
+
+
+def upgrade(cursor):
+    add_column(cursor, 'users', 'claims_changed_at', "DATETIME NULL AFTER status")
+    add_index(cursor, 'users', 'idx_users_claims_changed', 'claims_changed_at')
@@ -0,0 +1,34 @@
+"""
+Make venue_images (venue_id, content_hash) unique, so concurrent uploads
+of the same photo cannot attach it to a venue twice. 0001 created a plain
+index: existing duplicates are merged into the oldest image (covers
+repointed) and that index is replaced by the unique key.
+"""
+from utils.migrations import add_index, index_exists
+
+
+def upgrade(cursor):
+    if index_exists(cursor, 'venue_images', 'uq_venue_content_hash'):
+        return
+
+    cursor.execute("""
+        UPDATE venues v
+        JOIN venue_images d ON d.image_id = v.cover_image_id
+        JOIN (
+            SELECT venue_id, content_hash, MIN(image_id) as image_id
+            FROM venue_images
+            WHERE content_hash IS NOT NULL
+            GROUP BY venue_id, content_hash
+            HAVING COUNT(*) > 1
+        ) k ON k.venue_id = d.venue_id AND k.content_hash = d.content_hash
+        SET v.cover_image_id = k.image_id
+    """)
+    cursor.execute("""
+        DELETE d FROM venue_images d
+        JOIN venue_images k
+          ON k.venue_id = d.venue_id AND k.content_hash = d.content_hash AND k.image_id < d.image_id
+    """)
+
+    add_index(cursor, 'venue_images', 'uq_venue_content_hash', 'venue_id, content_hash', unique=True)
+    if index_exists(cursor, 'venue_images', 'idx_venue_content_hash'):
+        cursor.execute("DROP INDEX idx_venue_content_hash ON venue_images")
@@ -5,12 +5,21 @@ Handles all admin-specific functionality including dashboard, user management,
 owner management, venue management, bookings, payments, and system logs.
 """
 from datetime import datetime
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 
 from utils.db import get_db_connection
 from utils.db import get_db_connection
+from utils.daily_stats import monthly_series
+from utils.listing_totals import fetch_page
+from utils.fields import FieldSelectionError, requested_fields, select_list, wants, project
+from utils.exports import export_response
+from utils.log_archive import read_archive
 from utils.decorators import token_required, admin_required
-from utils.notification_utils import notify_venue_status_changed
+from utils.principal_cache import invalidate_user, mark_claims_changed
+from utils.outbox import enqueue
+from utils.review_stats import record_review
+from utils.log_utils import log_admin_action, decode_payloads
+from utils import query_stats
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 
@@ -28,7 +37,7 @@ admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 def get_admin_dashboard():
     """Get admin dashboard statistics"""
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
         # 1. Total Venues
@@ -120,7 +129,7 @@ def get_admin_users():
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
         query = "SELECT user_id, name, email, phone, role, created_at FROM users WHERE 1=1"
@@ -271,11 +280,15 @@ def update_user_status(user_id):
         cursor = conn.cursor()
         
         cursor.execute("UPDATE users SET status = %s WHERE user_id = %s", (status, user_id))
+        mark_claims_changed(cursor, user_id)
         
         conn.commit()
         cursor.close()
         conn.close()
         
+        # Cached principals of this user carry the old status
+        invalidate_user(user_id)
+        
         return jsonify({'message': 'User status updated'}), 200
         
     except Exception as e:
@@ -298,7 +311,7 @@ def get_admin_owners():
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
         query = """
@@ -453,6 +466,7 @@ def verify_owner(owner_id):
         # Notify owner
         cursor.execute("SELECT user_id FROM owners WHERE owner_id = %s", (owner_id,))
         user_id = cursor.fetchone()['user_id']
+        mark_claims_changed(cursor, user_id)
         
         message = f"Your owner verification has been {status}."
         cursor.execute("""
@@ -464,6 +478,8 @@ def verify_owner(owner_id):
         cursor.close()
         conn.close()
         
+        invalidate_user(user_id)
+        
         return jsonify({'message': f'Owner verification {status}'}), 200
         
     except Exception as e:
@@ -493,11 +509,14 @@ def update_owner_status(owner_id):
             
         # Update user status
         cursor.execute("UPDATE users SET status = %s WHERE user_id = %s", (status, owner['user_id']))
+        mark_claims_changed(cursor, owner['user_id'])
         
         conn.commit()
         cursor.close()
         conn.close()
         
+        invalidate_user(owner['user_id'])
+        
         return jsonify({'message': 'Owner status updated'}), 200
         
     except Exception as e:
@@ -507,6 +526,21 @@ def update_owner_status(owner_id):
 # VENUES MANAGEMENT
 # ----------------------------------------------------------------------------
 
+# Fields of the admin venue list (?fields=)
+ADMIN_VENUE_FIELDS = {
+    'venue_id': 'v.venue_id',
+    'name': 'v.name',
+    'city': 'v.city',
+    'type': 'v.type',
+    'capacity': 'v.capacity',
+    'base_price': 'v.base_price',
+    'rating': 'v.rating',
+    'status': 'v.status',
+    'created_at': 'v.created_at',
+    'owner_name': 'COALESCE(o.business_name, u.name)',
+}
+
+
 @admin_bp.route('/venues', methods=['GET'])
 @token_required
 @admin_required
@@ -521,14 +555,13 @@ def get_admin_venues():
         sort_by = request.args.get('sort_by', 'created_at')
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        fields = requested_fields(request.args, [*ADMIN_VENUE_FIELDS, 'total_bookings'])
         
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
         query = """
-            SELECT v.venue_id, v.name, v.city, v.type, v.capacity, 
-                   v.base_price, v.rating, v.status, v.created_at,
-                   COALESCE(o.business_name, u.name) as owner_name
+            SELECT """ + select_list(ADMIN_VENUE_FIELDS, fields, required=['venue_id']) + """
             FROM venues v
             LEFT JOIN owners o ON v.owner_id = o.owner_id
             LEFT JOIN users u ON o.user_id = u.user_id
@@ -577,9 +610,11 @@ def get_admin_venues():
         venues = cursor.fetchall()
         
         # Get booking counts for each venue
-        for venue in venues:
-            cursor.execute("SELECT COUNT(*) as count FROM bookings WHERE venue_id = %s", (venue['venue_id'],))
-            venue['total_bookings'] = cursor.fetchone()['count']
+        if wants(fields, 'total_bookings'):
+            for venue in venues:
+                cursor.execute("SELECT COUNT(*) as count FROM bookings WHERE venue_id = %s", (venue['venue_id'],))
+                venue['total_bookings'] = cursor.fetchone()['count']
+        project(venues, fields)
         
         cursor.close()
         conn.close()
@@ -590,6 +625,8 @@ def get_admin_venues():
             'total_venues': total
         }), 200
         
+    except FieldSelectionError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -683,12 +720,12 @@ def approve_venue(venue_id):
         
         cursor.execute("UPDATE venues SET status = 'active' WHERE venue_id = %s", (venue_id,))
         
+        # Notify owner
+        enqueue(cursor, 'venue_status_changed', {'venue_id': venue_id, 'status': 'approved'})
+        
         conn.commit()
         cursor.close()
         conn.close()
-
-        # Notify owner
-        notify_venue_status_changed(venue_id, 'approved')
         
         return jsonify({'message': 'Venue approved successfully'}), 200
         
@@ -712,14 +749,14 @@ def update_venue_status(venue_id):
         
         cursor.execute("UPDATE venues SET status = %s WHERE venue_id = %s", (status, venue_id))
         
+        # Notify owner if status is significant
+        if status in ['approved', 'rejected', 'active']:
+            enqueue(cursor, 'venue_status_changed', {'venue_id': venue_id, 'status': status})
+        
         conn.commit()
         cursor.close()
         conn.close()
         
-        # Notify owner if status is significant
-        if status in ['approved', 'rejected', 'active']:
-             notify_venue_status_changed(venue_id, status)
-        
         return jsonify({'message': f'Venue status updated to {status}'}), 200
         
     except Exception as e:
@@ -729,6 +766,20 @@ def update_venue_status(venue_id):
 # BOOKINGS MANAGEMENT
 # ----------------------------------------------------------------------------
 
+# Fields of the admin booking list (?fields=)
+ADMIN_BOOKING_FIELDS = {
+    'booking_id': 'b.booking_id',
+    'event_date': 'b.event_date',
+    'slot': 'b.slot',
+    'event_type': 'b.event_type',
+    'total_price': 'b.total_price',
+    'status': 'b.status',
+    'created_at': 'b.created_at',
+    'venue_name': 'v.name',
+    'customer_name': 'bcd.fullname',
+}
+
+
 @admin_bp.route('/bookings', methods=['GET'])
 @token_required
 @admin_required
@@ -746,14 +797,18 @@ def get_admin_bookings():
         sort_by = request.args.get('sort_by', 'event_date')
         page = request.args.get('page', 1, type=int)
         per_page = 10
+        fields = requested_fields(request.args, ADMIN_BOOKING_FIELDS)
         
-        conn = get_db_connection()
+        # Sorting
+        if sort_by not in ['event_date', 'created_at', 'total_price']:
+            sort_by = 'event_date'
+        
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
+        # Sort and revenue columns are ordered/summed over the listing subquery
         query = """
-            SELECT b.booking_id, b.event_date, b.slot, b.event_type, 
-                   b.total_price, b.status, b.created_at,
-                   v.name as venue_name, bcd.fullname as customer_name
+            SELECT """ + select_list(ADMIN_BOOKING_FIELDS, fields, required=['booking_id', 'total_price', sort_by]) + """
             FROM bookings b
             JOIN venues v ON b.venue_id = v.venue_id
             LEFT JOIN booking_customer_details bcd ON b.booking_id = bcd.booking_id
@@ -793,41 +848,25 @@ def get_admin_bookings():
             query += " AND (bcd.fullname LIKE %s OR v.name LIKE %s)"
             params.extend([f'%{search}%', f'%{search}%'])
             
-        # Count total
-        count_query = f"SELECT COUNT(*) as total FROM ({query}) as subquery"
-        cursor.execute(count_query, params)
-        total = cursor.fetchone()['total']
+        # Page plus filter-wide count and revenue; totals are memoized per filter set
+        key = ('admin.bookings', status, venue_id, user_id, owner_id, event_type, date_from, date_to, search)
+        bookings, total, total_revenue = fetch_page(
+            cursor, key, query, params, 'total_price', sort_by, page, per_page
+        )
         total_pages = (total + per_page - 1) // per_page
         
-        # Calculate total revenue for filtered results
-        revenue_query = f"SELECT COALESCE(SUM(total_price), 0) as revenue FROM ({query}) as subquery"
-        cursor.execute(revenue_query, params)
-        total_revenue = cursor.fetchone()['revenue']
-        
-        # Sorting
-        if sort_by not in ['event_date', 'created_at', 'total_price']:
-            sort_by = 'event_date'
-            
-        query += f" ORDER BY b.{sort_by} DESC"
-        
-        # Pagination
-        offset = (page - 1) * per_page
-        query += " LIMIT %s OFFSET %s"
-        params.extend([per_page, offset])
-        
-        cursor.execute(query, params)
-        bookings = cursor.fetchall()
-        
         cursor.close()
         conn.close()
         
         return jsonify({
-            'bookings': bookings,
+            'bookings': project(bookings, fields),
             'total_pages': total_pages,
             'total_bookings': total,
             'total_revenue': float(total_revenue)
         }), 200
         
+    except FieldSelectionError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -874,16 +913,13 @@ def get_admin_booking_details(booking_id):
         
 
         
-        # Timeline/Logs (mocked or fetched from logs if available)
         # Timeline/Logs
-        # Search in details since record_id column doesn't exist
-        search_pattern = f"Booking #{booking_id}:%"
         cursor.execute("""
             SELECT * FROM logs 
-            WHERE target_table = 'bookings' AND details LIKE %s
+            WHERE target_table = 'bookings' AND target_id = %s
             ORDER BY created_at DESC
-        """, (search_pattern,))
-        booking['timeline'] = cursor.fetchall()
+        """, (booking_id,))
+        booking['timeline'] = decode_payloads(cursor.fetchall())
         
         cursor.close()
         conn.close()
@@ -897,6 +933,21 @@ def get_admin_booking_details(booking_id):
 # PAYMENTS MANAGEMENT (VIEW ONLY)
 # ----------------------------------------------------------------------------
 
+# Fields of the admin payment list (?fields=)
+ADMIN_PAYMENT_FIELDS = {
+    'payment_id': 'bp.payment_id',
+    'booking_id': 'bp.booking_id',
+    'amount': 'bp.amount',
+    'method': 'bp.method',
+    'trx_id': 'bp.trx_id',
+    'payment_status': 'bp.payment_status',
+    'payment_date': 'bp.payment_date',
+    'venue_name': 'v.name',
+    'owner_name': 'o.business_name',
+    'customer_name': 'bcd.fullname',
+}
+
+
 @admin_bp.route('/payments', methods=['GET'])
 @token_required
 @admin_required
@@ -912,15 +963,18 @@ def get_admin_payments():
         sort_by = request.args.get('sort_by', 'payment_date')
         page = request.args.get('page', 1, type=int)
         per_page = 10
+        fields = requested_fields(request.args, ADMIN_PAYMENT_FIELDS)
         
-        conn = get_db_connection()
+        # Sorting
+        if sort_by not in ['payment_date', 'amount']:
+            sort_by = 'payment_date'
+        
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
+        # Sort and amount columns are ordered/summed over the listing subquery
         query = """
-            SELECT bp.payment_id, bp.booking_id, bp.amount, bp.method, 
-                   bp.trx_id, bp.payment_status, bp.payment_date,
-                   v.name as venue_name, o.business_name as owner_name,
-                   bcd.fullname as customer_name
+            SELECT """ + select_list(ADMIN_PAYMENT_FIELDS, fields, required=['payment_id', 'amount', sort_by]) + """
             FROM booking_payments bp
             JOIN bookings b ON bp.booking_id = b.booking_id
             JOIN venues v ON b.venue_id = v.venue_id
@@ -954,41 +1008,25 @@ def get_admin_payments():
             query += " AND bp.payment_date <= %s"
             params.append(date_to)
             
-        # Count total
-        count_query = f"SELECT COUNT(*) as total FROM ({query}) as subquery"
-        cursor.execute(count_query, params)
-        total = cursor.fetchone()['total']
+        # Page plus filter-wide count and amount; totals are memoized per filter set
+        key = ('admin.payments', payment_status, method, venue_id, owner_id, date_from, date_to)
+        payments, total, total_amount = fetch_page(
+            cursor, key, query, params, 'amount', sort_by, page, per_page
+        )
         total_pages = (total + per_page - 1) // per_page
         
-        # Calculate total amount for filtered results
-        amount_query = f"SELECT COALESCE(SUM(amount), 0) as total_amount FROM ({query}) as subquery"
-        cursor.execute(amount_query, params)
-        total_amount = cursor.fetchone()['total_amount']
-        
-        # Sorting
-        if sort_by not in ['payment_date', 'amount']:
-            sort_by = 'payment_date'
-            
-        query += f" ORDER BY bp.{sort_by} DESC"
-        
-        # Pagination
-        offset = (page - 1) * per_page
-        query += " LIMIT %s OFFSET %s"
-        params.extend([per_page, offset])
-        
-        cursor.execute(query, params)
-        payments = cursor.fetchall()
-        
         cursor.close()
         conn.close()
         
         return jsonify({
-            'payments': payments,
+            'payments': project(payments, fields),
             'total_pages': total_pages,
             'total_payments': total,
             'total_amount': float(total_amount)
         }), 200
         
+    except FieldSelectionError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1037,6 +1075,42 @@ def get_admin_payment_details(payment_id):
 # SYSTEM LOGS
 # ----------------------------------------------------------------------------
 
+def archive_range_error(date_from, date_to):
+    """Why an archived log query's date range is not acceptable, or None."""
+    if not date_from or not date_to:
+        return 'archived=1 requires date_from and date_to'
+    try:
+        first = datetime.strptime(date_from[:10], '%Y-%m-%d')
+        last = datetime.strptime(date_to[:10], '%Y-%m-%d')
+    except ValueError:
+        return 'date_from and date_to must be YYYY-MM-DD'
+    max_days = current_app.config.get('LOG_ARCHIVE_MAX_DAYS', 92)
+    if not 0 <= (last - first).days <= max_days:
+        return f'Archived logs can be read at most {max_days} days at a time'
+    return None
+
+
+def read_archived_logs(cursor, filters, date_from, date_to, page, per_page):
+    """Page through archived logs (newest first); returns (logs, has_more)."""
+    filters = {column: value for column, value in filters.items() if value}
+    logs, has_more = read_archive(current_app.config['LOG_ARCHIVE_DIR'], filters, date_from, date_to,
+                                  (page - 1) * per_page, per_page)
+    
+    user_ids = {row['action_by'] for row in logs if row.get('action_by')}
+    names = {}
+    if user_ids:
+        cursor.execute(
+            f"SELECT user_id, name FROM users WHERE user_id IN ({', '.join(['%s'] * len(user_ids))})",
+            tuple(user_ids)
+        )
+        names = {row['user_id']: row['name'] for row in cursor.fetchall()}
+    for row in logs:
+        row['action_by_name'] = names.get(row.get('action_by'))
+        row['archived'] = True
+    
+    return decode_payloads(logs), has_more
+
+
 @admin_bp.route('/logs', methods=['GET'])
 @token_required
 @admin_required
@@ -1050,10 +1124,17 @@ def get_admin_logs():
         date_from = request.args.get('date_from')
         date_to = request.args.get('date_to')
         sort_by = request.args.get('sort_by', 'created_at')
+        archived = request.args.get('archived') in ('1', 'true')
         page = request.args.get('page', 1, type=int)
         per_page = 15
         
-        conn = get_db_connection()
+        # Archive reads cost a scan of every month in range, so the range is bounded
+        if archived:
+            error = archive_range_error(date_from, date_to)
+            if error:
+                return jsonify({'error': error}), 400
+        
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
         query = """
@@ -1077,7 +1158,7 @@ def get_admin_logs():
             params.append(target_table)
             
         if record_id:
-            query += " AND l.record_id = %s"
+            query += " AND l.target_id = %s"
             params.append(record_id)
             
         if date_from:
@@ -1088,25 +1169,34 @@ def get_admin_logs():
             query += " AND l.created_at <= %s"
             params.append(date_to)
             
-        # Count total
-        count_query = f"SELECT COUNT(*) as total FROM ({query}) as subquery"
-        cursor.execute(count_query, params)
-        total = cursor.fetchone()['total']
-        total_pages = (total + per_page - 1) // per_page
-        
         # Sorting
         if sort_by not in ['created_at']:
             sort_by = 'created_at'
-            
-        query += f" ORDER BY l.{sort_by} DESC"
-        
-        # Pagination
-        offset = (page - 1) * per_page
-        query += " LIMIT %s OFFSET %s"
-        params.extend([per_page, offset])
         
-        cursor.execute(query, params)
-        logs = cursor.fetchall()
+        # The logs table only holds the hot months (utils/log_archive.py);
+        # older months are read from the compressed archive when asked for.
+        # Archive pages stop reading once filled, so they report has_more
+        # instead of a total.
+        if archived:
+            logs, has_more = read_archived_logs(cursor, {
+                'action_type': action_type,
+                'action_by': action_by,
+                'target_table': target_table,
+                'target_id': record_id
+            }, date_from, date_to, page, per_page)
+            cursor.close()
+            conn.close()
+            return jsonify({
+                'logs': logs,
+                'has_more': has_more,
+                'total_pages': None,
+                'total_logs': None
+            }), 200
+        
+        key = ('admin.logs', action_type, action_by, target_table, record_id, date_from, date_to)
+        logs, total, _ = fetch_page(cursor, key, query, params, None, sort_by, page, per_page)
+        decode_payloads(logs)
+        total_pages = (total + per_page - 1) // per_page
         
         cursor.close()
         conn.close()
@@ -1139,7 +1229,7 @@ def get_admin_reviews():
         page = request.args.get('page', 1, type=int)
         per_page = 10
         
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
         query = """
@@ -1204,6 +1294,41 @@ def get_admin_reviews():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@admin_bp.route('/reviews/<int:review_id>', methods=['DELETE'])
+@token_required
+@admin_required
+def delete_review(review_id):
+    """Remove a review (moderation) and take it out of the venue's rating"""
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT review_id, venue_id, user_id, rating
+            FROM venue_reviews WHERE review_id = %s
+            FOR UPDATE
+        """, (review_id,))
+        review = cursor.fetchone()
+        
+        if not review:
+            return jsonify({'error': 'Review not found'}), 404
+        
+        cursor.execute("DELETE FROM venue_reviews WHERE review_id = %s", (review_id,))
+        record_review(cursor, review['venue_id'], review['rating'], delta=-1)
+        
+        log_admin_action(request.user_id, 'delete', 'venue_reviews',
+                         f"Removed {review['rating']}-star review #{review_id} of venue #{review['venue_id']}",
+                         target_id=review_id, payload=review, cursor=cursor)
+        
+        conn.commit()
+        cursor.close()
+        conn.close()
+        
+        return jsonify({'message': 'Review deleted successfully'}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 # ----------------------------------------------------------------------------
 # ANALYTICS
 # ----------------------------------------------------------------------------
@@ -1216,30 +1341,34 @@ def get_admin_analytics():
     try:
         from datetime import datetime as dt
         year = request.args.get('year', dt.now().year, type=int)
+        # Optional arbitrary range (YYYY-MM-DD) for a monthly series
+        date_from = request.args.get('date_from')
+        date_to = request.args.get('date_to')
 
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
+        # Time series and totals come from the daily fact table (utils/daily_stats.py)
         # Total Stats
         cursor.execute("""
             SELECT 
-                COUNT(DISTINCT b.booking_id) as total_bookings,
-                COALESCE(SUM(bp.amount), 0) as total_revenue
-            FROM bookings b
-            LEFT JOIN booking_payments bp ON b.booking_id = bp.booking_id AND bp.payment_status = 'completed'
+                COALESCE(SUM(bookings_created), 0) as total_bookings,
+                COALESCE(SUM(revenue_completed), 0) as total_revenue
+            FROM venue_daily_stats
         """)
         total_stats = cursor.fetchone()
         
         # Yearly Revenue (Global) - Filtered by Year
         cursor.execute("""
             SELECT 
-                DATE_FORMAT(bp.payment_date, '%%Y-%%m') as month,
-                COALESCE(SUM(bp.amount), 0) as revenue
-            FROM booking_payments bp
-            WHERE bp.payment_status = 'completed' AND YEAR(bp.payment_date) = %s
+                DATE_FORMAT(day, '%%Y-%%m') as month,
+                COALESCE(SUM(revenue_completed), 0) as revenue
+            FROM venue_daily_stats
+            WHERE day >= %s AND day < %s
             GROUP BY month
+            HAVING revenue > 0
             ORDER BY month ASC
-        """, (year,))
+        """, (f"{year}-01-01", f"{year + 1}-01-01"))
         yearly_revenue = cursor.fetchall()
         
         # Bookings by Status (Global)
@@ -1264,17 +1393,73 @@ def get_admin_analytics():
         """)
         top_venues = cursor.fetchall()
         
-        cursor.close()
-        conn.close()
-        
-        return jsonify({
+        response = {
             'total_revenue': float(total_stats['total_revenue']),
-            'total_bookings': total_stats['total_bookings'],
+            'total_bookings': int(total_stats['total_bookings']),
             'yearly': yearly_revenue,
             'status_breakdown': bookings_by_status,
             'top_venues': top_venues
-        }), 200
+        }
+        
+        if date_from or date_to:
+            response['range'] = monthly_series(cursor, date_from or '1000-01-01', date_to or '9999-12-31')
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify(response), 200
         
     except Exception as e:
         print(f"Analytics Error: {str(e)}")  # Debug print
         return jsonify({'error': str(e)}), 500
+
+
+# ----------------------------------------------------------------------------
+# EXPORTS
+# ----------------------------------------------------------------------------
+
+@admin_bp.route('/exports/<dataset>', methods=['GET'])
+@token_required
+@admin_required
+def export_admin_report(dataset):
+    """Stream bookings, payments, reviews or logs as CSV/XLSX (?format=, ?gzip=1)"""
+    try:
+        return export_response(dataset, request.args)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ----------------------------------------------------------------------------
+# SQL INSTRUMENTATION
+# ----------------------------------------------------------------------------
+
+@admin_bp.route('/sql-stats', methods=['GET'])
+@token_required
+@admin_required
+def get_sql_stats_settings():
+    """Get the per-request SQL instrumentation settings"""
+    return jsonify(dict(query_stats.settings)), 200
+
+
+@admin_bp.route('/sql-stats', methods=['PUT'])
+@token_required
+@admin_required
+def update_sql_stats_settings():
+    """Enable/disable SQL instrumentation or change its sample rate and slow-query threshold"""
+    try:
+        data = request.json or {}
+        settings = query_stats.update_settings(
+            enabled=data.get('enabled'),
+            sample_rate=data.get('sample_rate'),
+            slow_query_ms=data.get('slow_query_ms')
+        )
+
+        log_admin_action(request.user_id, 'update', 'settings', f"SQL instrumentation settings changed to {settings}",
+                         payload=settings)
+
+        return jsonify({'message': 'SQL instrumentation settings updated', 'settings': settings}), 200
+
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid setting value'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
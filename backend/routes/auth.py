@@ -3,14 +3,16 @@ Authentication routes blueprint.
 
 Handles user registration, login, and logout functionality.
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime, timedelta
+import uuid
 import jwt
-import bcrypt
 
 from utils.db import get_db_connection
 from utils.decorators import token_required
 from utils.log_utils import log_signup, log_login, log_logout
+from utils.password_utils import hash_password, check_password, needs_rehash, PasswordHasherBusy
+from utils.principal_cache import build_claims, invalidate_token
 from utils.phone_validation import validate_phone_format
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
@@ -46,14 +48,14 @@ def signup():
             conn.close()
             return jsonify({'error': 'Email already exists'}), 400
         
-        # Hash password with bcrypt
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        # Hash password with bcrypt (off the event loop)
+        hashed_password = hash_password(password)
         
         # Insert user
         cursor.execute("""
             INSERT INTO users (name, email, password, phone, role, created_at)
             VALUES (%s, %s, %s, %s, %s, NOW())
-        """, (name, email, hashed_password.decode('utf-8'), phone, role))
+        """, (name, email, hashed_password, phone, role))
         
         user_id = cursor.lastrowid
         
@@ -78,6 +80,8 @@ def signup():
             'user_id': user_id
         }), 201
         
+    except PasswordHasherBusy:
+        return jsonify({'error': 'Server busy, please try again'}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -96,8 +100,13 @@ def login():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Get user
-        cursor.execute("SELECT * FROM users WHERE email = %s", (email,))
+        # Get user together with owner record (if any) in one round-trip
+        cursor.execute("""
+            SELECT u.*, o.owner_id, o.verification_status
+            FROM users u
+            LEFT JOIN owners o ON o.user_id = u.user_id
+            WHERE u.email = %s
+        """, (email,))
         user = cursor.fetchone()
         
         if not user:
@@ -105,33 +114,39 @@ def login():
             conn.close()
             return jsonify({'error': 'Invalid credentials'}), 401
         
-        # Verify password with bcrypt
-        if not bcrypt.checkpw(password.encode('utf-8'), user['password'].encode('utf-8')):
+        # Verify password with bcrypt (off the event loop)
+        if not check_password(password, user['password']):
             cursor.close()
             conn.close()
             return jsonify({'error': 'Invalid credentials'}), 401
         
-        # Get owner_id if user is owner
-        owner_id = None
-        if user['role'] == 'owner':
-            cursor.execute("SELECT owner_id FROM owners WHERE user_id = %s", (user['user_id'],))
-            owner_record = cursor.fetchone()
-            if owner_record:
-                owner_id = owner_record['owner_id']
+        # Upgrade the stored hash if the work factor policy changed
+        if needs_rehash(user['password']):
+            cursor.execute("UPDATE users SET password = %s WHERE user_id = %s",
+                           (hash_password(password), user['user_id']))
+            conn.commit()
         
         cursor.close()
         conn.close()
         
-        # Log successful login
-        log_login(user['user_id'], email, success=True)
+        if user.get('status') == 'blocked':
+            return jsonify({'error': 'Account is blocked'}), 403
         
-        # Generate JWT token
-        from flask import current_app
-        token = jwt.encode({
-            'user_id': user['user_id'],
-            'role': user['role'],
-            'exp': datetime.utcnow() + timedelta(days=7)
-        }, current_app.config['SECRET_KEY'], algorithm='HS256')
+        # Only owner accounts get an owner_id in the login response
+        owner_id = user['owner_id'] if user['role'] == 'owner' else None
+        
+        # Log successful login
+        log_login(user['user_id'], email, success=True, role=user['role'])
+        
+        # Generate JWT token with the principal embedded as signed claims
+        issued_at = datetime.utcnow()
+        claims = build_claims(user)
+        claims.update({
+            'jti': uuid.uuid4().hex,
+            'iat': issued_at,
+            'exp': issued_at + timedelta(days=current_app.config['JWT_EXPIRY_DAYS'])
+        })
+        token = jwt.encode(claims, current_app.config['SECRET_KEY'], algorithm='HS256')
         
         return jsonify({
             'token': token,
@@ -144,14 +159,19 @@ def login():
             }
         }), 200
         
+    except PasswordHasherBusy:
+        return jsonify({'error': 'Server busy, please try again'}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @auth_bp.route('/logout', methods=['POST'])
 @token_required
-def logout(current_user):
+def logout():
     """User logout"""
+    # Drop the cached principal for this token
+    invalidate_token(request.token_id)
+    
     # Log logout action
-    log_logout(current_user['user_id'], current_user.get('email', 'Unknown'))
+    log_logout(request.user_id, request.principal.get('email') or 'Unknown')
     return jsonify({'message': 'Logged out successfully'}), 200
\ No newline at end of file
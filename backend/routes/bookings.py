@@ -6,9 +6,10 @@ Handles booking creation and review submission.
 from flask import Blueprint, request, jsonify
 
 from utils.db import get_db_connection
+from utils.daily_stats import record_booking_created, record_payment
 from utils.decorators import token_required
 from utils.log_utils import log_booking_action
-from utils.notification_utils import notify_booking_created
+from utils.outbox import enqueue
 from utils.phone_validation import validate_phone_format
 
 bookings_bp = Blueprint('bookings', __name__, url_prefix='/api/bookings')
@@ -96,6 +97,10 @@ def create_booking():
             VALUES (%s, %s, %s, %s, 'pending', NOW())
         """, (booking_id, amount, payment_method, trx_id))
         
+        # Daily analytics facts
+        record_booking_created(cursor, venue_id)
+        record_payment(cursor, venue_id, amount, 'pending')
+        
         # Update venue availability
         cursor.execute("""
             INSERT INTO venue_availability (venue_id, date, slot, is_available)
@@ -103,31 +108,15 @@ def create_booking():
             ON DUPLICATE KEY UPDATE is_available = 0
         """, (venue_id, event_date, slot))
         
-        # Create notification for owner
-        cursor.execute("SELECT owner_id FROM venues WHERE venue_id = %s", (venue_id,))
-        owner = cursor.fetchone()
-        if owner:
-            cursor.execute("SELECT user_id FROM owners WHERE owner_id = %s", (owner['owner_id'],))
-            owner_user = cursor.fetchone()
-            if owner_user:
-                cursor.execute("""
-                    INSERT INTO notifications 
-                    (user_id, title, message, type, booking_id, venue_id, is_read, created_at)
-                    VALUES (%s, %s, %s, 'booking', %s, %s, 0, NOW())
-                """, (owner_user['user_id'], 'New Booking Request', 
-                      f'New booking request for {event_type}', booking_id, venue_id))
+        # Owner notification and audit log, delivered after commit by the outbox dispatcher
+        enqueue(cursor, 'booking_created', {'booking_id': booking_id}, dedupe_key=f"booking_created:{booking_id}")
+        log_booking_action(request.user_id, 'create', booking_id, f"Created {event_type} booking for venue #{venue_id}",
+                           payload={'venue_id': venue_id, 'event_type': event_type}, cursor=cursor)
         
         conn.commit()
         cursor.close()
         conn.close()
         
-
-        # Log booking creation
-        log_booking_action(request.user_id, 'create', booking_id, f"Created {event_type} booking for venue #{venue_id}")
-        
-        # Send notification to owner
-        notify_booking_created(booking_id)
-        
         return jsonify({
             'message': 'Booking created successfully',
             'booking_id': booking_id
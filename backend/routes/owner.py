@@ -7,10 +7,18 @@ bookings, payments, reviews, and profile management.
 from flask import Blueprint, request, jsonify
 
 from utils.db import get_db_connection
+from utils.pagination import get_limit, keyset_page, InvalidCursor
+from utils.daily_stats import (record_bookings_completed, record_booking_status_change,
+                               record_payment_status_change, monthly_series)
 from utils.decorators import token_required, owner_required
+from utils.exports import export_response
+from utils.fields import FieldSelectionError, requested_fields, select_list, wants, project
+from utils.geocoding import locate, parse_coordinates
+from utils.image_utils import COVER_IMAGE_COLUMNS, COVER_IMAGE_FIELDS, apply_cover_image
 from utils.log_utils import log_venue_action, log_booking_action, log_payment_action
-from utils.notification_utils import notify_booking_status_changed, notify_booking_completed_review_request, notify_payment_received, notify_admins_new_venue
+from utils.outbox import enqueue
 from utils.phone_validation import validate_phone_format
+from utils.photo_pipeline import read_uploads, start_photo_ingestion
 
 owner_bp = Blueprint('owner', __name__, url_prefix='/api/owner')
 
@@ -29,6 +37,7 @@ def get_owner_dashboard(owner_id):
         cursor = conn.cursor()
         
         # Lazy update: Mark confirmed bookings as completed if event_date < today
+        record_bookings_completed(cursor, owner_id)
         cursor.execute("""
             UPDATE bookings b
             JOIN venues v ON b.venue_id = v.venue_id
@@ -122,31 +131,34 @@ def get_owner_analytics(owner_id):
     try:
         # Get optional year parameter for monthly breakdown
         year = request.args.get('year', type=int)
+        # Optional arbitrary range (YYYY-MM-DD) for a monthly series
+        date_from = request.args.get('date_from')
+        date_to = request.args.get('date_to')
         
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
+        # Time series and totals come from the daily fact table (utils/daily_stats.py)
         # Total Stats
         cursor.execute("""
             SELECT 
-                COUNT(DISTINCT b.booking_id) as total_bookings,
-                COALESCE(SUM(bp.amount), 0) as total_revenue
-            FROM bookings b
-            LEFT JOIN booking_payments bp ON b.booking_id = bp.booking_id AND bp.payment_status = 'completed'
-            JOIN venues v ON b.venue_id = v.venue_id
+                COALESCE(SUM(ds.bookings_created), 0) as total_bookings,
+                COALESCE(SUM(ds.revenue_completed), 0) as total_revenue
+            FROM venue_daily_stats ds
+            JOIN venues v ON ds.venue_id = v.venue_id
             WHERE v.owner_id = %s
         """, (owner_id,))
         total_stats = cursor.fetchone()
 
         # Yearly revenue summary
         cursor.execute("""
-            SELECT DATE_FORMAT(bp.payment_date, '%%Y') as year,
-                   SUM(bp.amount) as revenue
-            FROM booking_payments bp
-            JOIN bookings b ON bp.booking_id = b.booking_id
-            JOIN venues v ON b.venue_id = v.venue_id
-            WHERE v.owner_id = %s AND bp.payment_status = 'completed'
+            SELECT DATE_FORMAT(ds.day, '%%Y') as year,
+                   SUM(ds.revenue_completed) as revenue
+            FROM venue_daily_stats ds
+            JOIN venues v ON ds.venue_id = v.venue_id
+            WHERE v.owner_id = %s
             GROUP BY year
+            HAVING revenue > 0
             ORDER BY year ASC
         """, (owner_id,))
         yearly_revenue = cursor.fetchall()
@@ -155,19 +167,22 @@ def get_owner_analytics(owner_id):
         monthly_revenue = []
         if year:
             cursor.execute("""
-                SELECT DATE_FORMAT(bp.payment_date, '%%m') as month,
-                       SUM(bp.amount) as revenue
-                FROM booking_payments bp
-                JOIN bookings b ON bp.booking_id = b.booking_id
-                JOIN venues v ON b.venue_id = v.venue_id
+                SELECT DATE_FORMAT(ds.day, '%%m') as month,
+                       SUM(ds.revenue_completed) as revenue
+                FROM venue_daily_stats ds
+                JOIN venues v ON ds.venue_id = v.venue_id
                 WHERE v.owner_id = %s 
-                  AND bp.payment_status = 'completed'
-                  AND YEAR(bp.payment_date) = %s
+                  AND ds.day >= %s AND ds.day < %s
                 GROUP BY month
+                HAVING revenue > 0
                 ORDER BY month ASC
-            """, (owner_id, year))
+            """, (owner_id, f"{year}-01-01", f"{year + 1}-01-01"))
             monthly_revenue = cursor.fetchall()
         
+        range_series = None
+        if date_from or date_to:
+            range_series = monthly_series(cursor, date_from or '1000-01-01', date_to or '9999-12-31', owner_id)
+        
         # Bookings by status
         cursor.execute("""
             SELECT b.status, COUNT(*) as count
@@ -198,7 +213,7 @@ def get_owner_analytics(owner_id):
         
         response = {
             'total_revenue': float(total_stats['total_revenue']),
-            'total_bookings': total_stats['total_bookings'],
+            'total_bookings': int(total_stats['total_bookings']),
             'yearly': yearly_revenue,
             'status_breakdown': bookings_by_status,
             'top_venues': top_venues
@@ -209,6 +224,9 @@ def get_owner_analytics(owner_id):
             response['monthly'] = monthly_revenue
             response['selected_year'] = year
         
+        if range_series is not None:
+            response['range'] = range_series
+        
         return jsonify(response), 200
         
     except Exception as e:
@@ -219,6 +237,21 @@ def get_owner_analytics(owner_id):
 # VENUE MANAGEMENT
 # ============================================================================
 
+# Fields of the owner venue list (?fields=); image_* come from the cover image
+OWNER_VENUE_FIELDS = {
+    'venue_id': 'v.venue_id',
+    'name': 'v.name',
+    'city': 'v.city',
+    'address': 'v.address',
+    'type': 'v.type',
+    'capacity': 'v.capacity',
+    'base_price': 'v.base_price',
+    'rating': 'v.rating',
+    'status': 'v.status',
+    'bookings_count': 'COUNT(DISTINCT b.booking_id)',
+}
+
+
 @owner_bp.route('/<int:owner_id>/venues', methods=['GET'])
 @token_required
 @owner_required
@@ -229,19 +262,26 @@ def get_owner_venues(owner_id):
         status = request.args.get('status', '')
         city = request.args.get('city', '')
         sort_by = request.args.get('sort_by', 'name')
+        fields = requested_fields(request.args, [*OWNER_VENUE_FIELDS, *COVER_IMAGE_FIELDS])
+        with_cover = wants(fields, *COVER_IMAGE_FIELDS)
+        with_counts = wants(fields, 'bookings_count') or sort_by == 'bookings_count'
         
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
-        query = """
-            SELECT v.venue_id, v.name, v.city, v.address, v.type, v.capacity, 
-                   v.base_price, v.rating, v.status,
-                   COUNT(DISTINCT b.booking_id) as bookings_count,
-                   (SELECT vi.image_url FROM venue_images vi WHERE vi.venue_id = v.venue_id LIMIT 1) as image_url
-            FROM venues v
-            LEFT JOIN bookings b ON v.venue_id = b.venue_id
-            WHERE v.owner_id = %s
-        """
+        required = ['venue_id'] + (['bookings_count'] if with_counts else [])
+        columns = OWNER_VENUE_FIELDS if with_counts else {
+            name: expression for name, expression in OWNER_VENUE_FIELDS.items() if name != 'bookings_count'
+        }
+        query = "SELECT " + select_list(columns, fields, required=required)
+        if with_cover:
+            query += ", " + COVER_IMAGE_COLUMNS
+        query += " FROM venues v"
+        if with_cover:
+            query += " LEFT JOIN venue_images ci ON ci.image_id = v.cover_image_id"
+        if with_counts:
+            query += " LEFT JOIN bookings b ON v.venue_id = b.venue_id"
+        query += " WHERE v.owner_id = %s"
         params = [owner_id]
         
         if search:
@@ -256,19 +296,25 @@ def get_owner_venues(owner_id):
             query += " AND v.city = %s"
             params.append(city)
         
-        query += " GROUP BY v.venue_id"
+        if with_counts:
+            query += " GROUP BY v.venue_id" + (", ci.image_id" if with_cover else "")
         
         if sort_by in ['name', 'capacity', 'bookings_count']:
             query += f" ORDER BY {sort_by if sort_by != 'bookings_count' else 'bookings_count'} DESC"
         
         cursor.execute(query, params)
         venues = cursor.fetchall()
+        if with_cover:
+            venues = [apply_cover_image(venue) for venue in venues]
+        project(venues, fields)
         
         cursor.close()
         conn.close()
         
         return jsonify({'venues': venues}), 200
         
+    except FieldSelectionError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -287,20 +333,27 @@ def add_venue(owner_id):
         capacity = request.form.get('capacity')
         base_price = request.form.get('price')
         description = request.form.get('description')
+        try:
+            coordinates = parse_coordinates(request.form.get('latitude'), request.form.get('longitude'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # We need to manually remove 'owner_id' from args if it was passed via URL, 
         # but here we use the one from decorator/route.
         
+        # Map pin if the owner set one, otherwise geocode the address
+        location = locate(address, city, coordinates)
+        
         conn = get_db_connection()
         cursor = conn.cursor()
         
         cursor.execute("""
             INSERT INTO venues 
             (owner_id, name, type, address, city, capacity, base_price, 
-             description, status, rating, created_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 'pending', 0.00, NOW())
+             description, latitude, longitude, geohash, status, rating, created_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'pending', 0.00, NOW())
         """, (owner_id, name, venue_type, address, city, capacity, 
-              base_price, description))
+              base_price, description, location['latitude'], location['longitude'], location['geohash']))
         
         venue_id = cursor.lastrowid
         
@@ -339,32 +392,24 @@ def add_venue(owner_id):
             except Exception as e:
                 print("Error saving availability:", e)
 
-        # Handle Images
-        from utils.image_utils import upload_image
-        
-        photos = request.files.getlist('photos')
-        for photo in photos:
-            if photo:
-                image_url = upload_image(photo, folder=f"venues/{venue_id}")
-                if image_url:
-                    cursor.execute("""
-                        INSERT INTO venue_images (venue_id, image_url)
-                        VALUES (%s, %s)
-                    """, (venue_id, image_url))
+        # Log venue creation and notify all admins about the new venue pending approval
+        log_venue_action(request.user_id, 'create', venue_id, f"Created venue '{name}' in {city}",
+                         payload={'name': name, 'city': city}, cursor=cursor)
+        enqueue(cursor, 'venue_submitted', {'venue_id': venue_id}, dedupe_key=f"venue_submitted:{venue_id}")
         
         conn.commit()
         cursor.close()
         conn.close()
         
-        # Log venue creation
-        log_venue_action(owner_id, 'create', venue_id, f"Created venue '{name}' in {city}")
-        
-        # Notify all admins about new venue pending approval
-        notify_admins_new_venue(venue_id)
+        # Handle Images - uploaded in the background once the venue is committed,
+        # progress is reported over Socket.IO
+        photo_upload = start_photo_ingestion(venue_id, request.user_id,
+                                             read_uploads(request.files.getlist('photos')))
         
         return jsonify({
             'message': 'Venue added successfully',
-            'venue_id': venue_id
+            'venue_id': venue_id,
+            'photo_upload': photo_upload
         }), 201
         
     except Exception as e:
@@ -446,19 +491,29 @@ def update_venue(owner_id, venue_id):
         capacity = request.form.get('capacity')
         base_price = request.form.get('price')
         description = request.form.get('description')
+        try:
+            coordinates = parse_coordinates(request.form.get('latitude'), request.form.get('longitude'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         conn = get_db_connection()
         cursor = conn.cursor()
         
         # Verify ownership
         cursor.execute("""
-            SELECT venue_id FROM venues 
+            SELECT venue_id, address, city, latitude FROM venues 
             WHERE venue_id = %s AND owner_id = %s
         """, (venue_id, owner_id))
         
-        if not cursor.fetchone():
+        current = cursor.fetchone()
+        if not current:
             return jsonify({'error': 'Venue not found'}), 404
         
+        # New map pin, or re-geocode when the address moved (or was never located)
+        location = None
+        if coordinates or current['latitude'] is None or (address, city) != (current['address'], current['city']):
+            location = locate(address, city, coordinates)
+        
         # Update venue
         cursor.execute("""
             UPDATE venues 
@@ -467,6 +522,12 @@ def update_venue(owner_id, venue_id):
             WHERE venue_id = %s
         """, (name, venue_type, address, city, capacity, base_price, description, venue_id))
         
+        if location:
+            cursor.execute("""
+                UPDATE venues SET latitude = %s, longitude = %s, geohash = %s
+                WHERE venue_id = %s
+            """, (location['latitude'], location['longitude'], location['geohash'], venue_id))
+        
         conn.commit()
 
         # Handle Availability Update
@@ -492,26 +553,22 @@ def update_venue(owner_id, venue_id):
             except Exception as e:
                 print("Error updating availability:", e)
 
-        # Handle new photo uploads
-        from utils.image_utils import upload_image
-        photos = request.files.getlist('photos')
-        for photo in photos:
-            if photo:
-                image_url = upload_image(photo, folder=f"venues/{venue_id}")
-                if image_url:
-                    cursor.execute("""
-                        INSERT INTO venue_images (venue_id, image_url)
-                        VALUES (%s, %s)
-                    """, (venue_id, image_url))
+        # Log venue update
+        log_venue_action(request.user_id, 'update', venue_id, f"Updated venue '{name}'", payload={'name': name},
+                         cursor=cursor)
         
         conn.commit()
         cursor.close()
         conn.close()
         
-        # Log venue update
-        log_venue_action(owner_id, 'update', venue_id, f"Updated venue '{name}'")
+        # Handle new photo uploads in the background
+        photo_upload = start_photo_ingestion(venue_id, request.user_id,
+                                             read_uploads(request.files.getlist('photos')))
         
-        return jsonify({'message': 'Venue updated successfully'}), 200
+        return jsonify({
+            'message': 'Venue updated successfully',
+            'photo_upload': photo_upload
+        }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -550,13 +607,14 @@ def delete_venue(owner_id, venue_id):
             WHERE venue_id = %s
         """, (venue_id,))
         
+        # Log venue deletion
+        log_venue_action(request.user_id, 'delete', venue_id, "Soft deleted venue (set to inactive)",
+                         payload={'status': 'inactive'}, cursor=cursor)
+        
         conn.commit()
         cursor.close()
         conn.close()
         
-        # Log venue deletion
-        log_venue_action(owner_id, 'delete', venue_id, "Soft deleted venue (set to inactive)")
-        
         return jsonify({'message': 'Venue deleted successfully'}), 200
         
     except Exception as e:
@@ -607,6 +665,23 @@ def update_venue_availability(owner_id, venue_id):
 # BOOKINGS
 # ============================================================================
 
+# Fields of the owner booking list (?fields=)
+OWNER_BOOKING_FIELDS = {
+    'booking_id': 'b.booking_id',
+    'event_date': 'b.event_date',
+    'slot': 'b.slot',
+    'event_type': 'b.event_type',
+    'total_price': 'b.total_price',
+    'status': 'b.status',
+    'created_at': 'b.created_at',
+    'special_requirements': 'b.special_requirements',
+    'venue_name': 'v.name',
+    'customer_name': 'bcd.fullname',
+    'customer_email': 'bcd.email',
+    'phone_primary': 'bcd.phone_primary',
+}
+
+
 @owner_bp.route('/<int:owner_id>/bookings', methods=['GET'])
 @token_required
 @owner_required
@@ -619,21 +694,27 @@ def get_owner_bookings(owner_id):
         date_start = request.args.get('date_start', '')
         date_end = request.args.get('date_end', '')
         search_customer = request.args.get('search_customer', '')
+        sort_by = request.args.get('sort_by', 'created_at')
+        page_cursor = request.args.get('cursor')
+        limit = get_limit(request.args)
+        fields = requested_fields(request.args, OWNER_BOOKING_FIELDS)
         
-        conn = get_db_connection()
+        if sort_by not in ['created_at', 'event_date']:
+            sort_by = 'created_at'
+        
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
+        # The keyset cursor needs the sort column and booking_id in every row
         query = """
-            SELECT b.booking_id, b.event_date, b.slot, b.event_type, 
-                   b.total_price, b.status, b.created_at, b.special_requirements,
-                   v.name as venue_name, bcd.fullname as customer_name,
-                   bcd.email as customer_email, bcd.phone_primary
+            SELECT """ + select_list(OWNER_BOOKING_FIELDS, fields, required=['booking_id', sort_by]) + """
             FROM bookings b
             JOIN venues v ON b.venue_id = v.venue_id
             LEFT JOIN booking_customer_details bcd ON b.booking_id = bcd.booking_id
             WHERE v.owner_id = %s
         """
         params = [owner_id]
+        filtered = False
         
         if venue_id:
             query += " AND b.venue_id = %s"
@@ -642,29 +723,58 @@ def get_owner_bookings(owner_id):
         if status:
             query += " AND b.status = %s"
             params.append(status)
+            filtered = True
         
+        # Date ranges are plain ranges on event_date so they can use the index
         if date_range == 'last_7_days':
             query += " AND b.event_date >= DATE_SUB(CURDATE(), INTERVAL 7 DAY)"
+            filtered = True
         elif date_range == 'this_month':
-            query += " AND MONTH(b.event_date) = MONTH(CURDATE()) AND YEAR(b.event_date) = YEAR(CURDATE())"
+            query += """ AND b.event_date >= DATE_FORMAT(CURDATE(), '%%Y-%%m-01')
+                         AND b.event_date < DATE_FORMAT(CURDATE(), '%%Y-%%m-01') + INTERVAL 1 MONTH"""
+            filtered = True
         elif date_range == 'custom' and date_start and date_end:
             query += " AND b.event_date BETWEEN %s AND %s"
             params.extend([date_start, date_end])
+            filtered = True
         
         if search_customer:
             query += " AND (bcd.fullname LIKE %s OR bcd.email LIKE %s)"
             params.extend([f'%{search_customer}%', f'%{search_customer}%'])
-        
-        query += " ORDER BY b.created_at DESC"
-        
-        cursor.execute(query, params)
-        bookings = cursor.fetchall()
+            filtered = True
+        
+        try:
+            bookings, next_cursor = keyset_page(
+                cursor, query, params, f'b.{sort_by}', 'b.booking_id', page_cursor, limit
+            )
+        except InvalidCursor as e:
+            cursor.close()
+            conn.close()
+            return jsonify({'error': str(e)}), 400
+        
+        response = {'bookings': project(bookings, fields), 'next_cursor': next_cursor}
+        
+        # Total on the first page only: from the daily fact table when unfiltered
+        if not page_cursor:
+            if filtered:
+                cursor.execute(f"SELECT COUNT(*) as total FROM ({query}) as filtered", params)
+            else:
+                cursor.execute("""
+                    SELECT COALESCE(SUM(ds.bookings_created), 0) as total
+                    FROM venue_daily_stats ds
+                    JOIN venues v ON ds.venue_id = v.venue_id
+                    WHERE v.owner_id = %s
+                """ + (" AND ds.venue_id = %s" if venue_id else ""),
+                    (owner_id, venue_id) if venue_id else (owner_id,))
+            response['total'] = int(cursor.fetchone()['total'])
         
         cursor.close()
         conn.close()
         
-        return jsonify({'bookings': bookings}), 200
+        return jsonify(response), 200
         
+    except FieldSelectionError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -732,12 +842,14 @@ def update_booking_status(owner_id, booking_id):
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Verify ownership
+        # Verify ownership; the row lock keeps concurrent updates (a double click,
+        # the dashboard's lazy completion) from applying the same stats delta twice
         cursor.execute("""
-            SELECT b.booking_id, b.user_id, b.venue_id
+            SELECT b.booking_id, b.user_id, b.venue_id, b.status, DATE(b.created_at) as created_day
             FROM bookings b
             JOIN venues v ON b.venue_id = v.venue_id
             WHERE b.booking_id = %s AND v.owner_id = %s
+            FOR UPDATE OF b
         """, (booking_id, owner_id))
         
         booking = cursor.fetchone()
@@ -750,21 +862,18 @@ def update_booking_status(owner_id, booking_id):
             UPDATE bookings SET status = %s 
             WHERE booking_id = %s
         """, (new_status, booking_id))
+        record_booking_status_change(cursor, booking['venue_id'], booking['created_day'],
+                                     booking['status'], new_status)
+        
+        # Log the change and notify the customer (plus a review request once completed)
+        log_booking_action(request.user_id, 'update', booking_id, f"Changed status to {new_status}",
+                           payload={'from': booking['status'], 'to': new_status}, cursor=cursor)
+        enqueue(cursor, 'booking_status_changed', {'booking_id': booking_id, 'status': new_status})
         
         conn.commit()
         cursor.close()
         conn.close()
         
-        # Log booking status change
-        log_booking_action(owner_id, 'update', booking_id, f"Changed status to {new_status}")
-        
-        # Send notification to customer about status change
-        notify_booking_status_changed(booking_id, new_status)
-        
-        # If status is completed, also send review request notification
-        if new_status == 'completed':
-            notify_booking_completed_review_request(booking_id)
-        
         return jsonify({'message': 'Booking status updated successfully'}), 200
         
     except Exception as e:
@@ -787,8 +896,10 @@ def get_owner_payments(owner_id):
         date_start = request.args.get('date_start', '')
         date_end = request.args.get('date_end', '')
         sort_by = request.args.get('sort_by', 'payment_date')
+        page_cursor = request.args.get('cursor')
+        limit = get_limit(request.args)
         
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
         query = """
@@ -822,47 +933,53 @@ def get_owner_payments(owner_id):
             query += " AND bp.payment_date <= %s"
             params.append(date_end)
         
-        if sort_by in ['payment_date', 'amount']:
-            query += f" ORDER BY bp.{sort_by} DESC"
-        else:
-            query += " ORDER BY bp.payment_date DESC"
-        
-        cursor.execute(query, params)
-        payments = cursor.fetchall()
-        
-        # Calculate total revenue for filtered results
-        revenue_query = """
-            SELECT COALESCE(SUM(bp.amount), 0) as total_revenue
-            FROM booking_payments bp
-            JOIN bookings b ON bp.booking_id = b.booking_id
-            JOIN venues v ON b.venue_id = v.venue_id
-            WHERE v.owner_id = %s AND bp.payment_status = 'completed'
-        """
-        revenue_params = [owner_id]
-        
-        if venue_id:
-            revenue_query += " AND b.venue_id = %s"
-            revenue_params.append(venue_id)
-        
-        if date_start:
-            revenue_query += " AND bp.payment_date >= %s"
-            revenue_params.append(date_start)
+        if sort_by not in ['payment_date', 'amount']:
+            sort_by = 'payment_date'
         
-        if date_end:
-            revenue_query += " AND bp.payment_date <= %s"
-            revenue_params.append(date_end)
+        try:
+            payments, next_cursor = keyset_page(
+                cursor, query, params, f'bp.{sort_by}', 'bp.payment_id', page_cursor, limit
+            )
+        except InvalidCursor as e:
+            cursor.close()
+            conn.close()
+            return jsonify({'error': str(e)}), 400
         
-        cursor.execute(revenue_query, revenue_params)
+        response = {'payments': payments, 'next_cursor': next_cursor}
         
-        total_revenue = cursor.fetchone()['total_revenue']
+        # Totals on the first page only
+        if not page_cursor:
+            cursor.execute(f"SELECT COUNT(*) as total FROM ({query}) as filtered", params)
+            response['total'] = cursor.fetchone()['total']
+            
+            # Completed revenue for the venue/date filters, from the daily fact table
+            revenue_query = """
+                SELECT COALESCE(SUM(ds.revenue_completed), 0) as total_revenue
+                FROM venue_daily_stats ds
+                JOIN venues v ON ds.venue_id = v.venue_id
+                WHERE v.owner_id = %s
+            """
+            revenue_params = [owner_id]
+            
+            if venue_id:
+                revenue_query += " AND ds.venue_id = %s"
+                revenue_params.append(venue_id)
+            
+            if date_start:
+                revenue_query += " AND ds.day >= DATE(%s)"
+                revenue_params.append(date_start)
+            
+            if date_end:
+                revenue_query += " AND ds.day <= DATE(%s)"
+                revenue_params.append(date_end)
+            
+            cursor.execute(revenue_query, revenue_params)
+            response['total_revenue'] = float(cursor.fetchone()['total_revenue'])
         
         cursor.close()
         conn.close()
         
-        return jsonify({
-            'payments': payments,
-            'total_revenue': float(total_revenue)
-        }), 200
+        return jsonify(response), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -924,16 +1041,19 @@ def update_payment_status(owner_id, payment_id):
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Verify ownership
+        # Verify ownership; lock the payment so concurrent updates see each other's status
         cursor.execute("""
-            SELECT bp.payment_id
+            SELECT bp.payment_id, bp.amount, bp.payment_status, DATE(bp.payment_date) as payment_day, b.venue_id
             FROM booking_payments bp
             JOIN bookings b ON bp.booking_id = b.booking_id
             JOIN venues v ON b.venue_id = v.venue_id
             WHERE bp.payment_id = %s AND v.owner_id = %s
+            FOR UPDATE OF bp
         """, (payment_id, owner_id))
         
-        if not cursor.fetchone():
+        payment = cursor.fetchone()
+        
+        if not payment:
             return jsonify({'error': 'Payment not found'}), 404
         
         # Update payment status
@@ -942,6 +1062,16 @@ def update_payment_status(owner_id, payment_id):
             SET payment_status = %s 
             WHERE payment_id = %s
         """, (new_status, payment_id))
+        record_payment_status_change(cursor, payment['venue_id'], payment['payment_day'], payment['amount'],
+                                     payment['payment_status'], new_status)
+        
+        # Log payment status change
+        log_payment_action(request.user_id, 'update', payment_id, f"Changed status to {new_status}",
+                           payload={'from': payment['payment_status'], 'to': new_status,
+                                    'amount': payment['amount']}, cursor=cursor)
+        if new_status == 'completed' and payment['payment_status'] != 'completed':
+            enqueue(cursor, 'payment_received', {'payment_id': payment_id},
+                    dedupe_key=f"payment_received:{payment_id}")
         
         conn.commit()
         cursor.close()
@@ -969,7 +1099,7 @@ def get_owner_reviews(owner_id):
         date_end = request.args.get('date_end', '')
         sort_by = request.args.get('sort_by', 'review_date')
         
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
         query = """
@@ -1015,6 +1145,21 @@ def get_owner_reviews(owner_id):
         return jsonify({'error': str(e)}), 500
 
 
+# ============================================================================
+# EXPORTS
+# ============================================================================
+
+@owner_bp.route('/<int:owner_id>/exports/<dataset>', methods=['GET'])
+@token_required
+@owner_required
+def export_owner_report(owner_id, dataset):
+    """Stream the owner's bookings, payments, reviews or logs as CSV/XLSX (?format=, ?gzip=1)"""
+    try:
+        return export_response(dataset, request.args, owner_id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 # ============================================================================
 # PROFILE
 # ============================================================================
@@ -7,6 +7,8 @@ from flask import Blueprint, request, jsonify
 
 from utils.db import get_db_connection
 from utils.decorators import token_required
+from utils.pagination import get_limit, keyset_page, InvalidCursor
+from utils.log_utils import decode_payloads
 from utils.phone_validation import validate_phone_format
 
 users_bp = Blueprint('users', __name__, url_prefix='/api/users')
@@ -107,6 +109,8 @@ def get_user_bookings(user_id):
         date_start = request.args.get('date_start', '')
         date_end = request.args.get('date_end', '')
         sort_by = request.args.get('sort_by', 'event_date')
+        page_cursor = request.args.get('cursor')
+        limit = get_limit(request.args)
         
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -137,18 +141,29 @@ def get_user_bookings(user_id):
             query += " AND b.event_date <= %s"
             params.append(date_end)
         
-        if sort_by in ['event_date', 'created_at']:
-            query += f" ORDER BY b.{sort_by} DESC"
-        else:
-            query += " ORDER BY b.event_date DESC"
+        if sort_by not in ['event_date', 'created_at']:
+            sort_by = 'event_date'
         
-        cursor.execute(query, params)
-        bookings = cursor.fetchall()
+        try:
+            bookings, next_cursor = keyset_page(
+                cursor, query, params, f'b.{sort_by}', 'b.booking_id', page_cursor, limit
+            )
+        except InvalidCursor as e:
+            cursor.close()
+            conn.close()
+            return jsonify({'error': str(e)}), 400
+        
+        response = {'bookings': bookings, 'next_cursor': next_cursor}
+        
+        # Total on the first page only (a user's bookings are an index range)
+        if not page_cursor:
+            cursor.execute(f"SELECT COUNT(*) as total FROM ({query}) as filtered", params)
+            response['total'] = cursor.fetchone()['total']
         
         cursor.close()
         conn.close()
         
-        return jsonify({'bookings': bookings}), 200
+        return jsonify(response), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -200,13 +215,12 @@ def get_user_booking_details(user_id, booking_id):
 
         
         # Timeline (Logs)
-        search_pattern = f"Booking #{booking_id}:%"
         cursor.execute("""
             SELECT * FROM logs 
-            WHERE target_table = 'bookings' AND details LIKE %s
+            WHERE target_table = 'bookings' AND target_id = %s
             ORDER BY created_at DESC
-        """, (search_pattern,))
-        booking['timeline'] = cursor.fetchall()
+        """, (booking_id,))
+        booking['timeline'] = decode_payloads(cursor.fetchall())
         
         cursor.close()
         conn.close()
@@ -228,10 +242,8 @@ def get_user_conversations(user_id):
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Check if user is also an owner
-        cursor.execute("SELECT owner_id FROM owners WHERE user_id = %s", (user_id,))
-        owner_data = cursor.fetchone()
-        owner_id = owner_data['owner_id'] if owner_data else None
+        # Owner identity comes from the token principal
+        owner_id = request.owner_id
         
         # Fetch conversations where user is participating as customer, owner, or admin
         # We need to handle NULLs due to different conversation types
@@ -425,12 +437,8 @@ def get_conversation_messages(conversation_id):
              is_participant = True
              
         # 3. Requester is the Owner
-        elif conv['owner_id']:
-            # Check if user owns the owner_id
-            cursor.execute("SELECT owner_id FROM owners WHERE user_id = %s", (request.user_id,))
-            owner_data = cursor.fetchone()
-            if owner_data and owner_data['owner_id'] == conv['owner_id']:
-                is_participant = True
+        elif conv['owner_id'] and conv['owner_id'] == request.owner_id:
+            is_participant = True
                 
         if not is_participant:
              return jsonify({'error': 'Unauthorized'}), 403
@@ -7,41 +7,93 @@ from flask import Blueprint, request, jsonify
 
 from utils.db import get_db_connection
 from utils.decorators import token_required
+from utils.fields import FieldSelectionError, requested_fields, select_list, wants, project
+from utils.geo import DISTANCE_KM_SQL, InvalidArea, area_conditions, parse_area
+from utils.image_utils import COVER_IMAGE_COLUMNS, COVER_IMAGE_FIELDS, apply_cover_image
 from utils.log_utils import log_review_action
-from utils.notification_utils import notify_new_review
+from utils.outbox import enqueue
+from utils.pagination import InvalidCursor, get_limit, keyset_page
+from utils.recommendations import recommend, similar_venues, user_history
+from utils.review_stats import record_review, rating_summary
 
 venues_bp = Blueprint('venues', __name__, url_prefix='/api/venues')
 
 
+# Fields of the public venue list (?fields=); image_* come from the cover image
+VENUE_LIST_FIELDS = {
+    'venue_id': 'v.venue_id',
+    'name': 'v.name',
+    'city': 'v.city',
+    'type': 'v.type',
+    'capacity': 'v.capacity',
+    'base_price': 'v.base_price',
+    'rating': 'v.rating',
+    'review_count': 'v.review_count',
+    'address': 'v.address',
+    'latitude': 'v.latitude',
+    'longitude': 'v.longitude',
+    'status': 'v.status',
+}
+
+# Review feed, paged by (review_date, review_id) keyset over idx_reviews_venue_date
+REVIEW_PAGE_SIZE = 10
+
+REVIEW_FEED_QUERY = """
+    SELECT vr.review_id, vr.user_id, vr.venue_id, vr.rating, vr.review_text, vr.review_date,
+           u.name as user_name
+    FROM venue_reviews vr
+    JOIN users u ON vr.user_id = u.user_id
+    WHERE vr.venue_id = %s
+"""
+
+
 @venues_bp.route('', methods=['GET'])
 def get_venues():
-    """List all venues with advanced filters"""
+    """
+    List all venues with advanced filters.
+
+    Near me: ?lat=&lng=[&radius_km=] and/or ?bbox=south,west,north,east
+    combine with the other filters; with a centre the results include
+    distance_km and are sorted nearest first unless ?sort_by= says otherwise.
+    """
     try:
         # Get query parameters
+        area = parse_area(request.args)
+        center = area['center'] if area else None
         search = request.args.get('search', '')
-        city = request.args.get('city', 'Karachi')
+        # No default city for an area search, it may span several
+        city = request.args.get('city', '' if area else 'Karachi')
         venue_type = request.args.get('type', '')
         capacity_min = request.args.get('capacity_min', type=int)
         capacity_max = request.args.get('capacity_max', type=int)
         price_min = request.args.get('price_min', type=float)
         price_max = request.args.get('price_max', type=float)
-        sort_by = request.args.get('sort_by', 'rating')
+        sort_by = request.args.get('sort_by', 'distance' if center else 'rating')
         sort_order = request.args.get('sort_order', 'desc')
         page = request.args.get('page', 1, type=int)
         per_page = 15
+        columns = dict(VENUE_LIST_FIELDS, distance_km=f"ROUND({DISTANCE_KM_SQL}, 2)") if center else VENUE_LIST_FIELDS
+        fields = requested_fields(request.args, [*columns, *COVER_IMAGE_FIELDS])
+        with_cover = wants(fields, *COVER_IMAGE_FIELDS)
         
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
-        # Build query
-        query = """
-            SELECT v.venue_id, v.name, v.city, v.type, v.capacity, v.base_price, 
-                   v.rating, v.address, v.status,
-                   (SELECT image_url FROM venue_images WHERE venue_id = v.venue_id LIMIT 1) as image_url
+        # Build query (only the requested columns)
+        query = "SELECT " + select_list(columns, fields, required=['venue_id'] + (['distance_km'] if center else []))
+        params = [center[1], center[0]] if center else []
+        if with_cover:
+            query += ", " + COVER_IMAGE_COLUMNS + """
             FROM venues v
-            WHERE v.status = 'active'
-        """
-        params = []
+            LEFT JOIN venue_images ci ON ci.image_id = v.cover_image_id"""
+        else:
+            query += " FROM venues v"
+        query += " WHERE v.status = 'active'"
+        
+        if area:
+            conditions, area_params = area_conditions(area)
+            query += conditions
+            params.extend(area_params)
         
         if search:
             query += " AND (v.name LIKE %s OR v.address LIKE %s)"
@@ -79,12 +131,14 @@ def get_venues():
         
         # Add sorting
         valid_sort = ['rating', 'base_price', 'capacity', 'name']
-        if sort_by not in valid_sort:
-            sort_by = 'rating'
-        if sort_order not in ['asc', 'desc']:
-            sort_order = 'desc'
-        
-        query += f" ORDER BY v.{sort_by} {sort_order.upper()}"
+        if sort_by == 'distance' and center:
+            query += " ORDER BY distance_km ASC, v.venue_id ASC"
+        else:
+            if sort_by not in valid_sort:
+                sort_by = 'rating'
+            if sort_order not in ['asc', 'desc']:
+                sort_order = 'desc'
+            query += f" ORDER BY v.{sort_by} {sort_order.upper()}"
         
         # Add pagination
         offset = (page - 1) * per_page
@@ -93,17 +147,21 @@ def get_venues():
         
         cursor.execute(query, params)
         venues = cursor.fetchall()
+        if with_cover:
+            venues = [apply_cover_image(venue) for venue in venues]
         
         cursor.close()
         conn.close()
         
         return jsonify({
-            'venues': venues,
+            'venues': project(venues, fields),
             'total_pages': total_pages,
             'current_page': page,
             'total_venues': total
         }), 200
         
+    except (FieldSelectionError, InvalidArea) as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -112,7 +170,7 @@ def get_venues():
 def get_venue_details(venue_id):
     """Get single venue details"""
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
         # Get venue details
@@ -141,16 +199,11 @@ def get_venue_details(venue_id):
         """, (venue_id,))
         venue['facilities'] = cursor.fetchall()
         
-        # Get reviews
-        cursor.execute("""
-            SELECT vr.*, u.name as user_name
-            FROM venue_reviews vr
-            JOIN users u ON vr.user_id = u.user_id
-            WHERE vr.venue_id = %s
-            ORDER BY vr.review_date DESC
-            LIMIT 10
-        """, (venue_id,))
-        venue['reviews'] = cursor.fetchall()
+        # Rating breakdown from the venue's aggregates, first page of the review feed
+        venue['rating_summary'] = rating_summary(venue)
+        venue['reviews'], venue['reviews_next_cursor'] = keyset_page(
+            cursor, REVIEW_FEED_QUERY, [venue_id], 'vr.review_date', 'vr.review_id', None, REVIEW_PAGE_SIZE
+        )
         
         cursor.close()
         conn.close()
@@ -161,6 +214,74 @@ def get_venue_details(venue_id):
         return jsonify({'error': str(e)}), 500
 
 
+@venues_bp.route('/<int:venue_id>/reviews', methods=['GET'])
+def get_venue_reviews(venue_id):
+    """Review feed for a venue, newest first (?cursor=, ?limit=, ?rating=1..5)"""
+    try:
+        rating = request.args.get('rating', type=int)
+        limit = get_limit(request.args)
+        token = request.args.get('cursor')
+        
+        conn = get_db_connection(read_only=True)
+        cursor = conn.cursor()
+        
+        query = REVIEW_FEED_QUERY
+        params = [venue_id]
+        if rating:
+            query += " AND vr.rating = %s"
+            params.append(rating)
+        
+        reviews, next_cursor = keyset_page(cursor, query, params, 'vr.review_date', 'vr.review_id', token, limit)
+        result = {'items': reviews, 'next_cursor': next_cursor}
+        
+        if not token:
+            # Totals come from the venue's aggregates, not a COUNT over its reviews
+            cursor.execute("""
+                SELECT review_count, rating_sum, rating_1, rating_2, rating_3, rating_4, rating_5
+                FROM venues WHERE venue_id = %s
+            """, (venue_id,))
+            venue = cursor.fetchone()
+            if not venue:
+                return jsonify({'error': 'Venue not found'}), 404
+            summary = rating_summary(venue)
+            result['rating_summary'] = summary
+            result['total'] = summary['histogram'].get(str(rating), 0) if rating else summary['count']
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify(result), 200
+        
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@venues_bp.route('/<int:venue_id>/similar', methods=['GET'])
+def get_similar_venues(venue_id):
+    """Venues similar to this one, from the precomputed neighbours (?limit=, max 20)"""
+    try:
+        limit = max(1, min(request.args.get('limit', 6, type=int) or 6, 20))
+        return jsonify({'venues': similar_venues(venue_id, limit)}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@venues_bp.route('/recommended', methods=['GET'])
+@token_required
+def get_recommended_venues():
+    """Venues recommended from the user's bookings and reviews (?limit=, max 20)"""
+    try:
+        limit = max(1, min(request.args.get('limit', 10, type=int) or 10, 20))
+        venues, personalized = recommend(user_history(request.user_id), limit)
+        return jsonify({'venues': venues, 'personalized': personalized}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @venues_bp.route('/<int:venue_id>/booking-data', methods=['GET'])
 def get_booking_data(venue_id):
     """Get booking form data (facilities, availability)"""
@@ -241,7 +362,7 @@ def get_booking_data(venue_id):
 def get_recent_reviews():
     """Get recent high-rated reviews for homepage testimonials"""
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
         # Fetch 3 most recent reviews with rating >= 4
@@ -284,7 +405,7 @@ def create_review(venue_id):
         rating = data.get('rating')
         review_text = data.get('review_text', '')
         
-        if not rating or rating < 1 or rating > 5:
+        if isinstance(rating, bool) or rating not in (1, 2, 3, 4, 5):
             return jsonify({'error': 'Invalid rating'}), 400
         
         conn = get_db_connection()
@@ -301,27 +422,21 @@ def create_review(venue_id):
             (user_id, venue_id, rating, review_text, review_date)
             VALUES (%s, %s, %s, %s, NOW())
         """, (request.user_id, venue_id, rating, review_text))
+        review_id = cursor.lastrowid
         
-        # Update venue rating
-        cursor.execute("""
-            UPDATE venues 
-            SET rating = (
-                SELECT AVG(rating) 
-                FROM venue_reviews 
-                WHERE venue_id = %s
-            )
-            WHERE venue_id = %s
-        """, (venue_id, venue_id))
+        # Update venue rating aggregates
+        record_review(cursor, venue_id, rating)
+        
+        # Log and notify
+        log_review_action(request.user_id, 'create', review_id, f"Submitted {rating}-star review for venue #{venue_id}",
+                          payload={'venue_id': venue_id, 'rating': rating}, cursor=cursor)
+        enqueue(cursor, 'review_created', {'venue_id': venue_id, 'rating': rating},
+                dedupe_key=f"review_created:{review_id}")
         
         conn.commit()
-        review_id = cursor.lastrowid
         cursor.close()
         conn.close()
         
-        # Log and notify
-        log_review_action(request.user_id, 'create', review_id, f"Submitted {rating}-star review for venue #{venue_id}")
-        notify_new_review(venue_id, rating)
-        
         return jsonify({
             'message': 'Review submitted successfully',
             'review_id': review_id
@@ -335,7 +450,7 @@ def create_review(venue_id):
 def get_public_stats():
     """Get public statistics for homepage"""
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
         # Get total venues
@@ -373,7 +488,7 @@ def get_public_stats():
 def get_filters():
     """Get dynamic filter options for search"""
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
         # Get distinct cities
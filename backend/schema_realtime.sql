@@ -1,5 +1,6 @@
 -- VenueBook Real-time System Tables
 -- Tables for logging, notifications, and reviews
+-- Creates the latest schema; existing databases are upgraded with scripts/migrate.py
 
 SET FOREIGN_KEY_CHECKS = 0;
 
@@ -12,6 +13,12 @@ DROP TABLE IF EXISTS booking_customer_details;
 DROP TABLE IF EXISTS booking_facilities;
 DROP TABLE IF EXISTS notifications;
 DROP TABLE IF EXISTS logs;
+DROP TABLE IF EXISTS venue_similarity_runs;
+DROP TABLE IF EXISTS venue_similarity_inputs;
+DROP TABLE IF EXISTS venue_similarities;
+DROP TABLE IF EXISTS outbox_events;
+DROP TABLE IF EXISTS rate_limit_buckets;
+DROP TABLE IF EXISTS venue_daily_stats;
 DROP TABLE IF EXISTS venue_payment_info;
 DROP TABLE IF EXISTS venue_reviews;
 DROP TABLE IF EXISTS booking_reviews;
@@ -20,6 +27,7 @@ DROP TABLE IF EXISTS bookings;
 DROP TABLE IF EXISTS venue_availability;
 DROP TABLE IF EXISTS venue_facility_map;
 DROP TABLE IF EXISTS venue_facilities;
+DROP TABLE IF EXISTS image_assets;
 DROP TABLE IF EXISTS venue_images;
 DROP TABLE IF EXISTS venues;
 DROP TABLE IF EXISTS owners;
@@ -35,7 +43,11 @@ CREATE TABLE users (
     password VARCHAR(255) NOT NULL,
     phone VARCHAR(50),
     role ENUM('user','owner','admin','bot') DEFAULT 'user',
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    status ENUM('active','blocked') DEFAULT 'active',
+    claims_changed_at DATETIME NULL,     -- tokens issued at or before this carry stale claims
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_users_role_created (role, created_at),
+    INDEX idx_users_claims_changed (claims_changed_at)
 );
 
 -- ================================
@@ -61,13 +73,26 @@ CREATE TABLE venues (
     type VARCHAR(50),
     address VARCHAR(500),
     city VARCHAR(100),
+    latitude DECIMAL(9,6) NULL,          -- from utils/geocoding.py (or the owner's map pin)
+    longitude DECIMAL(9,6) NULL,
+    geohash CHAR(9) NULL,                -- utils/geo.py; prefix ranges back "near me" search
     capacity INT,
     base_price DECIMAL(12,2),
-    rating DECIMAL(3,2),
+    rating DECIMAL(3,2),                 -- rating_sum / review_count
+    review_count INT NOT NULL DEFAULT 0, -- aggregates kept by utils/review_stats.py
+    rating_sum INT NOT NULL DEFAULT 0,
+    rating_1 INT NOT NULL DEFAULT 0,     -- star histogram
+    rating_2 INT NOT NULL DEFAULT 0,
+    rating_3 INT NOT NULL DEFAULT 0,
+    rating_4 INT NOT NULL DEFAULT 0,
+    rating_5 INT NOT NULL DEFAULT 0,
     description TEXT,
     status ENUM('active', 'inactive', 'pending', 'rejected') DEFAULT 'pending',
+    cover_image_id INT NULL,             -- venue_images.image_id shown on listing cards
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (owner_id) REFERENCES owners(owner_id)
+    FOREIGN KEY (owner_id) REFERENCES owners(owner_id),
+    INDEX idx_venues_status_city_type_rating (status, city, type, rating),
+    INDEX idx_venues_status_geohash (status, geohash)
 );
 
 -- ================================
@@ -171,8 +196,23 @@ CREATE TABLE venue_images (
     image_id INT AUTO_INCREMENT PRIMARY KEY,
     venue_id INT NOT NULL,
     image_url VARCHAR(1000),
+    thumb_url VARCHAR(1000) NULL,
+    card_url VARCHAR(1000) NULL,
+    full_url VARCHAR(1000) NULL,
+    content_hash CHAR(64) NULL,          -- SHA-256 of the image bytes
     uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (venue_id) REFERENCES venues(venue_id)
+    FOREIGN KEY (venue_id) REFERENCES venues(venue_id),
+    UNIQUE KEY uq_venue_content_hash (venue_id, content_hash)
+);
+
+-- Content-addressed index of stored images (hash -> URL), shared by uploads and seed scripts
+CREATE TABLE image_assets (
+    content_hash CHAR(64) PRIMARY KEY,
+    url VARCHAR(1000) NOT NULL,
+    thumb_url VARCHAR(1000) NULL,
+    card_url VARCHAR(1000) NULL,
+    full_url VARCHAR(1000) NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- ================================
@@ -202,7 +242,8 @@ CREATE TABLE venue_availability (
     date DATE NOT NULL,
     slot ENUM('full-day','morning','evening'),
     is_available TINYINT DEFAULT 1,
-    FOREIGN KEY (venue_id) REFERENCES venues(venue_id)
+    FOREIGN KEY (venue_id) REFERENCES venues(venue_id),
+    UNIQUE KEY uq_availability_venue_date_slot (venue_id, date, slot)
 );
 
 -- ================================
@@ -220,7 +261,12 @@ CREATE TABLE bookings (
     status ENUM('pending','confirmed','rejected','completed') DEFAULT 'pending',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(user_id),
-    FOREIGN KEY (venue_id) REFERENCES venues(venue_id)
+    FOREIGN KEY (venue_id) REFERENCES venues(venue_id),
+    INDEX idx_bookings_venue_date_status (venue_id, event_date, status),
+    INDEX idx_bookings_user_created (user_id, created_at),
+    INDEX idx_bookings_user_event_date (user_id, event_date),
+    INDEX idx_bookings_venue_created (venue_id, created_at),
+    INDEX idx_bookings_created (created_at)
 );
 
 -- ================================
@@ -258,7 +304,8 @@ CREATE TABLE booking_payments (
     trx_id VARCHAR(255) NULL,
     payment_status ENUM('pending','completed','failed'),
     payment_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP ,
-    FOREIGN KEY (booking_id) REFERENCES bookings(booking_id)
+    FOREIGN KEY (booking_id) REFERENCES bookings(booking_id),
+    INDEX idx_payments_status_date (payment_status, payment_date)
 );
 
 -- ================================
@@ -273,7 +320,10 @@ CREATE TABLE venue_reviews (
     review_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 
     FOREIGN KEY (user_id) REFERENCES users(user_id),
-    FOREIGN KEY (venue_id) REFERENCES venues(venue_id)
+    FOREIGN KEY (venue_id) REFERENCES venues(venue_id),
+    INDEX idx_reviews_venue_date (venue_id, review_date),
+    INDEX idx_reviews_venue_rating_date (venue_id, rating, review_date),
+    INDEX idx_reviews_date (review_date)
 );
 
 -- ================================
@@ -291,20 +341,109 @@ CREATE TABLE notifications (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(user_id),
     FOREIGN KEY (booking_id) REFERENCES bookings(booking_id),
-    FOREIGN KEY (venue_id) REFERENCES venues(venue_id)
+    FOREIGN KEY (venue_id) REFERENCES venues(venue_id),
+    INDEX idx_notifications_user_read_created (user_id, is_read, created_at)
 );
 
 -- ================================
 -- 16. GENERAL LOG TABLE
 -- ================================
+-- Partitioned by month; scripts/rotate_logs.py adds monthly partitions
+-- and archives old ones (partitioned tables cannot carry foreign keys)
 CREATE TABLE logs (
-    log_id INT AUTO_INCREMENT PRIMARY KEY,
-    action_by INT NULL,                  -- FK to users
+    log_id INT AUTO_INCREMENT,
+    action_by INT NULL,                  -- users.user_id
+    actor_role VARCHAR(20) NULL,         -- user/owner/admin/system
     action_type VARCHAR(100),
     target_table VARCHAR(50),
+    target_id INT NULL,                  -- primary key of the row in target_table
     details TEXT,
+    payload JSON NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (log_id, created_at),
+    INDEX idx_logs_created_table (created_at, target_table),
+    INDEX idx_logs_target (target_table, target_id, created_at)
+)
+PARTITION BY RANGE (UNIX_TIMESTAMP(created_at)) (
+    PARTITION pmax VALUES LESS THAN MAXVALUE
+);
+
+-- ================================
+-- 17. DAILY VENUE STATS (fact table for analytics time series)
+-- ================================
+-- Kept current by the booking/payment write paths (utils/daily_stats.py),
+-- rebuilt by scripts/backfill_daily_stats.py
+CREATE TABLE venue_daily_stats (
+    venue_id INT NOT NULL,
+    day DATE NOT NULL,
+    bookings_created INT NOT NULL DEFAULT 0,      -- by booking created_at day
+    bookings_confirmed INT NOT NULL DEFAULT 0,
+    bookings_completed INT NOT NULL DEFAULT 0,
+    revenue_completed DECIMAL(14,2) NOT NULL DEFAULT 0,  -- by payment_date day
+    revenue_pending DECIMAL(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (venue_id, day),
+    INDEX idx_daily_stats_day (day)
+);
+
+-- ================================
+-- 18. RATE LIMIT BUCKETS (shared token buckets, RATE_LIMIT_BACKEND=mysql)
+-- ================================
+-- Disposable state read and written by utils/rate_limit.py on every request
+CREATE TABLE rate_limit_buckets (
+    bucket_key VARCHAR(120) NOT NULL PRIMARY KEY,  -- "<class>:user:<id>" or "<class>:ip:<address>"
+    tokens DOUBLE NOT NULL,
+    updated_at DATETIME(6) NOT NULL
+) ENGINE=MEMORY;
+
+-- ================================
+-- 19. OUTBOX EVENTS (post-commit side effects)
+-- ================================
+-- Written in the same transaction as the business change, delivered in
+-- batches by the dispatcher in utils/outbox.py
+CREATE TABLE outbox_events (
+    event_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    event_type VARCHAR(50) NOT NULL,          -- key of utils.outbox.HANDLERS
+    payload JSON NOT NULL,
+    dedupe_key VARCHAR(150) NULL,             -- one-time events, e.g. "booking_created:42"
+    status ENUM('pending', 'delivered', 'failed') NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    last_error TEXT NULL,
+    available_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,  -- next attempt (retry backoff)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (action_by) REFERENCES users(user_id)
+    delivered_at TIMESTAMP NULL,
+    UNIQUE KEY uq_outbox_dedupe (dedupe_key),
+    INDEX idx_outbox_status_available (status, available_at, event_id)
+);
+
+-- ================================
+-- 20. VENUE SIMILARITIES (recommendations)
+-- ================================
+-- Top-K neighbours per venue, rebuilt nightly by scripts/build_recommendations.py
+-- and served from memory by utils/recommendations.py
+CREATE TABLE venue_similarities (
+    venue_id INT NOT NULL,
+    position SMALLINT NOT NULL,               -- 0 = most similar
+    neighbour_id INT NOT NULL,
+    score FLOAT NOT NULL,
+    PRIMARY KEY (venue_id, position)
+);
+
+-- Attribute signature per venue at the last run; a change marks the venue for recompute
+CREATE TABLE venue_similarity_inputs (
+    venue_id INT PRIMARY KEY,
+    signature VARCHAR(255) NOT NULL,          -- city|type|capacity band|price band|rating
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Incremental runs pick up bookings and reviews since the last run's started_at
+CREATE TABLE venue_similarity_runs (
+    run_id INT AUTO_INCREMENT PRIMARY KEY,
+    started_at TIMESTAMP NOT NULL,
+    finished_at TIMESTAMP NULL,
+    mode ENUM('full', 'incremental') NOT NULL,
+    venues INT NOT NULL DEFAULT 0,
+    recomputed INT NOT NULL DEFAULT 0,
+    written INT NOT NULL DEFAULT 0
 );
 
 SET FOREIGN_KEY_CHECKS = 1;
@@ -0,0 +1,89 @@
+"""
+Backfill cover images and responsive derivatives for existing venues.
+
+The columns and tables it fills come from migration 0001; run
+scripts/migrate.py first.
+
+1. Checks that migration 0001 has been applied.
+2. Generates thumb/card/full derivatives for images that have none
+   (Cloudinary transformation URLs, or Pillow WebP files for local storage).
+3. Points every venue without a cover at its oldest image.
+
+Usage: python scripts/backfill_cover_images.py
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from utils.db import get_db_connection
+from utils.migrations import is_applied
+from utils.image_utils import LocalStorage, get_storage, cloudinary_variant_url, IMAGE_VARIANTS
+
+# Adds the venue_images derivative/content_hash columns, venues.cover_image_id and image_assets
+REQUIRED_MIGRATION = '0001'
+
+
+def variants_for(storage, image):
+    url = image['image_url']
+    if '/upload/' in url:
+        return {name: cloudinary_variant_url(url, name) for name in IMAGE_VARIANTS}
+
+    if isinstance(storage, LocalStorage) and url.startswith(storage.base_url + '/'):
+        relative = url[len(storage.base_url) + 1:]
+        path = os.path.join(storage.root, relative)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return storage.make_variants(url, f.read(), os.path.dirname(relative))
+
+    return {name: url for name in IMAGE_VARIANTS}
+
+
+def backfill_cover_images():
+    app, _ = create_app()
+
+    with app.app_context():
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        print("1. Checking schema...")
+        if not is_applied(cursor, REQUIRED_MIGRATION):
+            print(f"   Migration {REQUIRED_MIGRATION} has not been applied; run scripts/migrate.py first.")
+            cursor.close()
+            conn.close()
+            return 1
+        conn.commit()
+
+        print("2. Generating derivatives...")
+        storage = get_storage(app)
+        cursor.execute("SELECT image_id, image_url FROM venue_images WHERE card_url IS NULL AND image_url IS NOT NULL")
+        images = cursor.fetchall()
+        for image in images:
+            variants = variants_for(storage, image)
+            cursor.execute("""
+                UPDATE venue_images SET thumb_url = %s, card_url = %s, full_url = %s
+                WHERE image_id = %s
+            """, (variants['thumb'], variants['card'], variants['full'], image['image_id']))
+        conn.commit()
+        print(f"   Updated {len(images)} images.")
+
+        print("3. Assigning cover images...")
+        cursor.execute("""
+            UPDATE venues v
+            JOIN (SELECT venue_id, MIN(image_id) as image_id FROM venue_images GROUP BY venue_id) first_image
+              ON first_image.venue_id = v.venue_id
+            SET v.cover_image_id = first_image.image_id
+            WHERE v.cover_image_id IS NULL
+        """)
+        print(f"   Assigned {cursor.rowcount} covers.")
+
+        conn.commit()
+        cursor.close()
+        conn.close()
+        print("\nDone!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(backfill_cover_images())
@@ -0,0 +1,46 @@
+"""
+Rebuild the venue_daily_stats fact table from bookings and payments.
+
+Run after bulk imports (e.g. generate_synthetic_data.py) or to repair drift.
+Rebuild during low traffic: writes that land mid-rebuild in the rebuilt range
+can be counted twice or missed.
+
+Usage:
+    python scripts/backfill_daily_stats.py                      # all history
+    python scripts/backfill_daily_stats.py --from 2025-01-01 --to 2025-12-31
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from utils.db import get_db_connection
+from utils.daily_stats import rebuild
+
+
+def backfill_daily_stats(date_from=None, date_to=None):
+    app, _ = create_app()
+
+    with app.app_context():
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        print(f"Rebuilding venue_daily_stats ({date_from or 'beginning'} to {date_to or 'today'})...")
+        started = time.time()
+        written = rebuild(cursor, date_from, date_to)
+        conn.commit()
+
+        cursor.close()
+        conn.close()
+        print(f"Done! {written} rows written in {time.time() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the daily venue stats fact table.")
+    parser.add_argument('--from', dest='date_from', help="First day (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='date_to', help="Last day, inclusive (YYYY-MM-DD)")
+    args = parser.parse_args()
+    backfill_daily_stats(args.date_from, args.date_to)
@@ -0,0 +1,65 @@
+"""
+Geocode venue addresses with the configured GEOCODER.
+
+Migration 0011 placed existing venues with the offline geocoder; run this
+once GEOCODER=nominatim is configured to replace those approximations, or
+with --missing to only locate venues that have no coordinates yet.
+Nominatim's usage policy allows one request per second, hence --delay.
+
+Usage:
+    python scripts/backfill_geocodes.py [--missing] [--delay 1.0]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from utils.db import get_db_connection
+from utils.geocoding import get_geocoder, locate
+
+
+def backfill_geocodes(missing_only=False, delay=1.0):
+    app, _ = create_app()
+
+    with app.app_context():
+        geocoder = get_geocoder()
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        query = "SELECT venue_id, address, city FROM venues"
+        if missing_only:
+            query += " WHERE latitude IS NULL"
+        cursor.execute(query + " ORDER BY venue_id")
+        venues = cursor.fetchall()
+        print(f"Geocoding {len(venues)} venues with {app.config['GEOCODER']}...")
+
+        located = 0
+        for i, venue in enumerate(venues, 1):
+            location = locate(venue['address'], venue['city'], geocoder=geocoder)
+            if location['geohash']:
+                cursor.execute("""
+                    UPDATE venues SET latitude = %s, longitude = %s, geohash = %s
+                    WHERE venue_id = %s
+                """, (location['latitude'], location['longitude'], location['geohash'], venue['venue_id']))
+                located += 1
+            if i % 100 == 0:
+                conn.commit()
+                print(f"  {i}/{len(venues)}")
+            if delay and app.config['GEOCODER'] != 'offline':
+                time.sleep(delay)
+
+        conn.commit()
+        cursor.close()
+        conn.close()
+        print(f"Done! {located} of {len(venues)} venues located")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Geocode venue addresses.")
+    parser.add_argument('--missing', action='store_true', help="Only venues without coordinates")
+    parser.add_argument('--delay', type=float, default=1.0, help="Seconds between geocoder requests")
+    args = parser.parse_args()
+    backfill_geocodes(args.missing, args.delay)
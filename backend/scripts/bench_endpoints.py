@@ -0,0 +1,310 @@
+"""
+HTTP endpoint benchmark suite.
+
+Drives the hot routes of every blueprint in-process through create_app()'s
+test client against a seeded local MySQL database (see
+scripts/generate_synthetic_data.py) and reports, per endpoint:
+
+- p50/p95/p99 and mean latency,
+- queries per request,
+- rows scanned per request (InnoDB handler reads).
+
+Query and row counts come from MySQL's global status counters sampled
+around each request, so run the benchmark against a database nobody else
+is using. Results include the row counts of the main tables so runs at
+several dataset sizes (--scale of the generator) can be told apart, and
+can be saved as a baseline JSON and diffed on later runs.
+
+Usage:
+    python scripts/bench_endpoints.py --iterations 50 --output bench_baseline.json
+    python scripts/bench_endpoints.py --compare bench_baseline.json --only venues
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import statistics
+from datetime import date, datetime, timedelta
+
+import jwt
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from utils.db import get_db_connection
+from utils.principal_cache import build_claims
+
+# Handler counters that correspond to rows read by the storage engine
+ROW_READ_COUNTERS = ('Handler_read_first', 'Handler_read_key', 'Handler_read_last', 'Handler_read_next',
+                     'Handler_read_prev', 'Handler_read_rnd', 'Handler_read_rnd_next')
+DATASET_TABLES = ('users', 'venues', 'bookings', 'booking_payments', 'venue_reviews', 'notifications',
+                  'messages', 'logs')
+REGRESSION_THRESHOLD = 0.2      # 20% slower p95 or more queries/rows is flagged
+
+
+def booking_payload(ctx):
+    """A new booking on a random far-future date so slots do not collide between runs."""
+    event_date = date.today() + timedelta(days=random.randint(400, 4000))
+    return {
+        'venue_id': ctx['venue_id'], 'event_date': event_date.isoformat(),
+        'slot': random.choice(['full-day', 'morning', 'evening']), 'event_type': 'Benchmark',
+        'fullname': 'Bench User', 'email': 'bench@example.com', 'phone_primary': '+92-300-1234567',
+        'facility_ids': [], 'amount': 100000, 'payment_method': 'cash',
+    }
+
+
+# (name, method, path template, token role, json body factory)
+ENDPOINTS = [
+    ('venues.list', 'GET', '/api/venues?city={city}', None, None),
+    ('venues.search', 'GET', '/api/venues?city={city}&search=Hall&price_max=800000&sort_by=base_price', None, None),
+    ('venues.near', 'GET', '/api/venues?lat=24.8607&lng=67.0011&radius_km=10&capacity_min=200', None, None),
+    ('venues.detail', 'GET', '/api/venues/{venue_id}', None, None),
+    ('venues.booking_data', 'GET', '/api/venues/{venue_id}/booking-data', None, None),
+    ('venues.filters', 'GET', '/api/venues/filters', None, None),
+    ('venues.recent_reviews', 'GET', '/api/venues/reviews/recent', None, None),
+    ('venues.public_stats', 'GET', '/api/venues/stats/public', None, None),
+    ('bookings.create', 'POST', '/api/bookings', 'user', booking_payload),
+    ('users.bookings', 'GET', '/api/users/{user_id}/bookings', 'user', None),
+    ('users.conversations', 'GET', '/api/users/{user_id}/conversations', 'user', None),
+    ('notifications.list', 'GET', '/api/users/{user_id}/notifications', 'user', None),
+    ('owner.dashboard', 'GET', '/api/owner/{owner_id}/dashboard', 'owner', None),
+    ('owner.analytics', 'GET', '/api/owner/{owner_id}/analytics', 'owner', None),
+    ('owner.venues', 'GET', '/api/owner/{owner_id}/venues', 'owner', None),
+    ('owner.bookings', 'GET', '/api/owner/{owner_id}/bookings', 'owner', None),
+    ('owner.payments', 'GET', '/api/owner/{owner_id}/payments', 'owner', None),
+    ('owner.reviews', 'GET', '/api/owner/{owner_id}/reviews', 'owner', None),
+    ('admin.dashboard', 'GET', '/api/admin/dashboard', 'admin', None),
+    ('admin.users', 'GET', '/api/admin/users', 'admin', None),
+    ('admin.owners', 'GET', '/api/admin/owners', 'admin', None),
+    ('admin.venues', 'GET', '/api/admin/venues', 'admin', None),
+    ('admin.bookings', 'GET', '/api/admin/bookings', 'admin', None),
+    ('admin.bookings_filtered', 'GET', '/api/admin/bookings?status=completed', 'admin', None),
+    ('admin.bookings_page', 'GET', '/api/admin/bookings?status=completed&page=5', 'admin', None),
+    ('admin.payments', 'GET', '/api/admin/payments', 'admin', None),
+    ('admin.payments_filtered', 'GET', '/api/admin/payments?payment_status=completed', 'admin', None),
+    ('admin.payments_page', 'GET', '/api/admin/payments?payment_status=completed&page=5', 'admin', None),
+    ('admin.reviews', 'GET', '/api/admin/reviews', 'admin', None),
+    ('admin.logs', 'GET', '/api/admin/logs', 'admin', None),
+    ('admin.analytics', 'GET', '/api/admin/analytics', 'admin', None),
+]
+
+
+def make_token(app, principal):
+    """Mint a token the same way /api/auth/login does, without paying for bcrypt."""
+    issued_at = datetime.utcnow()
+    claims = build_claims(principal)
+    claims.update({'jti': uuid.uuid4().hex, 'iat': issued_at,
+                   'exp': issued_at + timedelta(days=app.config['JWT_EXPIRY_DAYS'])})
+    return jwt.encode(claims, app.config['SECRET_KEY'], algorithm='HS256')
+
+
+def load_context(app, cursor):
+    """Pick the busiest owner, customer and venue so the benchmark hits hot rows."""
+    principal_query = """
+        SELECT u.*, o.owner_id, o.verification_status
+        FROM users u LEFT JOIN owners o ON o.user_id = u.user_id
+        WHERE u.user_id = %s
+    """
+
+    cursor.execute("""
+        SELECT v.venue_id, v.city, v.owner_id, COUNT(*) as bookings
+        FROM bookings b JOIN venues v ON v.venue_id = b.venue_id
+        WHERE v.status = 'active'
+        GROUP BY v.venue_id ORDER BY bookings DESC LIMIT 1
+    """)
+    venue = cursor.fetchone()
+    cursor.execute("SELECT user_id, COUNT(*) as bookings FROM bookings GROUP BY user_id ORDER BY bookings DESC LIMIT 1")
+    customer = cursor.fetchone()
+    cursor.execute("SELECT user_id FROM owners WHERE owner_id = %s", (venue['owner_id'],))
+    owner_user = cursor.fetchone()
+    cursor.execute("SELECT user_id FROM users WHERE role = 'admin' AND status = 'active' LIMIT 1")
+    admin = cursor.fetchone()
+
+    tokens = {}
+    for role, user_id in (('user', customer['user_id']), ('owner', owner_user['user_id']),
+                          ('admin', admin['user_id'] if admin else None)):
+        if user_id is None:
+            continue
+        cursor.execute(principal_query, (user_id,))
+        tokens[role] = make_token(app, cursor.fetchone())
+
+    return {
+        'venue_id': venue['venue_id'], 'city': venue['city'], 'owner_id': venue['owner_id'],
+        'user_id': customer['user_id'], 'tokens': tokens,
+    }
+
+
+def dataset_size(cursor):
+    sizes = {}
+    for table in DATASET_TABLES:
+        cursor.execute(f"SELECT COUNT(*) as count FROM {table}")
+        sizes[table] = cursor.fetchone()['count']
+    return sizes
+
+
+class StatusCounter:
+    """Samples MySQL global status counters on a dedicated connection."""
+
+    def __init__(self, conn):
+        self.cursor = conn.cursor()
+        self.overhead = {'queries': 0, 'rows': 0}
+        samples = [self.delta(self.snapshot()) for _ in range(20)]
+        self.overhead = {key: statistics.median(s[key] for s in samples) for key in ('queries', 'rows')}
+
+    def snapshot(self):
+        self.cursor.execute("SHOW GLOBAL STATUS WHERE Variable_name IN ('Questions', %s)" %
+                            ', '.join(['%s'] * len(ROW_READ_COUNTERS)), ROW_READ_COUNTERS)
+        values = {row['Variable_name']: int(row['Value']) for row in self.cursor.fetchall()}
+        return {'queries': values['Questions'], 'rows': sum(values[name] for name in ROW_READ_COUNTERS)}
+
+    def delta(self, before):
+        after = self.snapshot()
+        return {key: max(0, after[key] - before[key] - self.overhead[key]) for key in after}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_endpoint(client, counter, ctx, endpoint, iterations, warmup):
+    name, method, template, role, body_factory = endpoint
+    headers = {}
+    if role:
+        if role not in ctx['tokens']:
+            return None
+        headers['Authorization'] = f"Bearer {ctx['tokens'][role]}"
+    path = template.format(**ctx)
+
+    latencies, queries, rows, errors = [], [], [], 0
+    for i in range(warmup + iterations):
+        body = body_factory(ctx) if body_factory else None
+        before = counter.snapshot()
+        started = time.perf_counter()
+        response = client.open(path, method=method, headers=headers, json=body)
+        elapsed = (time.perf_counter() - started) * 1000
+        usage = counter.delta(before)
+
+        if i < warmup:
+            continue
+        # Failed requests are counted but kept out of the timings: an error returned fast is not a speedup
+        if response.status_code >= 400:
+            errors += 1
+            continue
+        latencies.append(elapsed)
+        queries.append(usage['queries'])
+        rows.append(usage['rows'])
+
+    result = {'path': path, 'method': method, 'iterations': iterations, 'errors': errors}
+    if not latencies:
+        result.update(dict.fromkeys(('p50_ms', 'p95_ms', 'p99_ms', 'mean_ms',
+                                     'queries_per_request', 'rows_scanned_per_request')))
+        return result
+
+    return {
+        **result,
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'mean_ms': round(statistics.mean(latencies), 2),
+        'queries_per_request': round(statistics.mean(queries), 1),
+        'rows_scanned_per_request': round(statistics.mean(rows), 1),
+    }
+
+
+def compare(results, baseline):
+    """Print the change against a baseline run; returns the names of regressed endpoints."""
+    regressed = []
+    print(f"\nCompared with baseline from {baseline['created_at']} (dataset {baseline['dataset']})")
+    print(f"{'endpoint':<24} {'p50 ms':>18} {'p95 ms':>18} {'queries':>14} {'rows':>20}")
+    for name, current in results.items():
+        previous = baseline['endpoints'].get(name)
+        if not current or not previous:
+            continue
+        # Any failed request makes the timings incomparable
+        flagged = current['errors'] > 0
+        cells = []
+        for key in ('p50_ms', 'p95_ms', 'queries_per_request', 'rows_scanned_per_request'):
+            old, new = previous[key], current[key]
+            if old is None or new is None:
+                cells.append(f"{old}->{new}")
+                continue
+            change = (new - old) / old if old else 0
+            if key != 'p50_ms':
+                flagged = flagged or change > REGRESSION_THRESHOLD
+            cells.append(f"{old:g}->{new:g} ({change:+.0%})")
+        errors = f"  {current['errors']} ERRORS" if current['errors'] else ''
+        print(f"{name:<24} {cells[0]:>18} {cells[1]:>18} {cells[2]:>14} {cells[3]:>20}"
+              f"{'  REGRESSION' if flagged else ''}{errors}")
+        if flagged:
+            regressed.append(name)
+    return regressed
+
+
+def bench_endpoints(iterations=30, warmup=3, only=None, output=None, baseline_path=None, seed=42,
+                    rate_limit=False):
+    random.seed(seed)
+    app, _ = create_app()
+    # One bench caller would exhaust its buckets and time 429s instead of the routes
+    app.config['RATE_LIMIT_ENABLED'] = rate_limit
+
+    with app.app_context():
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        ctx = load_context(app, cursor)
+        dataset = dataset_size(cursor)
+        counter = StatusCounter(conn)
+        client = app.test_client()
+
+        print(f"Dataset: {dataset}")
+        print(f"{'endpoint':<24} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8} {'rows':>10} {'errors':>7}")
+
+        results = {}
+        for endpoint in ENDPOINTS:
+            if only and not endpoint[0].startswith(only):
+                continue
+            result = run_endpoint(client, counter, ctx, endpoint, iterations, warmup)
+            results[endpoint[0]] = result
+            if result is None:
+                print(f"{endpoint[0]:<24} skipped (no {endpoint[3]} account)")
+                continue
+            print(f"{endpoint[0]:<24} {str(result['p50_ms']):>8} {str(result['p95_ms']):>8} "
+                  f"{str(result['p99_ms']):>8} {str(result['queries_per_request']):>8} "
+                  f"{str(result['rows_scanned_per_request']):>10} {result['errors']:>7}")
+
+        cursor.close()
+        conn.close()
+
+    report = {'created_at': datetime.now().isoformat(timespec='seconds'), 'iterations': iterations,
+              'dataset': dataset, 'endpoints': results}
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved results to {output}")
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        if compare(results, baseline):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the VenueBook HTTP endpoints.")
+    parser.add_argument('--iterations', type=int, default=30, help="Measured requests per endpoint")
+    parser.add_argument('--warmup', type=int, default=3, help="Unmeasured requests per endpoint")
+    parser.add_argument('--only', help="Only run endpoints whose name starts with this prefix (e.g. 'owner')")
+    parser.add_argument('--output', help="Write results JSON to this path (e.g. a new baseline)")
+    parser.add_argument('--compare', help="Baseline JSON to diff against; exits 1 on regressions")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for generated request bodies")
+    parser.add_argument('--with-rate-limit', action='store_true',
+                        help="Keep rate limiting on (off by default so limits do not skew latencies)")
+    args = parser.parse_args()
+    sys.exit(bench_endpoints(args.iterations, args.warmup, args.only, args.output, args.compare, args.seed,
+                             args.with_rate_limit))
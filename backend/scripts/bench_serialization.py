@@ -0,0 +1,103 @@
+"""
+JSON serialization benchmark for listing responses.
+
+Builds 1k-row responses shaped like the admin booking, admin payment and
+public venue lists (Decimal, datetime and date columns included) and
+reports, per shape, the time to serialize them with Flask's default JSON
+provider and with the orjson provider (utils/json_provider.py), and the
+payload size with all fields vs. a typical ?fields= projection.
+
+Usage: python scripts/bench_serialization.py [--rows 1000] [--iterations 50]
+"""
+import os
+import sys
+import random
+import argparse
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from utils.fields import project
+from utils.json_provider import OrjsonProvider
+
+
+def booking_row(i, rng):
+    created = datetime(2024, 1, 1) + timedelta(minutes=rng.randrange(500000))
+    return {
+        'booking_id': i, 'event_date': created.date() + timedelta(days=rng.randrange(1, 120)),
+        'slot': rng.choice(['morning', 'evening', 'full_day']), 'event_type': rng.choice(['Wedding', 'Mehndi', 'Corporate']),
+        'total_price': Decimal(rng.randrange(50000, 900000)) / 100 * 100, 'status': rng.choice(['pending', 'confirmed', 'completed']),
+        'created_at': created, 'venue_name': f"Venue {rng.randrange(500)} Banquet Hall", 'customer_name': f"Customer {i}",
+    }
+
+
+def payment_row(i, rng):
+    return {
+        'payment_id': i, 'booking_id': i, 'amount': Decimal(rng.randrange(50000, 900000)),
+        'method': rng.choice(['cash', 'bank-transfer']), 'trx_id': f"TRX{rng.randrange(10 ** 9):09d}",
+        'payment_status': rng.choice(['pending', 'completed']), 'payment_date': datetime(2024, 1, 1) + timedelta(minutes=i),
+        'venue_name': f"Venue {rng.randrange(500)}", 'owner_name': f"Owner {rng.randrange(250)} Events", 'customer_name': f"Customer {i}",
+    }
+
+
+def venue_row(i, rng):
+    url = f"https://res.cloudinary.com/demo/image/upload/venues/{i}.jpg"
+    return {
+        'venue_id': i, 'name': f"Venue {i} Marquee", 'city': rng.choice(['Karachi', 'Lahore', 'Islamabad']),
+        'type': rng.choice(['Hall', 'Marquee', 'Lawn']), 'capacity': rng.randrange(100, 1500),
+        'base_price': Decimal(rng.randrange(100000, 900000)), 'rating': Decimal(rng.randrange(10, 50)) / 10,
+        'address': f"Plot {i}, Main Boulevard", 'status': 'active',
+        'image_url': url, 'image_thumb_url': url, 'image_srcset': f"{url} 320w, {url} 640w, {url} 1280w",
+    }
+
+
+# shape -> (row factory, response key, typical ?fields= projection used by a table view)
+SHAPES = {
+    'admin.bookings': (booking_row, 'bookings', ['booking_id', 'event_date', 'total_price', 'status', 'venue_name']),
+    'admin.payments': (payment_row, 'payments', ['payment_id', 'amount', 'payment_status', 'payment_date']),
+    'venues.list': (venue_row, 'venues', ['venue_id', 'name', 'city', 'base_price', 'rating', 'image_url']),
+}
+
+
+def time_dumps(dumps, payload, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        dumps(payload)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def bench_serialization(rows=1000, iterations=50, seed=42):
+    app = Flask(__name__)
+    default = DefaultJSONProvider(app)
+    fast = OrjsonProvider(app)
+    rng = random.Random(seed)
+
+    print(f"{rows} rows per response, median of {iterations} runs\n")
+    print(f"{'shape':16} {'default ms':>11} {'orjson ms':>10} {'speedup':>8} {'full KB':>8} {'fields KB':>10}")
+    for name, (factory, key, fields) in SHAPES.items():
+        payload = {key: [factory(i, rng) for i in range(rows)], 'total_pages': rows // 10}
+        sparse = {key: project([dict(row) for row in payload[key]], fields), 'total_pages': rows // 10}
+
+        default_ms = time_dumps(default.dumps, payload, iterations)
+        fast_ms = time_dumps(fast.dumps, payload, iterations)
+        full_kb = len(fast.dumps(payload).encode('utf-8')) / 1024
+        sparse_kb = len(fast.dumps(sparse).encode('utf-8')) / 1024
+
+        print(f"{name:16} {default_ms:11.2f} {fast_ms:10.2f} {default_ms / fast_ms:7.1f}x {full_kb:8.1f} {sparse_kb:10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization of listing responses.")
+    parser.add_argument('--rows', type=int, default=1000, help="Rows per response")
+    parser.add_argument('--iterations', type=int, default=50, help="Timed runs per shape and serializer")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    bench_serialization(args.rows, args.iterations, args.seed)
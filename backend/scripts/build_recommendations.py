@@ -0,0 +1,52 @@
+"""
+Refresh the precomputed venue neighbours (venue_similarities).
+
+Run it from cron nightly; it only recomputes venues that changed or were
+booked/reviewed since the previous run. Run with --full weekly (or after
+bulk imports such as generate_synthetic_data.py) to also pick up rejected
+bookings and deleted reviews:
+    python scripts/build_recommendations.py [--full] [--top-k 20]
+
+Server processes pick the new lists up within RECOMMENDATIONS_RELOAD_INTERVAL.
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from utils.db import get_db_connection
+from utils.venue_similarity import TOP_K, refresh
+
+
+def build_recommendations(full=False, top_k=TOP_K):
+    app, _ = create_app()
+
+    with app.app_context():
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        started = time.time()
+        try:
+            summary = refresh(cursor, full=full, k=top_k)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+        print(f"{summary['mode'].capitalize()} run over {summary['venues']} venues: "
+              f"{summary['recomputed']} recomputed, {summary['merged']} patched, "
+              f"{summary['written']} lists written in {time.time() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh similar-venue lists for recommendations.")
+    parser.add_argument('--full', action='store_true', help="Recompute every venue")
+    parser.add_argument('--top-k', type=int, default=TOP_K, help="Neighbours stored per venue (use --full when changing it)")
+    args = parser.parse_args()
+    build_recommendations(args.full, args.top_k)
@@ -0,0 +1,126 @@
+"""
+EXPLAIN regression check for the route queries.
+
+Calls every GET endpoint of the benchmark suite (scripts/bench_endpoints.py)
+against a seeded database, captures the SQL each route actually runs
+through the per-request instrumentation in utils.query_stats, EXPLAINs
+every SELECT, and fails if a plan falls back to a full table scan
+(type=ALL) on a table estimated at --min-rows rows or more.
+
+Routes that legitimately aggregate whole tables are listed in
+ALLOWED_FULL_SCANS with the reason.
+
+Usage: python scripts/check_query_plans.py [--min-rows 1000] [--verbose]
+Exit code 1 if any unexpected full scan is found.
+"""
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import g
+
+from app import create_app
+from utils import query_stats
+from utils.db import get_db_connection
+from bench_endpoints import ENDPOINTS, load_context
+
+# endpoint name -> tables it may scan in full, with the reason
+ALLOWED_FULL_SCANS = {
+    'admin.dashboard': ({'users', 'venues', 'bookings', 'booking_payments'}, 'global totals across all rows'),
+    'admin.analytics': ({'bookings', 'booking_payments', 'venue_daily_stats'}, 'global totals, status breakdown and top venues'),
+    'venues.public_stats': ({'venues', 'venue_reviews'}, 'site-wide averages'),
+    'venues.filters': ({'venues'}, 'DISTINCT city/type over active venues'),
+}
+
+
+def capture_route_sql(app, ctx):
+    """Call each GET endpoint and return {endpoint name: [statements]}."""
+    captured = {}
+    current = {}
+
+    def start_capture():
+        stats = g.get('sql_stats')
+        if stats is not None:
+            stats['statements'] = []
+
+    def finish_capture(response):
+        stats = g.get('sql_stats')
+        if stats is not None:
+            current['statements'] = stats['statements']
+        return response
+
+    app.before_request(start_capture)
+    app.after_request(finish_capture)
+    query_stats.update_settings(enabled=True, sample_rate=1.0, slow_query_ms=10 ** 9)
+
+    client = app.test_client()
+    for name, method, template, role, _ in ENDPOINTS:
+        if method != 'GET' or (role and role not in ctx['tokens']):
+            continue
+        headers = {'Authorization': f"Bearer {ctx['tokens'][role]}"} if role else {}
+        current.clear()
+        response = client.get(template.format(**ctx), headers=headers)
+        if response.status_code >= 400:
+            print(f"WARNING: {name} returned {response.status_code}")
+        captured[name] = current.get('statements', [])
+
+    return captured
+
+
+def full_scans(cursor, statement, min_rows):
+    """Return [(table, estimated rows)] for plan rows that scan a whole table."""
+    if not statement.lstrip().upper().startswith('SELECT'):
+        return []
+    cursor.execute(f"EXPLAIN {statement}")
+    return [(row['table'], row['rows']) for row in cursor.fetchall()
+            if row['type'] == 'ALL' and row['table'] and not row['table'].startswith('<')
+            and (row['rows'] or 0) >= min_rows]
+
+
+def check_query_plans(min_rows=1000, verbose=False):
+    app, _ = create_app()
+    # Every route must run its real queries, not be answered with a 429
+    app.config['RATE_LIMIT_ENABLED'] = False
+
+    with app.app_context():
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        ctx = load_context(app, cursor)
+        captured = capture_route_sql(app, ctx)
+
+        failures = 0
+        for name, statements in captured.items():
+            allowed_tables, reason = ALLOWED_FULL_SCANS.get(name, (set(), None))
+            seen = set()
+            for statement in statements:
+                if statement in seen:
+                    continue
+                seen.add(statement)
+
+                for table, rows in full_scans(cursor, statement, min_rows):
+                    if table in allowed_tables:
+                        if verbose:
+                            print(f"ok    {name}: full scan of {table} (~{rows} rows) allowed: {reason}")
+                        continue
+                    failures += 1
+                    print(f"FAIL  {name}: full scan of {table} (~{rows} rows)")
+                    print(f"      {' '.join(statement.split())[:300]}")
+
+            if verbose:
+                print(f"      {name}: {len(seen)} distinct statements checked")
+
+        cursor.close()
+        conn.close()
+
+    print(f"\n{failures} unexpected full table scan(s) across {len(captured)} routes.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail on full table scans in route queries.")
+    parser.add_argument('--min-rows', type=int, default=1000, help="Ignore scans of tables smaller than this")
+    parser.add_argument('--verbose', action='store_true', help="Also list allowed scans and per-route counts")
+    args = parser.parse_args()
+    sys.exit(check_query_plans(args.min_rows, args.verbose))
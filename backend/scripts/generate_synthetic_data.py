@@ -0,0 +1,364 @@
+"""
+Synthetic data generator for load testing and capacity planning.
+
+Bulk-creates users, owners, venues, facilities, availability, bookings
+(with customer details, facilities and payments), reviews, conversations,
+messages, notifications and logs with realistic skew:
+
+- cities follow a Zipf distribution (a few large cities hold most venues),
+- venue popularity is Zipfian, so a small set of hot venues takes most bookings,
+- event dates follow the wedding season (peak Nov-Feb) and favour weekends.
+
+Rows are written with multi-row INSERTs (pymysql batches executemany) with
+foreign key and unique checks disabled, using explicit IDs allocated after
+the current maximum of each table, so it can be run against a non-empty
+database. A fixed --seed makes runs reproducible.
+
+Scale 1 is roughly 180k rows; --scale 55 is roughly 10M.
+All synthetic users share the password "password123".
+
+Usage: python scripts/generate_synthetic_data.py --scale 10 --seed 42
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+
+import bcrypt
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from utils.daily_stats import rebuild as rebuild_daily_stats
+from utils.db import get_db_connection
+from utils.geocoding import OfflineGeocoder, locate
+from utils.review_stats import rebuild as rebuild_review_stats
+
+# Row counts at --scale 1
+BASE_COUNTS = {
+    'users': 5000,
+    'owners': 250,
+    'venues': 500,
+    'bookings': 20000,
+    'conversations': 3000,
+    'messages': 20000,
+}
+AVAILABILITY_DAYS = 30          # blocked-date rows per venue
+REVIEW_RATE = 0.3               # share of completed bookings that get a review
+
+CITIES = ['Karachi', 'Lahore', 'Islamabad', 'Rawalpindi', 'Faisalabad', 'Multan', 'Peshawar',
+          'Hyderabad', 'Quetta', 'Sialkot', 'Gujranwala', 'Sukkur', 'Bahawalpur', 'Abbottabad']
+VENUE_TYPES = ['Banquet Hall', 'Marquee', 'Farmhouse', 'Lawn', 'Hotel', 'Conference Hall', 'Restaurant']
+EVENT_TYPES = ['Wedding', 'Walima', 'Mehndi', 'Birthday', 'Corporate', 'Conference', 'Engagement', 'Party']
+FACILITIES = [('Catering', 50000), ('Decoration', 35000), ('Sound System', 10000), ('Parking', 0),
+              ('Air Conditioning', 15000), ('Generator Backup', 8000), ('Stage', 12000),
+              ('Photography', 25000), ('Valet', 6000), ('Bridal Room', 5000)]
+SLOTS = ['full-day', 'morning', 'evening']
+SLOT_FACTOR = {'full-day': 1.0, 'morning': 0.6, 'evening': 0.7}
+
+# Relative booking volume per month (Jan..Dec): wedding season peaks in winter
+MONTH_WEIGHTS = [10, 8, 6, 4, 3, 2, 2, 3, 4, 6, 9, 12]
+WEEKEND_DAYS = (4, 5, 6)        # Fri, Sat, Sun
+WEEKDAY_ACCEPT = 0.45
+
+FIRST_NAMES = ['Ali', 'Ahmed', 'Fatima', 'Ayesha', 'Hassan', 'Sana', 'Usman', 'Zainab', 'Bilal',
+               'Hira', 'Omar', 'Maryam', 'Hamza', 'Iqra', 'Saad', 'Noor', 'Fahad', 'Amna']
+LAST_NAMES = ['Khan', 'Ahmed', 'Malik', 'Sheikh', 'Qureshi', 'Butt', 'Chaudhry', 'Siddiqui',
+              'Raza', 'Hussain', 'Baig', 'Mirza']
+MESSAGES = ['Is the venue available on this date?', 'What is the final price with catering?',
+            'Can we visit the venue this weekend?', 'Please confirm our booking.',
+            'Do you allow outside decorators?', 'Thank you, see you on the event day!']
+
+
+class ZipfSampler:
+    """Draw indices 0..n-1 with Zipf(s) weights; the hot items are shuffled so they are not just the lowest IDs."""
+
+    def __init__(self, rng, n, s=1.1):
+        self.rng = rng
+        self.order = list(range(n))
+        rng.shuffle(self.order)
+        self.cum_weights = list(accumulate(1.0 / (k ** s) for k in range(1, n + 1)))
+        self.total = self.cum_weights[-1]
+
+    def sample(self):
+        return self.order[bisect_left(self.cum_weights, self.rng.random() * self.total)]
+
+
+class BulkWriter:
+    """Buffers rows per table and flushes them as multi-row INSERTs."""
+
+    def __init__(self, conn, batch_size):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.batch_size = batch_size
+        self.columns = {}
+        self.buffers = {}
+        self.counts = {}
+
+    def add(self, table, columns, row):
+        if table not in self.buffers:
+            self.columns[table] = columns
+            self.buffers[table] = []
+            self.counts[table] = 0
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush(table)
+
+    def flush(self, table=None):
+        for name in ([table] if table else list(self.buffers)):
+            rows = self.buffers[name]
+            if not rows:
+                continue
+            columns = self.columns[name]
+            placeholders = ', '.join(['%s'] * len(columns))
+            self.cursor.executemany(
+                f"INSERT INTO {name} ({', '.join(columns)}) VALUES ({placeholders})", rows
+            )
+            self.conn.commit()
+            self.counts[name] += len(rows)
+            self.buffers[name] = []
+
+    @property
+    def total(self):
+        return sum(self.counts.values()) + sum(len(rows) for rows in self.buffers.values())
+
+
+def next_ids(cursor):
+    """First free primary key of every table we write."""
+    keys = {'users': 'user_id', 'owners': 'owner_id', 'venues': 'venue_id', 'venue_facilities': 'facility_id',
+            'bookings': 'booking_id', 'booking_payments': 'payment_id', 'venue_reviews': 'review_id',
+            'conversations': 'conversation_id'}
+    ids = {}
+    for table, key in keys.items():
+        cursor.execute(f"SELECT COALESCE(MAX({key}), 0) + 1 as next_id FROM {table}")
+        ids[table] = cursor.fetchone()['next_id']
+    return ids
+
+
+def person_name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def seasonal_date(rng, start, days):
+    """Pick a date in [start, start + days) following MONTH_WEIGHTS with a weekend bias."""
+    while True:
+        day = start + timedelta(days=rng.randrange(days))
+        if rng.random() * max(MONTH_WEIGHTS) > MONTH_WEIGHTS[day.month - 1]:
+            continue
+        if day.weekday() in WEEKEND_DAYS or rng.random() < WEEKDAY_ACCEPT:
+            return day
+
+
+def generate(scale=1.0, seed=42, batch_size=5000):
+    rng = random.Random(seed)
+    counts = {name: max(1, int(count * scale)) for name, count in BASE_COUNTS.items()}
+    app, _ = create_app()
+
+    with app.app_context():
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        ids = next_ids(cursor)
+        cursor.execute("SET SESSION foreign_key_checks = 0")
+        cursor.execute("SET SESSION unique_checks = 0")
+        writer = BulkWriter(conn, batch_size)
+        started = time.time()
+        today = date.today()
+        now = datetime.now()
+
+        # Precomputed once: bcrypt per user would dominate the run time
+        password = bcrypt.hashpw(b'password123', bcrypt.gensalt(rounds=app.config['BCRYPT_ROUNDS'])).decode('utf-8')
+
+        print(f"Generating scale {scale} (seed {seed}): {counts}")
+
+        # Users (the first block of users become venue owners)
+        first_user = ids['users']
+        user_cols = ('user_id', 'name', 'email', 'password', 'phone', 'role', 'status', 'created_at')
+        for i in range(counts['users']):
+            user_id = first_user + i
+            role = 'owner' if i < counts['owners'] else 'user'
+            writer.add('users', user_cols, (
+                user_id, person_name(rng), f"loadtest{user_id}@example.com", password,
+                f"03{rng.randrange(10**9):09d}", role, 'blocked' if rng.random() < 0.01 else 'active',
+                now - timedelta(days=rng.randrange(730), seconds=rng.randrange(86400)),
+            ))
+        customer_ids = range(first_user + counts['owners'], first_user + counts['users'])
+        customer_sampler = ZipfSampler(rng, len(customer_ids), s=0.6)
+
+        # Owners
+        first_owner = ids['owners']
+        owner_user = {}
+        for i in range(counts['owners']):
+            owner_id = first_owner + i
+            owner_user[owner_id] = first_user + i
+            writer.add('owners', ('owner_id', 'user_id', 'business_name', 'cnic', 'verification_status', 'joined_at'), (
+                owner_id, first_user + i, f"{rng.choice(LAST_NAMES)} Events {owner_id}",
+                f"{rng.randrange(10**12, 10**13)}", rng.choices(['verified', 'pending', 'rejected'], [85, 10, 5])[0],
+                now - timedelta(days=rng.randrange(730)),
+            ))
+
+        # Facility catalog
+        first_facility = ids['venue_facilities']
+        facility_ids = []
+        for i, (name, price) in enumerate(FACILITIES):
+            facility_ids.append(first_facility + i)
+            writer.add('venue_facilities', ('facility_id', 'facility_name', 'extra_price'),
+                       (first_facility + i, name, price))
+
+        # Venues, facility maps, payment info and blocked dates
+        city_sampler = ZipfSampler(random.Random(seed + 1), len(CITIES), s=1.2)
+        # Always offline: spreads venues around their city centre without network calls
+        geocoder = OfflineGeocoder()
+        first_venue = ids['venues']
+        venues = []
+        for i in range(counts['venues']):
+            venue_id = first_venue + i
+            owner_id = first_owner + rng.randrange(counts['owners'])
+            base_price = rng.randrange(50, 1500) * 1000
+            offered = rng.sample(facility_ids, rng.randint(2, len(facility_ids)))
+            venues.append((venue_id, owner_id, base_price, offered))
+            name = f"{rng.choice(LAST_NAMES)} {rng.choice(VENUE_TYPES)} {venue_id}"
+            venue_type = rng.choice(VENUE_TYPES)
+            address = f"Plot {rng.randrange(1, 500)}, Block {rng.choice('ABCDEFG')}"
+            city = CITIES[city_sampler.sample()]
+            location = locate(f"{address} #{venue_id}", city, geocoder=geocoder)
+            writer.add('venues', ('venue_id', 'owner_id', 'name', 'type', 'address', 'city', 'latitude',
+                                  'longitude', 'geohash', 'capacity', 'base_price', 'rating', 'description',
+                                  'status', 'created_at'), (
+                venue_id, owner_id, name, venue_type, address, city,
+                location['latitude'], location['longitude'], location['geohash'],
+                rng.randrange(50, 2000, 50), base_price,
+                round(rng.uniform(3.0, 5.0), 2), 'Synthetic venue for load testing.',
+                rng.choices(['active', 'pending', 'inactive'], [90, 7, 3])[0],
+                now - timedelta(days=rng.randrange(730)),
+            ))
+            for facility_id in offered:
+                writer.add('venue_facility_map', ('venue_id', 'facility_id', 'availability'),
+                           (venue_id, facility_id, 'yes'))
+            writer.add('venue_payment_info', ('venue_id', 'account_holder_name', 'account_number', 'contact_number'),
+                       (venue_id, person_name(rng), f"PK{rng.randrange(10**14, 10**15)}", f"03{rng.randrange(10**9):09d}"))
+            for day in rng.sample(range(-30, 180), AVAILABILITY_DAYS):
+                writer.add('venue_availability', ('venue_id', 'date', 'slot', 'is_available'),
+                           (venue_id, today + timedelta(days=day), rng.choice(SLOTS), 0))
+        venue_sampler = ZipfSampler(rng, len(venues), s=1.1)
+
+        # Bookings with customer details, facilities, payments, reviews, notifications and logs
+        first_booking = ids['bookings']
+        payment_id = ids['booking_payments']
+        review_id = ids['venue_reviews']
+        history_start = today - timedelta(days=730)
+        for i in range(counts['bookings']):
+            booking_id = first_booking + i
+            venue_id, owner_id, base_price, offered = venues[venue_sampler.sample()]
+            user_id = customer_ids[customer_sampler.sample()]
+            event_date = seasonal_date(rng, history_start, 910)
+            created_at = datetime.combine(event_date, datetime.min.time()) - timedelta(
+                days=rng.randrange(7, 120), seconds=rng.randrange(86400))
+            created_at = min(created_at, now)
+            slot = rng.choice(SLOTS)
+            extras = rng.sample(offered, rng.randint(0, min(2, len(offered))))
+            total_price = int(base_price * SLOT_FACTOR[slot]) + sum(
+                FACILITIES[facility_id - first_facility][1] for facility_id in extras)
+            if event_date < today:
+                status = rng.choices(['completed', 'rejected', 'confirmed'], [85, 10, 5])[0]
+            else:
+                status = rng.choices(['pending', 'confirmed', 'rejected'], [40, 50, 10])[0]
+
+            writer.add('bookings', ('booking_id', 'user_id', 'venue_id', 'event_date', 'slot', 'event_type',
+                                    'special_requirements', 'total_price', 'status', 'created_at'), (
+                booking_id, user_id, venue_id, event_date, slot, rng.choice(EVENT_TYPES),
+                None, total_price, status, created_at,
+            ))
+            writer.add('booking_customer_details', ('booking_id', 'fullname', 'email', 'phone_primary'),
+                       (booking_id, person_name(rng), f"loadtest{user_id}@example.com", f"03{rng.randrange(10**9):09d}"))
+            for facility_id in extras:
+                writer.add('booking_facilities', ('booking_id', 'facility_id'), (booking_id, facility_id))
+
+            if status != 'rejected':
+                payment_status = 'completed' if status in ('confirmed', 'completed') else 'pending'
+                writer.add('booking_payments', ('payment_id', 'booking_id', 'amount', 'method', 'trx_id',
+                                                'payment_status', 'payment_date'), (
+                    payment_id, booking_id, total_price, rng.choice(['bank-transfer', 'cash']),
+                    f"TRX{payment_id:010d}", payment_status, created_at + timedelta(hours=rng.randrange(1, 72)),
+                ))
+                payment_id += 1
+
+            if status == 'completed' and rng.random() < REVIEW_RATE:
+                writer.add('venue_reviews', ('review_id', 'user_id', 'venue_id', 'rating', 'review_text', 'review_date'), (
+                    review_id, user_id, venue_id, rng.choices([1, 2, 3, 4, 5], [3, 5, 12, 35, 45])[0],
+                    'Synthetic review.', datetime.combine(event_date, datetime.min.time()) + timedelta(days=rng.randrange(1, 30)),
+                ))
+                review_id += 1
+
+            notification_cols = ('user_id', 'title', 'message', 'type', 'booking_id', 'venue_id', 'is_read', 'created_at')
+            writer.add('notifications', notification_cols, (
+                owner_user[owner_id], 'New Booking Request', f"Booking #{booking_id} received.",
+                'booking', booking_id, venue_id, int(rng.random() < 0.7), created_at))
+            if status != 'pending':
+                writer.add('notifications', notification_cols, (
+                    user_id, f"Booking {status.capitalize()}", f"Your booking #{booking_id} is {status}.",
+                    'booking', booking_id, venue_id, int(rng.random() < 0.8), created_at + timedelta(hours=6)))
+
+            writer.add('logs', ('action_by', 'actor_role', 'action_type', 'target_table', 'target_id', 'details',
+                                'payload', 'created_at'), (
+                user_id, 'user', 'CREATE', 'bookings', booking_id,
+                f"Booking #{booking_id}: Created booking for venue #{venue_id}",
+                f'{{"venue_id": {venue_id}}}', created_at))
+
+            if (i + 1) % 100000 == 0:
+                print(f"   {i + 1} bookings, {writer.total} rows, {writer.total / (time.time() - started):.0f} rows/s")
+
+        # Conversations between customers and hot venues' owners, with messages
+        first_conversation = ids['conversations']
+        conversations = []
+        seen = set()
+        while len(conversations) < counts['conversations'] and len(seen) < len(customer_ids) * len(venues):
+            venue_id, owner_id, _, _ = venues[venue_sampler.sample()]
+            user_id = customer_ids[customer_sampler.sample()]
+            if (user_id, venue_id) in seen:
+                continue
+            seen.add((user_id, venue_id))
+            conversation_id = first_conversation + len(conversations)
+            conversations.append((conversation_id, user_id, owner_user[owner_id]))
+            created_at = now - timedelta(days=rng.randrange(365), seconds=rng.randrange(86400))
+            writer.add('conversations', ('conversation_id', 'user_id', 'owner_id', 'venue_id', 'conversation_type',
+                                         'title', 'last_message_at', 'created_at'), (
+                conversation_id, user_id, owner_id, venue_id, 'customer_owner', None, created_at, created_at,
+            ))
+
+        conversation_sampler = ZipfSampler(rng, len(conversations), s=0.9)
+        for i in range(counts['messages']):
+            conversation_id, user_id, owner_user_id = conversations[conversation_sampler.sample()]
+            writer.add('messages', ('conversation_id', 'sender_id', 'content', 'is_read', 'created_at'), (
+                conversation_id, rng.choice((user_id, owner_user_id)), rng.choice(MESSAGES),
+                int(rng.random() < 0.85), now - timedelta(minutes=rng.randrange(525600)),
+            ))
+
+        writer.flush()
+        # Venue rating aggregates and the daily fact table from the generated rows
+        rebuild_review_stats(cursor)
+        rebuild_daily_stats(cursor)
+        conn.commit()
+        cursor.execute("SET SESSION unique_checks = 1")
+        cursor.execute("SET SESSION foreign_key_checks = 1")
+        cursor.close()
+        conn.close()
+
+        elapsed = time.time() - started
+        print("\nRows written:")
+        for table, count in sorted(writer.counts.items()):
+            print(f"   {table:<26} {count:>10}")
+        print(f"\nDone! {writer.total} rows in {elapsed:.1f}s ({writer.total / elapsed:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic VenueBook dataset for load testing.")
+    parser.add_argument('--scale', type=float, default=1.0, help="Dataset multiplier; 1 is ~180k rows, 55 is ~10M")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for reproducible datasets")
+    parser.add_argument('--batch-size', type=int, default=5000, help="Rows per multi-row INSERT")
+    args = parser.parse_args()
+    generate(args.scale, args.seed, args.batch_size)
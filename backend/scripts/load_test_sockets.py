@@ -0,0 +1,356 @@
+"""
+Socket.IO load-test harness for chat and notifications.
+
+Starts the eventlet server in a child process (VenueBot's LLM replaced by a
+canned reply, so nothing leaves the box), opens many authenticated
+Socket.IO clients as green threads, has pairs of customers and owners join
+their conversation rooms, and then for --duration seconds:
+
+- sends chat messages at --message-rate per second and measures fan-out
+  latency until the other participant receives new_message,
+- triggers notifications at --notify-rate per second (through
+  create_notification, including its INSERT) and measures latency until
+  new_notification arrives,
+- churns --churn-rate clients per second (disconnect + reconnect) and
+  measures connect and disconnect cost.
+
+Server memory per connection is read from /proc/<pid>/status (Linux).
+Messages and notifications are written to the configured database, so
+point it at a seeded load-test database (see generate_synthetic_data.py).
+
+Usage:
+    python scripts/load_test_sockets.py run --clients 2000 --message-rate 200 --duration 60
+    python scripts/load_test_sockets.py serve --port 5055   # server only
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import socket
+import argparse
+import statistics
+import subprocess
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+BOT_REPLY = "This is a canned VenueBot reply used for load testing."
+
+
+def stub_venuebot_response(message, conversation_id, delay=0.0):
+    """Offline stand-in for the LLM call: optional fixed latency, canned text."""
+    import eventlet
+    if delay:
+        eventlet.sleep(delay)
+    return BOT_REPLY
+
+
+def serve(port, bot_delay, verbose):
+    """Run the real app under eventlet with the VenueBot LLM stubbed out."""
+    import eventlet
+    eventlet.monkey_patch()
+
+    # The load clients connect with the server's own origin
+    os.environ['CORS_ORIGINS'] = f"{os.environ.get('CORS_ORIGINS', 'http://localhost:5173')},http://127.0.0.1:{port}"
+
+    import socket_handlers
+    socket_handlers.generate_venuebot_response = \
+        lambda message, conversation_id, user_id=None: stub_venuebot_response(message, conversation_id, bot_delay)
+
+    from app import app, socketio
+    from utils.notification_utils import create_notification
+
+    @socketio.on('loadtest_notify')
+    def handle_loadtest_notify(data):
+        """Load-test only: create a notification for another user through the normal path."""
+        create_notification(data['user_id'], 'Load test', data['message'], 'system')
+
+    if not verbose:
+        # The handlers print per message; at load-test rates that skews the measurements
+        sys.stdout = open(os.devnull, 'w')
+
+    socketio.run(app, host='127.0.0.1', port=port, log_output=verbose)
+
+
+def rss_kb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def summarize(values):
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+
+    def pct(p):
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 2)
+
+    return {'count': len(values), 'p50_ms': pct(50), 'p95_ms': pct(95), 'p99_ms': pct(99),
+            'max_ms': round(ordered[-1], 2), 'mean_ms': round(statistics.mean(values), 2)}
+
+
+def load_participants(app, pairs):
+    """Return [(conversation_id, customer principal, owner principal)] for customer-owner conversations."""
+    from utils.db import get_db_connection
+
+    with app.app_context():
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT c.conversation_id, c.user_id as customer_id, o.user_id as owner_user_id
+            FROM conversations c JOIN owners o ON o.owner_id = c.owner_id
+            WHERE c.conversation_type = 'customer_owner'
+            ORDER BY c.conversation_id LIMIT %s
+        """, (pairs,))
+        conversations = cursor.fetchall()
+
+        user_ids = {row['customer_id'] for row in conversations} | {row['owner_user_id'] for row in conversations}
+        principals = {}
+        if user_ids:
+            placeholders = ', '.join(['%s'] * len(user_ids))
+            cursor.execute(f"""
+                SELECT u.*, o.owner_id, o.verification_status
+                FROM users u LEFT JOIN owners o ON o.user_id = u.user_id
+                WHERE u.user_id IN ({placeholders})
+            """, tuple(user_ids))
+            principals = {row['user_id']: row for row in cursor.fetchall()}
+        cursor.close()
+        conn.close()
+
+    return [(row['conversation_id'], principals[row['customer_id']], principals[row['owner_user_id']])
+            for row in conversations]
+
+
+def make_token(app, principal):
+    import jwt
+    from utils.principal_cache import build_claims
+
+    issued_at = datetime.utcnow()
+    claims = build_claims(principal)
+    claims.update({'jti': uuid.uuid4().hex, 'iat': issued_at,
+                   'exp': issued_at + timedelta(days=app.config['JWT_EXPIRY_DAYS'])})
+    return jwt.encode(claims, app.config['SECRET_KEY'], algorithm='HS256')
+
+
+class LoadClient:
+    """One authenticated Socket.IO client that records delivery latencies."""
+
+    def __init__(self, url, user_id, token, conversation_id, peer_id, stats):
+        self.url = url
+        self.user_id = user_id
+        self.token = token
+        self.conversation_id = conversation_id
+        self.peer_id = peer_id
+        self.stats = stats
+        self.sio = None
+
+    def connect(self):
+        import socketio
+
+        self.sio = socketio.Client(reconnection=False)
+        self.sio.on('new_message', self.on_new_message)
+        self.sio.on('new_notification', self.on_new_notification)
+
+        started = time.perf_counter()
+        self.sio.connect(f"{self.url}?token={self.token}", transports=['websocket'], wait_timeout=30)
+        self.sio.emit('join_conversation', {'conversation_id': self.conversation_id})
+        self.stats['connect'].append((time.perf_counter() - started) * 1000)
+
+    def disconnect(self):
+        started = time.perf_counter()
+        self.sio.disconnect()
+        self.stats['disconnect'].append((time.perf_counter() - started) * 1000)
+
+    @property
+    def connected(self):
+        return bool(self.sio and self.sio.connected)
+
+    def send_message(self):
+        self.sio.emit('send_message', {'conversation_id': self.conversation_id,
+                                       'content': f"lt {time.time():.6f}"})
+        self.stats['sent_messages'] += 1
+
+    def send_notification(self):
+        self.sio.emit('loadtest_notify', {'user_id': self.peer_id, 'message': f"lt {time.time():.6f}"})
+        self.stats['sent_notifications'] += 1
+
+    def on_new_message(self, data):
+        content = data.get('content') or ''
+        if data.get('sender_id') != self.user_id and content.startswith('lt '):
+            self.stats['message'].append((time.time() - float(content[3:])) * 1000)
+
+    def on_new_notification(self, data):
+        content = data.get('message') or ''
+        if content.startswith('lt '):
+            self.stats['notification'].append((time.time() - float(content[3:])) * 1000)
+
+
+def run(args):
+    import eventlet
+    eventlet.monkey_patch()
+
+    from app import create_app
+
+    app, _ = create_app()
+    url = args.url
+    server = None
+    if not url:
+        url = f"http://127.0.0.1:{args.port}"
+        command = [sys.executable, os.path.abspath(__file__), 'serve', '--port', str(args.port),
+                   '--bot-delay', str(args.bot_delay)]
+        server = subprocess.Popen(command, cwd=BACKEND_DIR)
+        if not wait_for_port(args.port):
+            server.terminate()
+            print("Server did not start.")
+            return 1
+    server_pid = server.pid if server else args.server_pid
+
+    stats = {'connect': [], 'disconnect': [], 'message': [], 'notification': [],
+             'sent_messages': 0, 'sent_notifications': 0, 'errors': 0}
+
+    try:
+        participants = load_participants(app, args.clients // 2)
+        if not participants:
+            print("No customer-owner conversations found. Seed the database first.")
+            return 1
+
+        clients = []
+        for conversation_id, customer, owner in participants:
+            clients.append(LoadClient(url, customer['user_id'], make_token(app, customer),
+                                      conversation_id, owner['user_id'], stats))
+            clients.append(LoadClient(url, owner['user_id'], make_token(app, owner),
+                                      conversation_id, customer['user_id'], stats))
+
+        eventlet.sleep(1)
+        base_rss = rss_kb(server_pid) if server_pid else 0
+
+        def connect(client):
+            try:
+                client.connect()
+            except Exception as e:
+                stats['errors'] += 1
+                print(f"Connect failed for user {client.user_id}: {e}")
+
+        print(f"Connecting {len(clients)} clients to {url}...")
+        started = time.time()
+        pool = eventlet.GreenPool(args.connect_concurrency)
+        for client in clients:
+            pool.spawn_n(connect, client)
+        pool.waitall()
+        connected = [client for client in clients if client.connected]
+        print(f"   {len(connected)} connected in {time.time() - started:.1f}s")
+
+        eventlet.sleep(2)
+        loaded_rss = rss_kb(server_pid) if server_pid else 0
+        memory = {'server_rss_before_kb': base_rss, 'server_rss_connected_kb': loaded_rss,
+                  'per_connection_kb': round((loaded_rss - base_rss) / len(connected), 1) if connected else None}
+
+        def paced(rate, action):
+            """Call action(client) rate times per second on random connected clients until the deadline."""
+            if rate <= 0:
+                return
+            interval = 1.0 / rate
+            next_at = time.time()
+            while time.time() < deadline:
+                live = [client for client in clients if client.connected]
+                if live:
+                    try:
+                        action(random.choice(live))
+                    except Exception:
+                        stats['errors'] += 1
+                next_at += interval
+                eventlet.sleep(max(0, next_at - time.time()))
+
+        def churn(client):
+            try:
+                client.disconnect()
+                client.connect()
+            except Exception:
+                stats['errors'] += 1
+
+        print(f"Running traffic for {args.duration}s...")
+        stats['connect'].clear()
+        deadline = time.time() + args.duration
+        workers = eventlet.GreenPool(args.connect_concurrency + 3)
+        workers.spawn_n(paced, args.message_rate, LoadClient.send_message)
+        workers.spawn_n(paced, args.notify_rate, LoadClient.send_notification)
+        workers.spawn_n(paced, args.churn_rate, lambda client: workers.spawn_n(churn, client))
+        workers.waitall()
+
+        # Let in-flight deliveries land
+        eventlet.sleep(args.drain)
+
+        for client in clients:
+            if client.connected:
+                client.sio.disconnect()
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'clients': len(clients), 'duration_s': args.duration,
+        'message_rate': args.message_rate, 'notify_rate': args.notify_rate, 'churn_rate': args.churn_rate,
+        'sent_messages': stats['sent_messages'], 'sent_notifications': stats['sent_notifications'],
+        'errors': stats['errors'],
+        'new_message_latency': summarize(stats['message']),
+        'new_notification_latency': summarize(stats['notification']),
+        'churn_connect': summarize(stats['connect']),
+        'churn_disconnect': summarize(stats['disconnect']),
+        'memory': memory,
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Socket.IO load test for chat and notifications.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help="Run the server with a stubbed VenueBot")
+    serve_parser.add_argument('--port', type=int, default=5055)
+    serve_parser.add_argument('--bot-delay', type=float, default=0.0, help="Simulated LLM latency in seconds")
+    serve_parser.add_argument('--verbose', action='store_true', help="Keep handler output and access logs")
+
+    run_parser = commands.add_parser('run', help="Start a server and drive load against it")
+    run_parser.add_argument('--clients', type=int, default=1000, help="Connected clients (two per conversation)")
+    run_parser.add_argument('--duration', type=int, default=30, help="Seconds of traffic")
+    run_parser.add_argument('--message-rate', type=float, default=50, help="Chat messages per second")
+    run_parser.add_argument('--notify-rate', type=float, default=20, help="Notifications per second")
+    run_parser.add_argument('--churn-rate', type=float, default=5, help="Reconnects per second")
+    run_parser.add_argument('--connect-concurrency', type=int, default=100, help="Parallel connection attempts")
+    run_parser.add_argument('--drain', type=float, default=3, help="Seconds to wait for in-flight events")
+    run_parser.add_argument('--port', type=int, default=5055, help="Port for the spawned server")
+    run_parser.add_argument('--bot-delay', type=float, default=0.0, help="Simulated LLM latency in seconds")
+    run_parser.add_argument('--url', help="Use an already running server instead of spawning one")
+    run_parser.add_argument('--server-pid', type=int, help="PID of --url's server, for memory measurement")
+    run_parser.add_argument('--output', help="Write the report JSON to this path")
+
+    args = parser.parse_args()
+    if args.command == 'serve':
+        serve(args.port, args.bot_delay, args.verbose)
+    else:
+        sys.exit(run(args))
@@ -0,0 +1,87 @@
+"""
+Outbox maintenance.
+
+The server processes deliver outbox events themselves; this script is for
+inspecting the queue and dealing with what they could not deliver.
+
+Usage:
+    python scripts/manage_outbox.py status
+    python scripts/manage_outbox.py retry-failed           # put failed events back in the queue
+    python scripts/manage_outbox.py drain                  # deliver due events now (no live socket pushes)
+    python scripts/manage_outbox.py prune --days 7         # delete old delivered events
+"""
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from utils.db import get_db_connection
+from utils.outbox import dispatch_batch, prune_delivered
+
+
+def status():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT status, event_type, COUNT(*) as events, MIN(created_at) as oldest
+        FROM outbox_events
+        GROUP BY status, event_type
+        ORDER BY status, event_type
+    """)
+    for row in cursor.fetchall():
+        print(f"{row['status']:10} {row['event_type']:24} {row['events']:8}  oldest {row['oldest']}")
+
+    cursor.execute("""
+        SELECT event_id, event_type, attempts, last_error
+        FROM outbox_events WHERE status = 'failed'
+        ORDER BY event_id DESC LIMIT 10
+    """)
+    for row in cursor.fetchall():
+        print(f"  failed #{row['event_id']} {row['event_type']} after {row['attempts']} attempts: {row['last_error']}")
+    cursor.close()
+    conn.close()
+
+
+def retry_failed():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        UPDATE outbox_events
+        SET status = 'pending', attempts = 0, available_at = NOW()
+        WHERE status = 'failed'
+    """)
+    print(f"Requeued {cursor.rowcount} event(s)")
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def drain(batch_size, max_attempts):
+    total_delivered = total_failed = 0
+    while True:
+        delivered, failed = dispatch_batch(batch_size, max_attempts)
+        total_delivered += delivered
+        total_failed += failed
+        if delivered + failed < batch_size:
+            break
+    print(f"Delivered {total_delivered}, failed {total_failed}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect and maintain the transactional outbox.")
+    parser.add_argument('command', choices=['status', 'retry-failed', 'drain', 'prune'])
+    parser.add_argument('--days', type=int, default=7, help="prune: age of delivered events to delete")
+    args = parser.parse_args()
+
+    app, _ = create_app()
+    with app.app_context():
+        if args.command == 'status':
+            status()
+        elif args.command == 'retry-failed':
+            retry_failed()
+        elif args.command == 'drain':
+            drain(app.config['OUTBOX_BATCH_SIZE'], app.config['OUTBOX_MAX_ATTEMPTS'])
+        else:
+            print(f"Pruned {prune_delivered(args.days)} delivered event(s)")
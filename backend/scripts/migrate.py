@@ -0,0 +1,40 @@
+"""
+Apply pending schema migrations from backend/migrations.
+
+Usage:
+    python scripts/migrate.py            # apply all pending migrations
+    python scripts/migrate.py --status   # list migrations and whether they are applied
+    python scripts/migrate.py --target 0001
+"""
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from utils.migrations import get_status, migrate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply VenueBook schema migrations.")
+    parser.add_argument('--status', action='store_true', help="Show migration status and exit")
+    parser.add_argument('--target', help="Apply migrations up to and including this version")
+    args = parser.parse_args()
+
+    app, _ = create_app()
+    with app.app_context():
+        if args.status:
+            for version, name, applied in get_status():
+                print(f"{'[x]' if applied else '[ ]'} {version}_{name}")
+            return
+
+        applied = migrate(args.target)
+        if applied:
+            print(f"\nApplied {len(applied)} migration(s): {', '.join(applied)}")
+        else:
+            print("Database is up to date.")
+
+
+if __name__ == "__main__":
+    main()
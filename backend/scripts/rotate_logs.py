@@ -0,0 +1,61 @@
+"""
+Monthly maintenance for the partitioned logs table.
+
+- Adds monthly partitions ahead of time (split off the catch-all pmax).
+- Archives partitions older than LOG_RETENTION_MONTHS to
+  LOG_ARCHIVE_DIR/logs_YYYY-MM.jsonl.gz (newest first, with a
+  logs_YYYY-MM.meta.json sidecar) and drops them.
+
+Run it from cron once a month (any day; it is idempotent):
+    python scripts/rotate_logs.py [--retention-months 12] [--months-ahead 2] [--dry-run]
+"""
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from utils.db import get_db_connection
+from utils.log_archive import list_partitions, ensure_partitions, apply_retention
+
+
+def rotate_logs(retention_months=None, months_ahead=2, dry_run=False):
+    app, _ = create_app()
+
+    with app.app_context():
+        retention_months = retention_months or app.config['LOG_RETENTION_MONTHS']
+        directory = app.config['LOG_ARCHIVE_DIR']
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        partitions = list_partitions(cursor)
+        if not partitions:
+            print("logs is not partitioned yet; run scripts/migrate.py first.")
+            return 1
+
+        if dry_run:
+            for name, rows in partitions:
+                print(f"{name:10} ~{rows} rows")
+            print(f"\nRetention: {retention_months} months, archive: {directory}")
+            return 0
+
+        created = ensure_partitions(cursor, months_ahead)
+        print(f"Created {len(created)} partition(s){': ' + ', '.join(created) if created else ''}")
+
+        for name, path, rows in apply_retention(conn, retention_months, directory):
+            print(f"Archived {name}: {rows} rows -> {path}")
+
+        cursor.close()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add log partitions and archive expired ones.")
+    parser.add_argument('--retention-months', type=int, help="Months kept in the table (default LOG_RETENTION_MONTHS)")
+    parser.add_argument('--months-ahead', type=int, default=2, help="Future months to pre-create")
+    parser.add_argument('--dry-run', action='store_true', help="Only list partitions")
+    args = parser.parse_args()
+    sys.exit(rotate_logs(args.retention_months, args.months_ahead, args.dry_run))
@@ -1,15 +1,18 @@
 import os
 import sys
+import json
 import random
+import argparse
 import requests
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 
 # Add backend directory to path to import utils
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import create_app
 from utils.db import get_db_connection
-from utils.image_utils import upload_image
+from utils.image_assets import get_asset, ingest_image, attach_to_venue
+from utils.image_utils import get_storage
 
 # Sample images to fetch (Unsplash source)
 SAMPLE_IMAGES = [
@@ -19,46 +22,87 @@ SAMPLE_IMAGES = [
     "https://images.unsplash.com/photo-1517457373958-b7bdd4587205?w=800&q=80"  # Party
 ]
 
-def seed_images():
+# Source URL -> content hash of samples already stored, so reruns skip the download
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.seed_images_manifest.json')
+
+
+def load_manifest(path):
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def save_manifest(path, manifest):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def fetch_sample(app, storage, index, img_url, known_hash):
+    """Download and store one sample image; returns an ingest_image() result or None."""
+    with app.app_context():
+        if known_hash:
+            asset = get_asset(known_hash)
+            if asset:
+                variants = {'thumb': asset['thumb_url'], 'card': asset['card_url'], 'full': asset['full_url']}
+                print(f"   Sample {index + 1}: already stored, skipping download")
+                return {'content_hash': known_hash, 'url': asset['url'], 'variants': variants, 'reused': True}
+
+        try:
+            response = requests.get(img_url, timeout=30)
+            if response.status_code != 200:
+                print(f"   Sample {index + 1}: download failed ({response.status_code})")
+                return None
+
+            result = ingest_image(storage, response.content, f"sample_venue_{index}.jpg", "samples")
+            if not result['url']:
+                print(f"   Sample {index + 1}: failed to upload (check credentials?)")
+                return None
+
+            print(f"   Sample {index + 1}: {'reused' if result['reused'] else 'uploaded'} {result['url']}")
+            return result
+        except Exception as e:
+            print(f"   Sample {index + 1}: error processing image: {e}")
+            return None
+
+
+def seed_images(workers=4, manifest_path=DEFAULT_MANIFEST):
     app, _ = create_app()
-    
+
     with app.app_context():
         conn = get_db_connection()
         cursor = conn.cursor()
-        
+
         print("1. Fetching venues...")
         cursor.execute("SELECT venue_id, name FROM venues")
         venues = cursor.fetchall()
-        
+
         if not venues:
             print("No venues found to seed.")
             return
 
         print(f"Found {len(venues)} venues.")
-        
-        print("2. Uploading sample images to Cloudinary (this may take a moment)...")
-        uploaded_urls = []
-        
-        for i, img_url in enumerate(SAMPLE_IMAGES):
-            try:
-                print(f"   Downloading and uploading sample {i+1}...")
-                response = requests.get(img_url)
-                if response.status_code == 200:
-                    # Create a file-like object
-                    image_data = BytesIO(response.content)
-                    image_data.name = f"sample_venue_{i}.jpg" # Cloudinary needs a filename
-                    
-                    # Upload to Cloudinary
-                    url = upload_image(image_data, folder="samples")
-                    if url:
-                        uploaded_urls.append(url)
-                        print(f"   -> Success: {url}")
-                    else:
-                        print("   -> Failed to upload to Cloudinary (check credentials?)")
-            except Exception as e:
-                print(f"   -> Error processing image {i+1}: {e}")
-
-        if not uploaded_urls:
+
+        print("2. Storing sample images...")
+        storage = get_storage(app)
+        manifest = load_manifest(manifest_path)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                lambda item: fetch_sample(app, storage, item[0], item[1], manifest.get(item[1])),
+                enumerate(SAMPLE_IMAGES)
+            ))
+
+        assets = []
+        for img_url, result in zip(SAMPLE_IMAGES, results):
+            if result:
+                manifest[img_url] = result['content_hash']
+                assets.append(result)
+        save_manifest(manifest_path, manifest)
+
+        if not assets:
             print("No images were uploaded successfully. Aborting seed.")
             return
 
@@ -68,26 +112,27 @@ def seed_images():
             # Check if venue already has images
             cursor.execute("SELECT COUNT(*) as count FROM venue_images WHERE venue_id = %s", (venue['venue_id'],))
             existing = cursor.fetchone()['count']
-            
+
             if existing == 0:
                 # Assign 1-3 random images
                 num_images = random.randint(1, 3)
-                selected_urls = random.sample(uploaded_urls, k=min(num_images, len(uploaded_urls)))
-                
-                for url in selected_urls:
-                    cursor.execute("""
-                        INSERT INTO venue_images (venue_id, image_url)
-                        VALUES (%s, %s)
-                    """, (venue['venue_id'], url))
-                
-                print(f"   Seeded {len(selected_urls)} images for venue #{venue['venue_id']} ({venue['name']})")
+                selected = random.sample(assets, k=min(num_images, len(assets)))
+
+                for asset in selected:
+                    attach_to_venue(venue['venue_id'], asset)
+
+                print(f"   Seeded {len(selected)} images for venue #{venue['venue_id']} ({venue['name']})")
                 count += 1
-        
-        conn.commit()
+
         cursor.close()
         conn.close()
-        
+
         print(f"\nDone! specific images added to {count} venues.")
 
+
 if __name__ == "__main__":
-    seed_images()
+    parser = argparse.ArgumentParser(description="Seed venues with sample images.")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent downloads (default 4)")
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST, help="Resume manifest path")
+    args = parser.parse_args()
+    seed_images(args.workers, args.manifest)
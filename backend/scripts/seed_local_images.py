@@ -1,15 +1,21 @@
 import os
 import sys
+import json
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 # from fuzzywuzzy import process # Optional dependency
-import cloudinary.uploader
 
 # Add backend directory to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import create_app
 from utils.db import get_db_connection
-from utils.image_utils import upload_image
+from utils.image_assets import ingest_image, attach_to_venue
+from utils.image_utils import get_storage
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+
 
 def find_venue_id(cursor, identifier):
     # 1. Try treating as Venue ID (if it looks like a number)
@@ -30,96 +36,165 @@ def find_venue_id(cursor, identifier):
     result = cursor.fetchone()
     if result:
         return result
-    
+
     return None
 
-def seed_local_images(base_path):
+
+class Manifest:
+    """
+    Resume manifest: relative file path -> {size, mtime, content_hash, venue_id}.
+    Files whose size and mtime are unchanged since they were recorded are skipped
+    on the next run. Saved atomically after every folder.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def is_done(self, key, stat, venue_id):
+        entry = self.entries.get(key)
+        return bool(entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime
+                    and entry['venue_id'] == venue_id)
+
+    def record(self, key, stat, asset_hash, venue_id):
+        with self.lock:
+            self.entries[key] = {'size': stat.st_size, 'mtime': stat.st_mtime,
+                                 'content_hash': asset_hash, 'venue_id': venue_id}
+
+    def save(self):
+        with self.lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def match_folders(cursor, base_path, process):
+    """Match each image folder under base_path to a venue. Returns [(root, files, venue)]."""
+    matched = []
+    for root, dirs, files in os.walk(base_path):
+        folder_name = os.path.basename(root)
+
+        # Skip root folder itself if it's the base path
+        if os.path.abspath(root) == os.path.abspath(base_path):
+            continue
+
+        image_files = sorted(f for f in files if f.lower().endswith(IMAGE_EXTENSIONS))
+
+        if not image_files:
+            continue
+
+        # Find venue
+        venue = find_venue_id(cursor, folder_name)
+
+        if not venue and process:
+            # Fallback to fuzzy search only if we have the library
+            cursor.execute("SELECT venue_id, name FROM venues")
+            all_venues = cursor.fetchall()
+            names = {v['name']: v for v in all_venues}
+            match = process.extractOne(folder_name, list(names.keys()))
+            if match and match[1] > 80:
+                venue = names[match[0]]
+                print(f"'{folder_name}' fuzzy matched to: '{venue['name']}' (Score: {match[1]})")
+
+        if not venue:
+            print(f"SKIPPING '{folder_name}'. Could not match it to any Venue ID or Name.")
+            continue
+
+        matched.append((root, image_files, venue))
+    return matched
+
+
+def process_folder(app, storage, manifest, base_path, root, image_files, venue):
+    """Upload one venue folder. Returns (uploaded, reused, skipped, failed) counts."""
+    venue_id = venue['venue_id']
+    folder = f"venues/{venue_id}"
+    counts = {'uploaded': 0, 'reused': 0, 'skipped': 0, 'failed': 0}
+
+    with app.app_context():
+        for img_file in image_files:
+            file_path = os.path.join(root, img_file)
+            key = os.path.relpath(file_path, base_path)
+            stat = os.stat(file_path)
+
+            if manifest.is_done(key, stat, venue_id):
+                counts['skipped'] += 1
+                continue
+
+            try:
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+
+                asset = ingest_image(storage, data, img_file, folder)
+                if not asset['url']:
+                    counts['failed'] += 1
+                    continue
+
+                attach_to_venue(venue_id, asset)
+                manifest.record(key, stat, asset['content_hash'], venue_id)
+                counts['reused' if asset['reused'] else 'uploaded'] += 1
+            except Exception as e:
+                print(f"   Error uploading {key}: {e}")
+                counts['failed'] += 1
+
+    # Persist progress after each venue
+    manifest.save()
+    print(f"Venue ID {venue_id} ({venue['name']}): {counts['uploaded']} uploaded, "
+          f"{counts['reused']} reused, {counts['skipped']} skipped, {counts['failed']} failed")
+    return counts
+
+
+def seed_local_images(base_path, workers=4, manifest_path=None):
     if not os.path.exists(base_path):
         print(f"Error: Path '{base_path}' does not exist.")
         return
 
     app, _ = create_app()
-    
+
     # Check for required packages
     try:
-        import fuzzywuzzy
         from fuzzywuzzy import process
     except ImportError:
-        print("Note: 'fuzzywuzzy' not found. Installing for name matching (if needed)...")
-        # Only install if we really end up needing it, or just rely on IDs for now since user specified IDs.
-        # Let's skip auto-install to avoid permission issues, user said they have IDs.
+        print("Note: 'fuzzywuzzy' not found. Matching folders by venue ID or exact name only.")
         process = None
 
+    manifest = Manifest(manifest_path or os.path.join(base_path, '.seed_manifest.json'))
+
     with app.app_context():
         conn = get_db_connection()
         cursor = conn.cursor()
-        
+
         print(f"Scanning directory: {base_path}")
-        
-        for root, dirs, files in os.walk(base_path):
-            folder_name = os.path.basename(root)
-            
-            # Skip root folder itself if it's the base path
-            if os.path.abspath(root) == os.path.abspath(base_path):
-                continue
-                
-            image_files = [f for f in files if f.lower().endswith(('.png', '.jpg', '.jpeg', '.webp'))]
-            
-            if not image_files:
-                continue
-                
-            print(f"\nProcessing folder: {folder_name} (found {len(image_files)} images)")
-            
-            # Find venue
-            venue = find_venue_id(cursor, folder_name)
-            
-            if not venue:
-                if process:
-                     # Fallback to fuzzy search only if we have the library
-                    cursor.execute("SELECT venue_id, name FROM venues")
-                    all_venues = cursor.fetchall()
-                    names = {v['name']: v for v in all_venues}
-                    match = process.extractOne(folder_name, list(names.keys()))
-                    if match and match[1] > 80:
-                        venue = names[match[0]]
-                        print(f"   -> Fuzzy matched to: '{venue['name']}' (Score: {match[1]})")
-                
-                if not venue:
-                    print(f"   -> SKIPPING. Could not match '{folder_name}' to any Venue ID or Name.")
-                    continue
-            
-            print(f"   -> Match found: Venue ID {venue['venue_id']} ({venue['name']})")
-            print(f"   -> Uploading to folder: venues/{venue['venue_id']}")
-            
-            for img_file in image_files:
-                file_path = os.path.join(root, img_file)
-                try:
-                    print(f"      Uploading {img_file}...", end='', flush=True)
-                    url = upload_image(file_path, folder=f"venues/{venue['venue_id']}")
-                    
-                    if url:
-                        # Save to DB
-                        cursor.execute("""
-                            INSERT INTO venue_images (venue_id, image_url)
-                            VALUES (%s, %s)
-                        """, (venue['venue_id'], url))
-                        print(" OK")
-                    else:
-                        print(" Failed")
-                except Exception as e:
-                    print(f" Error: {e}")
-            
-            # Commit after each venue to show progress
-            conn.commit()
-
-        conn.commit()
+        folders = match_folders(cursor, base_path, process)
         cursor.close()
         conn.close()
-        print("\nUpload complete.")
+
+        print(f"Uploading {len(folders)} folders with {workers} workers...")
+        storage = get_storage(app)
+        totals = {'uploaded': 0, 'reused': 0, 'skipped': 0, 'failed': 0}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(process_folder, app, storage, manifest, base_path, root, files, venue)
+                       for root, files, venue in folders]
+            for future in as_completed(futures):
+                for name, value in future.result().items():
+                    totals[name] += value
+
+        print(f"\nUpload complete. {totals['uploaded']} uploaded, {totals['reused']} reused, "
+              f"{totals['skipped']} skipped, {totals['failed']} failed.")
+
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python backend/seed_local_images.py <path_to_images_folder>")
-        print("Example: python backend/seed_local_images.py 'C:/Users/Downloads/VenueImages'")
-    else:
-        seed_local_images(sys.argv[1])
+    parser = argparse.ArgumentParser(
+        description="Upload local venue image folders (one folder per venue ID or name).",
+        epilog="Example: python backend/scripts/seed_local_images.py 'C:/Users/Downloads/VenueImages'"
+    )
+    parser.add_argument('base_path', help="Folder containing one sub-folder per venue")
+    parser.add_argument('--workers', type=int, default=4, help="Folders processed concurrently (default 4)")
+    parser.add_argument('--manifest', help="Resume manifest path (default <base_path>/.seed_manifest.json)")
+    args = parser.parse_args()
+    seed_local_images(args.base_path, args.workers, args.manifest)
@@ -3,26 +3,72 @@ Socket.IO Event Handlers
 
 Manages real-time communication events:
 - connection/disconnection
+- presence subscriptions
 - joining rooms
 - sending/receiving messages
+
+Presence: a client subscribes to the user ids it shows a status for
+(subscribe_presence), which joins it to one presence_<user_id> room per
+user. Status changes are emitted to that room only. Going offline is
+delayed by PRESENCE_OFFLINE_GRACE seconds, and a reconnect within that
+window cancels it, so page reloads and flaky networks don't produce
+offline/online pairs.
 """
 from flask import request, current_app
-from flask_socketio import emit, join_room, leave_room, disconnect
+from flask_socketio import emit, join_room, leave_room, disconnect, rooms
 from datetime import datetime
 import jwt
 
 from utils.db import get_db_connection
 from utils.ai_utils import generate_venuebot_response
+from utils.metrics import track_socket_event
+from utils import rate_limit
 
 # Dictionary to store connected users {user_id: [sid1, sid2]}
 connected_users = {}
 # Dictionary to store sid to user mapping {sid: user_id}
 sid_to_user = {}
+# Users whose last socket disconnected and whose offline status is still pending {user_id: token}
+pending_offline = {}
+
+
+def _presence_room(user_id):
+    return f"presence_{user_id}"
+
+
+def _presence_status(user_id):
+    """Status subscribers see: users inside the offline grace period still count as online."""
+    return 'online' if user_id in connected_users or user_id in pending_offline else 'offline'
+
+
+def _user_ids(data):
+    """Parse user_ids (or a single user_id) from an event payload into ints."""
+    raw = data.get('user_ids')
+    if raw is None:
+        raw = [data.get('user_id')]
+    user_ids = []
+    for value in raw if isinstance(raw, list) else [raw]:
+        try:
+            user_ids.append(int(value))
+        except (TypeError, ValueError):
+            continue
+    return user_ids
+
 
 def register_socket_handlers(socketio):
-    
+
+    def publish_offline(user_id, token, grace):
+        """Emit offline for user_id after the grace period unless they reconnected meanwhile."""
+        socketio.sleep(grace)
+        if pending_offline.get(user_id) != token or user_id in connected_users:
+            return
+        del pending_offline[user_id]
+        socketio.emit('user_status', {'user_id': user_id, 'status': 'offline'},
+                      to=_presence_room(user_id))
+
     @socketio.on('connect')
-    def handle_connect():
+    @track_socket_event('connect')
+    def handle_connect(auth=None):
         """Handle client connection"""
         token = request.args.get('token')
         if not token:
@@ -47,15 +93,18 @@ def register_socket_handlers(socketio):
             print(f"User {user_id} connected [SID: {request.sid}]")
             emit('connection_response', {'status': 'connected', 'user_id': user_id})
             
-            # Broadcast status online
-            emit('user_status', {'user_id': user_id, 'status': 'online'}, broadcast=True)
+            # Tell subscribers, unless this is a reconnect within the offline grace period
+            if pending_offline.pop(user_id, None) is None and len(connected_users[user_id]) == 1:
+                emit('user_status', {'user_id': user_id, 'status': 'online'},
+                     to=_presence_room(user_id))
             
         except Exception as e:
             print(f"Socket connection error: {str(e)}")
             disconnect()
 
     @socketio.on('disconnect')
-    def handle_disconnect():
+    @track_socket_event('disconnect')
+    def handle_disconnect(reason=None):
         """Handle client disconnection"""
         # Remove from sid_to_user
         if request.sid in sid_to_user:
@@ -67,20 +116,55 @@ def register_socket_handlers(socketio):
                 connected_users[user_id].remove(request.sid)
                 if not connected_users[user_id]:
                     del connected_users[user_id]
-                    # Broadcast status offline only if no sessions left
-                    emit('user_status', {'user_id': user_id, 'status': 'offline'}, broadcast=True)
+                    # Offline only if no sessions are left and none come back within the grace period
+                    token = object()
+                    pending_offline[user_id] = token
+                    socketio.start_background_task(
+                        publish_offline, user_id, token,
+                        current_app.config.get('PRESENCE_OFFLINE_GRACE', 5)
+                    )
             
             print(f"User {user_id} disconnected [SID: {request.sid}]")
 
+    @socketio.on('subscribe_presence')
+    @track_socket_event('subscribe_presence')
+    def handle_subscribe_presence(data):
+        """Follow the status of the given users ({user_ids: [...]}) and get their current status"""
+        if request.sid not in sid_to_user:
+            return
+
+        limit = current_app.config.get('PRESENCE_MAX_SUBSCRIPTIONS', 200)
+        subscribed = sum(1 for room in rooms() if room.startswith('presence_'))
+
+        statuses = []
+        for user_id in _user_ids(data):
+            room = _presence_room(user_id)
+            if room not in rooms():
+                if subscribed >= limit:
+                    break
+                join_room(room)
+                subscribed += 1
+            statuses.append({'user_id': user_id, 'status': _presence_status(user_id)})
+
+        for status in statuses:
+            emit('user_status', status)
+
+    @socketio.on('unsubscribe_presence')
+    @track_socket_event('unsubscribe_presence')
+    def handle_unsubscribe_presence(data):
+        """Stop following the status of the given users"""
+        for user_id in _user_ids(data):
+            leave_room(_presence_room(user_id))
+
     @socketio.on('request_status')
+    @track_socket_event('request_status')
     def handle_request_status(data):
-        """Check status of a specific user"""
-        target_id = data.get('user_id')
-        if target_id:
-            is_online = target_id in connected_users
-            emit('user_status', {'user_id': target_id, 'status': 'online' if is_online else 'offline'})
+        """Check status of a specific user (one-off, without subscribing)"""
+        for target_id in _user_ids(data):
+            emit('user_status', {'user_id': target_id, 'status': _presence_status(target_id)})
 
     @socketio.on('join_conversation')
+    @track_socket_event('join_conversation')
     def handle_join_conversation(data):
         """Join a specific conversation room"""
         conversation_id = data.get('conversation_id')
@@ -89,6 +173,7 @@ def register_socket_handlers(socketio):
             print(f"Socket {request.sid} joined conversation {conversation_id}")
 
     @socketio.on('send_message')
+    @track_socket_event('send_message')
     def handle_send_message(data):
         """Handle sending a message"""
         conn = None
@@ -117,6 +202,15 @@ def register_socket_handlers(socketio):
             if conv_data and conv_data.get('admin_id') == 4:
                 is_bot_chat = True
 
+            # Every bot message costs LLM calls: same limits and shedding as /api/chat/ask
+            if is_bot_chat and sender_id != 4:
+                rejection = rate_limit.check('bot', f"user:{sender_id}")
+                if rejection:
+                    emit('error', {'message': rejection[1], 'retry_after': rejection[2]})
+                    cursor.close()
+                    conn.close()
+                    return
+
             cursor.execute("""
                 INSERT INTO messages (conversation_id, sender_id, content) 
                 VALUES (%s, %s, %s)
@@ -149,7 +243,7 @@ def register_socket_handlers(socketio):
             # VENUEBOT AI LOGIC
             if is_bot_chat and sender_id != 4:
                 # Calculate response
-                ai_text = generate_venuebot_response(content, conversation_id)
+                ai_text = generate_venuebot_response(content, conversation_id, sender_id)
                 
                 # Insert AI Response
                 cursor.execute("""
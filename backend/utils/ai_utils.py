@@ -2,7 +2,10 @@ from groq import Groq
 import os
 import re
 import json
+import time
 from utils.db import get_db_connection
+from utils.metrics import observe_groq_completion
+from utils.recommendations import recommend, user_history
 from utils.schema_docs import get_schema_docs, get_sql_rules, get_confidential_fields
 
 # Configure Groq
@@ -12,6 +15,17 @@ groq_client = Groq(api_key=api_key) if api_key else None
 CONFIDENTIAL_FIELDS = get_confidential_fields()
 
 
+def create_chat_completion(call, **kwargs):
+    """Call Groq chat completions, recording latency and token usage under the given call name."""
+    started = time.perf_counter()
+    completion = None
+    try:
+        completion = groq_client.chat.completions.create(**kwargs)
+        return completion
+    finally:
+        observe_groq_completion(call, started, completion)
+
+
 def get_conversation_history(conversation_id, limit=3):
     """
     Retrieve recent conversation history for context.
@@ -79,7 +93,7 @@ def handle_comparison_query(venue1, venue2):
     Handle venue comparison requests.
     """
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
         # Search for both venues
@@ -170,7 +184,8 @@ Return ONLY the SQL query, nothing else. No explanations, no markdown, just the
     try:
         print(f"AI Utils: Generating SQL for question: {user_question}")
         
-        chat_completion = groq_client.chat.completions.create(
+        chat_completion = create_chat_completion(
+            'generate_sql',
             messages=[
                 {
                     "role": "user",
@@ -246,8 +261,10 @@ def execute_safe_query(sql_query):
         if 'LIMIT' not in sql_query.upper():
             sql_query += " LIMIT 100"
         
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
+        # Also enforced by the server, whether this landed on a replica or the primary
+        cursor.execute("SET SESSION TRANSACTION READ ONLY")
         
         print(f"AI Utils: Executing query: {sql_query}")
         cursor.execute(sql_query)
@@ -262,9 +279,12 @@ def execute_safe_query(sql_query):
         return None, str(e)
 
 
-def format_query_results(user_question, results, sql_query, is_recommendation=False):
+def format_query_results(user_question, results, sql_query, is_recommendation=False, picks=None):
     """
     Step 4: Format SQL results into natural language using Groq.
+
+    picks are the user's precomputed recommendations (utils.recommendations),
+    offered to the model next to the query results.
     """
     if not api_key or not groq_client:
         return "I am not fully configured yet (Missing API Key)."
@@ -294,6 +314,12 @@ def format_query_results(user_question, results, sql_query, is_recommendation=Fa
     recommendation_note = ""
     if is_recommendation:
         recommendation_note = "\n\nIMPORTANT: The user wants a RECOMMENDATION, not just data. Analyze the results and suggest the BEST option with reasons why!"
+        if picks:
+            pick_data = json.dumps([
+                {key: venue.get(key) for key in ('venue_id', 'name', 'city', 'type', 'capacity', 'base_price', 'rating')}
+                for venue in picks
+            ], default=str, indent=2)
+            recommendation_note += f"\n\nVenues that match this user's booking and review history (best match first). Prefer these when they fit the question:\n{pick_data}"
     
     prompt = f"""You are VenueBot, a friendly and helpful AI assistant for VenueBook.
 
@@ -325,7 +351,8 @@ Example good responses:
     try:
         print(f"AI Utils: Formatting results...")
         
-        chat_completion = groq_client.chat.completions.create(
+        chat_completion = create_chat_completion(
+            'format_results',
             messages=[
                 {
                     "role": "user",
@@ -355,7 +382,7 @@ Example good responses:
             return f"Found {len(results)} results."
 
 
-def generate_information_bot_response(user_question, conversation_id=None):
+def generate_information_bot_response(user_question, conversation_id=None, user_id=None):
     """
     Main function: Comprehensive information bot using SQL generation.
     """
@@ -526,6 +553,13 @@ We're here to help resolve any issues quickly! 💪"""
     
     # Step 4: Check if it's a recommendation query
     is_recommendation = detect_recommendation_query(user_question)
+    picks = None
+    if is_recommendation and user_id:
+        try:
+            picks, personalized = recommend(user_history(user_id), limit=5)
+            picks = picks if personalized else None
+        except Exception as e:
+            print(f"AI Utils: Recommendations unavailable - {str(e)}")
     
     # Step 5: Generate SQL
     sql_query = generate_sql_from_question(user_question, conversation_history)
@@ -547,15 +581,15 @@ We're here to help resolve any issues quickly! 💪"""
         return f"Oops, I ran into a technical issue while looking that up. Could you try asking in a different way? 🤔"
     
     # Step 8: Format results
-    response = format_query_results(user_question, results, sql_query, is_recommendation)
+    response = format_query_results(user_question, results, sql_query, is_recommendation, picks)
     
     return response
 
 
 # Alias for backward compatibility
-def generate_venuebot_response(user_message, conversation_id=None):
+def generate_venuebot_response(user_message, conversation_id=None, user_id=None):
     """
     Main entry point for chatbot.
     Now uses comprehensive SQL-based information retrieval.
     """
-    return generate_information_bot_response(user_message, conversation_id)
+    return generate_information_bot_response(user_message, conversation_id, user_id)
@@ -0,0 +1,162 @@
+"""
+Daily venue fact table (venue_daily_stats).
+
+One row per venue per day with:
+- bookings_created / bookings_confirmed / bookings_completed, counted on the
+  day the booking was created (confirmed/completed reflect the booking's
+  current status),
+- revenue_completed / revenue_pending, summed on the payment_date day.
+
+The booking and payment write paths keep it current by calling the
+record_* helpers with their own cursor, inside the same transaction.
+rebuild() recomputes a date range from the source tables (backfill and
+repair; see scripts/backfill_daily_stats.py).
+"""
+
+BOOKING_STATUS_COLUMNS = {'confirmed': 'bookings_confirmed', 'completed': 'bookings_completed'}
+PAYMENT_STATUS_COLUMNS = {'completed': 'revenue_completed', 'pending': 'revenue_pending'}
+
+
+def _add(cursor, venue_id, day, deltas):
+    """Add deltas to one venue/day row; day None means today (database clock)."""
+    deltas = {column: value for column, value in deltas.items() if value}
+    if not deltas:
+        return
+    columns = list(deltas)
+    cursor.execute(f"""
+        INSERT INTO venue_daily_stats (venue_id, day, {', '.join(columns)})
+        VALUES (%s, COALESCE(%s, CURDATE()), {', '.join(['%s'] * len(columns))})
+        ON DUPLICATE KEY UPDATE {', '.join(f'{column} = {column} + VALUES({column})' for column in columns)}
+    """, (venue_id, day, *deltas.values()))
+
+
+def _status_deltas(columns, old_status, new_status, amount=1):
+    deltas = {}
+    if old_status in columns:
+        deltas[columns[old_status]] = -amount
+    if new_status in columns:
+        deltas[columns[new_status]] = deltas.get(columns[new_status], 0) + amount
+    return deltas
+
+
+def record_booking_created(cursor, venue_id, status='pending'):
+    """A booking was created today."""
+    deltas = {'bookings_created': 1}
+    deltas.update(_status_deltas(BOOKING_STATUS_COLUMNS, None, status))
+    _add(cursor, venue_id, None, deltas)
+
+
+def record_booking_status_change(cursor, venue_id, created_day, old_status, new_status):
+    """A booking created on created_day moved from old_status to new_status."""
+    _add(cursor, venue_id, created_day, _status_deltas(BOOKING_STATUS_COLUMNS, old_status, new_status))
+
+
+def record_bookings_completed(cursor, owner_id):
+    """
+    Count the owner's past confirmed bookings as completed; call right before
+    the dashboard's bulk confirmed -> completed UPDATE with the same filter.
+    """
+    cursor.execute("""
+        INSERT INTO venue_daily_stats (venue_id, day, bookings_confirmed, bookings_completed)
+        SELECT b.venue_id, DATE(b.created_at), -COUNT(*), COUNT(*)
+        FROM bookings b
+        JOIN venues v ON b.venue_id = v.venue_id
+        WHERE v.owner_id = %s
+          AND b.status = 'confirmed'
+          AND b.event_date < CURDATE()
+        GROUP BY b.venue_id, DATE(b.created_at)
+        ON DUPLICATE KEY UPDATE
+            bookings_confirmed = bookings_confirmed + VALUES(bookings_confirmed),
+            bookings_completed = bookings_completed + VALUES(bookings_completed)
+    """, (owner_id,))
+
+
+def record_payment(cursor, venue_id, amount, status='pending'):
+    """A payment was recorded today."""
+    _add(cursor, venue_id, None, _status_deltas(PAYMENT_STATUS_COLUMNS, None, status, amount or 0))
+
+
+def record_payment_status_change(cursor, venue_id, payment_day, amount, old_status, new_status):
+    """A payment made on payment_day moved from old_status to new_status."""
+    _add(cursor, venue_id, payment_day, _status_deltas(PAYMENT_STATUS_COLUMNS, old_status, new_status, amount or 0))
+
+
+def rebuild(cursor, date_from=None, date_to=None):
+    """
+    Recompute venue_daily_stats from bookings and payments.
+
+    Args:
+        cursor: Database cursor (caller commits).
+        date_from (str, optional): First day to rebuild (YYYY-MM-DD). Defaults to all history.
+        date_to (str, optional): Last day to rebuild (inclusive).
+
+    Returns:
+        int: Number of fact rows in the rebuilt range.
+    """
+    date_from = date_from or '1000-01-01'
+    date_to = date_to or '9999-12-31'
+
+    cursor.execute("DELETE FROM venue_daily_stats WHERE day BETWEEN %s AND %s", (date_from, date_to))
+
+    cursor.execute("""
+        INSERT INTO venue_daily_stats (venue_id, day, bookings_created, bookings_confirmed, bookings_completed)
+        SELECT venue_id, DATE(created_at),
+               COUNT(*),
+               SUM(status = 'confirmed'),
+               SUM(status = 'completed')
+        FROM bookings
+        WHERE created_at >= %s AND created_at < DATE_ADD(%s, INTERVAL 1 DAY)
+        GROUP BY venue_id, DATE(created_at)
+    """, (date_from, date_to))
+
+    cursor.execute("""
+        INSERT INTO venue_daily_stats (venue_id, day, revenue_completed, revenue_pending)
+        SELECT b.venue_id, DATE(bp.payment_date),
+               COALESCE(SUM(CASE WHEN bp.payment_status = 'completed' THEN bp.amount END), 0),
+               COALESCE(SUM(CASE WHEN bp.payment_status = 'pending' THEN bp.amount END), 0)
+        FROM booking_payments bp
+        JOIN bookings b ON bp.booking_id = b.booking_id
+        WHERE bp.payment_date >= %s AND bp.payment_date < DATE_ADD(%s, INTERVAL 1 DAY)
+        GROUP BY b.venue_id, DATE(bp.payment_date)
+        ON DUPLICATE KEY UPDATE
+            revenue_completed = VALUES(revenue_completed),
+            revenue_pending = VALUES(revenue_pending)
+    """, (date_from, date_to))
+
+    cursor.execute("SELECT COUNT(*) as count FROM venue_daily_stats WHERE day BETWEEN %s AND %s", (date_from, date_to))
+    return cursor.fetchone()['count']
+
+
+def monthly_series(cursor, date_from, date_to, owner_id=None):
+    """
+    Bookings created and completed revenue per month over [date_from, date_to].
+
+    Args:
+        cursor: Database cursor.
+        date_from (str): First day (YYYY-MM-DD).
+        date_to (str): Last day, inclusive (YYYY-MM-DD).
+        owner_id (int, optional): Restrict to one owner's venues.
+
+    Returns:
+        list: [{'month': 'YYYY-MM', 'bookings': int, 'revenue': Decimal}]
+    """
+    query = """
+        SELECT DATE_FORMAT(ds.day, '%%Y-%%m') as month,
+               SUM(ds.bookings_created) as bookings,
+               SUM(ds.revenue_completed) as revenue
+        FROM venue_daily_stats ds
+    """
+    params = []
+    if owner_id is not None:
+        query += " JOIN venues v ON ds.venue_id = v.venue_id WHERE v.owner_id = %s AND"
+        params.append(owner_id)
+    else:
+        query += " WHERE"
+    query += " ds.day BETWEEN %s AND %s GROUP BY month ORDER BY month ASC"
+    params.extend([date_from, date_to])
+
+    cursor.execute(query, tuple(params))
+    series = cursor.fetchall()
+    for row in series:
+        row['bookings'] = int(row['bookings'])
+    return series
@@ -2,23 +2,191 @@
 Database connection utilities.
 
 Provides helper functions for establishing and managing database connections.
+
+Reads that tolerate a little staleness (analytics, public listings,
+VenueBot queries) ask for get_db_connection(read_only=True), which goes to
+a replica from DB_REPLICA_HOSTS when one is usable and to the primary
+otherwise:
+
+- replicas are used round-robin; each one's replication lag is checked at
+  most every REPLICA_CHECK_INTERVAL seconds and a replica more than
+  REPLICA_MAX_LAG seconds behind (or with replication stopped, or
+  unreachable) is skipped until the next check,
+- a caller whose write request succeeded in the last
+  READ_YOUR_WRITES_SECONDS reads from the primary, so e.g. a new booking
+  shows up in the user's own lists immediately. This is per process, which
+  holds because Socket.IO already requires sticky sessions per client.
+
+A standalone MySQL instance (no replication configured) is accepted as a
+replica with zero lag, so a second local server works as a test stand-in.
 """
+import itertools
+import threading
+import time
+
 import pymysql
-from flask import current_app
+from flask import current_app, has_request_context, request
+
+from utils.query_stats import cursor_class
+
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+_lock = threading.Lock()
+
+# {host: (checked_at, usable)}
+_replica_health = {}
+# {caller identity: primary-only until}
+_recent_writers = {}
+_round_robin = itertools.count()
+
+
+def _connect(host, port, user, password):
+    return pymysql.connect(
+        host=host,
+        port=port,
+        user=user,
+        password=password,
+        database=current_app.config['DB_NAME'],
+        charset='utf8mb4',
+        cursorclass=cursor_class()
+    )
+
+
+def _replica_hosts():
+    """[(host, port)] from DB_REPLICA_HOSTS="host[:port],..."."""
+    hosts = []
+    for item in (current_app.config.get('DB_REPLICA_HOSTS') or '').split(','):
+        item = item.strip()
+        if item:
+            host, _, port = item.partition(':')
+            hosts.append((host, int(port) if port else 3306))
+    return hosts
+
+
+def _replication_lag(conn):
+    """Seconds the replica is behind, 0 for a standalone server, None if replication is stopped."""
+    cursor = conn.cursor(pymysql.cursors.DictCursor)
+    try:
+        try:
+            cursor.execute("SHOW REPLICA STATUS")
+        except pymysql.err.ProgrammingError:
+            # MySQL before 8.0.22
+            cursor.execute("SHOW SLAVE STATUS")
+        status = cursor.fetchone()
+    finally:
+        cursor.close()
+
+    if not status:
+        return 0
+    if 'Seconds_Behind_Source' in status:
+        return status['Seconds_Behind_Source']
+    return status.get('Seconds_Behind_Master')
+
+
+def _set_health(host, usable, now):
+    with _lock:
+        _replica_health[host] = (now, usable)
+
 
+def _connect_replica():
+    """Connect to the next usable replica, or return None."""
+    hosts = _replica_hosts()
+    if not hosts:
+        return None
 
-def get_db_connection():
+    config = current_app.config
+    max_lag = config.get('REPLICA_MAX_LAG', 5)
+    interval = config.get('REPLICA_CHECK_INTERVAL', 5)
+    user = config.get('DB_REPLICA_USER') or config['DB_USER']
+    password = config.get('DB_REPLICA_PASSWORD') or config['DB_PASSWORD']
+
+    start = next(_round_robin)
+    for offset in range(len(hosts)):
+        host, port = hosts[(start + offset) % len(hosts)]
+        key = f"{host}:{port}"
+        now = time.time()
+        with _lock:
+            checked = _replica_health.get(key)
+        if checked and now - checked[0] < interval and not checked[1]:
+            continue
+
+        try:
+            conn = _connect(host, port, user, password)
+        except pymysql.err.MySQLError as e:
+            print(f"Replica {key} unavailable: {str(e)}")
+            _set_health(key, False, now)
+            continue
+
+        if checked and now - checked[0] < interval:
+            return conn
+
+        try:
+            lag = _replication_lag(conn)
+        except pymysql.err.MySQLError as e:
+            print(f"Replica {key} lag check failed: {str(e)}")
+            lag = None
+        usable = lag is not None and lag <= max_lag
+        _set_health(key, usable, now)
+        if usable:
+            return conn
+        conn.close()
+    return None
+
+
+def _caller():
+    from utils.rate_limit import caller_identity
+    return caller_identity()
+
+
+def needs_primary():
+    """True if the current caller wrote recently and must read their own writes."""
+    if not has_request_context():
+        return False
+    with _lock:
+        until = _recent_writers.get(_caller())
+    return until is not None and until > time.time()
+
+
+def remember_write(response):
+    """after_request hook: pin a caller to the primary after a successful write."""
+    if request.method in WRITE_METHODS and response.status_code < 400:
+        now = time.time()
+        until = now + current_app.config.get('READ_YOUR_WRITES_SECONDS', 10)
+        with _lock:
+            if len(_recent_writers) >= 10000:
+                for caller in [c for c, expires in _recent_writers.items() if expires <= now]:
+                    del _recent_writers[caller]
+            _recent_writers[_caller()] = until
+    return response
+
+
+def get_db_connection(read_only=False):
     """
     Create and return a database connection using the current app configuration.
-    
+
+    Inside requests sampled by utils.query_stats the connection's cursors
+    record per-request SQL statistics.
+
+    Args:
+        read_only (bool): The caller only reads and accepts replica lag of up
+            to REPLICA_MAX_LAG seconds; a replica is used when one is usable.
+
     Returns:
         pymysql.Connection: A database connection object with DictCursor.
     """
-    return pymysql.connect(
-        host=current_app.config['DB_HOST'],
-        user=current_app.config['DB_USER'],
-        password=current_app.config['DB_PASSWORD'],
-        database=current_app.config['DB_NAME'],
-        charset='utf8mb4',
-        cursorclass=pymysql.cursors.DictCursor
+    if read_only and not needs_primary():
+        conn = _connect_replica()
+        if conn:
+            return conn
+
+    return _connect(
+        current_app.config['DB_HOST'],
+        current_app.config.get('DB_PORT', 3306),
+        current_app.config['DB_USER'],
+        current_app.config['DB_PASSWORD']
     )
+
+
+def init_app(app):
+    """Register the read-your-writes hook."""
+    app.after_request(remember_write)
@@ -4,16 +4,42 @@ Authentication and authorization decorators.
 Provides decorators for protecting routes and enforcing role-based access control.
 """
 from functools import wraps
-from flask import request, jsonify, current_app
+from flask import g, request, jsonify, current_app
 import jwt
 
+from utils.principal_cache import resolve_principal
+
+
+def decode_request_token():
+    """
+    Decode the request's Authorization JWT once per request.
+
+    The rate limiter identifies callers before the route runs and
+    token_required authenticates them; both share the result through g.
+
+    Returns:
+        dict: Verified JWT payload, or None if the token is missing or invalid.
+    """
+    if 'token_data' not in g:
+        token = request.headers.get('Authorization')
+        g.token_data = None
+        if token:
+            try:
+                token = token.split(' ')[1] if ' ' in token else token
+                g.token_data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
+            except jwt.PyJWTError:
+                pass
+    return g.token_data
+
 
 def token_required(f):
     """
     Decorator to require a valid JWT token for route access.
     
-    Extracts and validates the JWT token from the Authorization header.
-    Sets request.user_id and request.role for use in the route handler.
+    Extracts and validates the JWT token from the Authorization header and
+    resolves the caller's principal through the principal cache.
+    Sets request.user_id, request.role, request.owner_id, request.token_id
+    and request.principal for use in the route handler.
     
     Args:
         f: The route handler function to decorate.
@@ -23,16 +49,27 @@ def token_required(f):
     """
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = request.headers.get('Authorization')
-        if not token:
+        if not request.headers.get('Authorization'):
             return jsonify({'error': 'Token is missing'}), 401
+        data = decode_request_token()
+        if not data:
+            return jsonify({'error': 'Invalid token'}), 401
         try:
-            token = token.split(' ')[1] if ' ' in token else token
-            data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
-            request.user_id = data['user_id']
-            request.role = data['role']
+            principal = resolve_principal(data)
         except:
             return jsonify({'error': 'Invalid token'}), 401
+        
+        if not principal:
+            return jsonify({'error': 'Invalid token'}), 401
+        
+        if principal['status'] == 'blocked':
+            return jsonify({'error': 'Account is blocked'}), 403
+        
+        request.principal = principal
+        request.token_id = data.get('jti')
+        request.user_id = principal['user_id']
+        request.role = principal['role']
+        request.owner_id = principal['owner_id']
         return f(*args, **kwargs)
     return decorated
 
@@ -42,7 +79,8 @@ def owner_required(f):
     Decorator to require owner role for route access.
     
     Must be used after @token_required decorator.
-    Checks if the authenticated user has the 'owner' role.
+    Checks if the authenticated user has the 'owner' role and, for routes
+    scoped by an owner_id URL parameter, that it belongs to the caller.
     
     Args:
         f: The route handler function to decorate.
@@ -54,6 +92,8 @@ def owner_required(f):
     def decorated(*args, **kwargs):
         if request.role != 'owner':
             return jsonify({'error': 'Owner access required'}), 403
+        if 'owner_id' in kwargs and kwargs['owner_id'] != request.owner_id:
+            return jsonify({'error': 'Unauthorized'}), 403
         return f(*args, **kwargs)
     return decorated
 
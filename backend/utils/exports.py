@@ -0,0 +1,320 @@
+"""
+Streaming report exports (CSV / XLSX, optionally gzip-encoded).
+
+Rows are read through an unbuffered server-side cursor (PyMySQL SSCursor)
+and written out batch by batch from a generator, so an export of any size
+runs in constant memory and the first bytes go out as soon as MySQL
+returns the first rows. XLSX files are produced with the standard
+library's zipfile in streaming mode (inline strings, no shared string
+table), so no spreadsheet dependency is needed.
+"""
+import csv
+import io
+import re
+import zipfile
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+import pymysql
+from flask import Response, jsonify, stream_with_context
+
+from utils.db import get_db_connection
+
+BATCH_SIZE = 1000
+
+# dataset -> SELECT, date column, status column, owner scope condition, order column
+DATASETS = {
+    'bookings': {
+        'query': """
+            SELECT b.booking_id, b.created_at, b.event_date, b.slot, b.event_type,
+                   b.status, b.total_price, v.venue_id, v.name as venue_name,
+                   bcd.fullname as customer_name, bcd.email as customer_email,
+                   bcd.phone_primary as customer_phone
+            FROM bookings b
+            JOIN venues v ON b.venue_id = v.venue_id
+            LEFT JOIN booking_customer_details bcd ON b.booking_id = bcd.booking_id
+            WHERE 1=1
+        """,
+        'date_column': 'b.event_date',
+        'status_column': 'b.status',
+        'owner_scope': 'v.owner_id = %s',
+        'order_column': 'b.booking_id',
+    },
+    'payments': {
+        'query': """
+            SELECT bp.payment_id, bp.booking_id, bp.payment_date, bp.amount, bp.method,
+                   bp.payment_status, bp.trx_id, v.venue_id, v.name as venue_name,
+                   o.business_name as owner_name, bcd.fullname as customer_name
+            FROM booking_payments bp
+            JOIN bookings b ON bp.booking_id = b.booking_id
+            JOIN venues v ON b.venue_id = v.venue_id
+            JOIN owners o ON v.owner_id = o.owner_id
+            LEFT JOIN booking_customer_details bcd ON b.booking_id = bcd.booking_id
+            WHERE 1=1
+        """,
+        'date_column': 'bp.payment_date',
+        'status_column': 'bp.payment_status',
+        'owner_scope': 'v.owner_id = %s',
+        'order_column': 'bp.payment_id',
+    },
+    'reviews': {
+        'query': """
+            SELECT r.review_id, r.review_date, r.rating, r.review_text,
+                   v.venue_id, v.name as venue_name, u.name as user_name
+            FROM venue_reviews r
+            JOIN venues v ON r.venue_id = v.venue_id
+            JOIN users u ON r.user_id = u.user_id
+            WHERE 1=1
+        """,
+        'date_column': 'r.review_date',
+        'status_column': None,
+        'owner_scope': 'v.owner_id = %s',
+        'order_column': 'r.review_id',
+    },
+    'logs': {
+        'query': """
+            SELECT l.log_id, l.created_at, l.action_type, l.target_table, l.target_id,
+                   l.details, l.payload, l.action_by, l.actor_role, u.name as action_by_name
+            FROM logs l
+            LEFT JOIN users u ON l.action_by = u.user_id
+            WHERE 1=1
+        """,
+        'date_column': 'l.created_at',
+        'status_column': None,
+        'owner_scope': 'l.action_by = (SELECT user_id FROM owners WHERE owner_id = %s)',
+        'order_column': 'l.log_id',
+    },
+}
+
+FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+}
+
+
+def build_query(dataset, args, owner_id=None):
+    """
+    Build the export SELECT for a dataset from request filters.
+
+    Args:
+        dataset (str): Key of DATASETS.
+        args: Request args (date_from, date_to, status, venue_id).
+        owner_id (int, optional): Restrict to one owner's data.
+
+    Returns:
+        tuple: (query, params)
+    """
+    spec = DATASETS[dataset]
+    query = spec['query']
+    params = []
+
+    if owner_id is not None:
+        query += f" AND {spec['owner_scope']}"
+        params.append(owner_id)
+
+    venue_id = args.get('venue_id', type=int)
+    if venue_id and dataset != 'logs':
+        query += " AND v.venue_id = %s"
+        params.append(venue_id)
+
+    status = args.get('status')
+    if status and spec['status_column']:
+        query += f" AND {spec['status_column']} = %s"
+        params.append(status)
+
+    if args.get('date_from'):
+        query += f" AND {spec['date_column']} >= %s"
+        params.append(args.get('date_from'))
+
+    if args.get('date_to'):
+        query += f" AND {spec['date_column']} < DATE_ADD(%s, INTERVAL 1 DAY)"
+        params.append(args.get('date_to'))
+
+    query += f" ORDER BY {spec['order_column']}"
+    return query, params
+
+
+def iter_rows(query, params):
+    """
+    Yield the column names, then batches of row tuples, from an unbuffered cursor.
+
+    The connection is held open until the generator is exhausted or closed.
+    """
+    conn = get_db_connection(read_only=True)
+    cursor = conn.cursor(pymysql.cursors.SSCursor)
+    try:
+        cursor.execute(query, params)
+        yield [column[0] for column in cursor.description]
+        while True:
+            rows = cursor.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def csv_chunks(columns, batches):
+    """Encode batches of rows as UTF-8 CSV (with BOM, for Excel), one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(columns)
+    yield buffer.getvalue().encode('utf-8')
+
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+
+
+class _ChunkWriter(io.RawIOBase):
+    """Unseekable sink that collects what zipfile writes until drained."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+_XML_INVALID = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Report" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _xlsx_cell(value):
+    if value is None:
+        return '<c/>'
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    if isinstance(value, datetime):
+        value = value.strftime('%Y-%m-%d %H:%M:%S')
+    text = escape(_XML_INVALID.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values):
+    return '<row>' + ''.join(_xlsx_cell(value) for value in values) + '</row>'
+
+
+def xlsx_chunks(columns, batches):
+    """Encode batches of rows as a single-sheet XLSX workbook, one chunk per batch."""
+    sink = _ChunkWriter()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_PARTS.items():
+            archive.writestr(name, content)
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                '<sheetData>' + _xlsx_row(columns)
+            ).encode('utf-8'))
+            yield sink.drain()
+
+            for rows in batches:
+                sheet.write(''.join(_xlsx_row(row) for row in rows).encode('utf-8'))
+                yield sink.drain()
+
+            sheet.write(b'</sheetData></worksheet>')
+
+    yield sink.drain()
+
+
+def gzip_chunks(chunks):
+    """Gzip-compress a stream of byte chunks."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_response(dataset, args, owner_id=None):
+    """
+    Stream a dataset export as the response.
+
+    Query args: format=csv|xlsx (default csv), gzip=1 for Content-Encoding: gzip,
+    plus the build_query filters.
+
+    Args:
+        dataset (str): Key of DATASETS.
+        args: Request args.
+        owner_id (int, optional): Restrict to one owner's data.
+
+    Returns:
+        Response: Streaming response, or a JSON error for unknown dataset/format.
+    """
+    if dataset not in DATASETS:
+        return jsonify({'error': f"Unknown export '{dataset}'"}), 404
+
+    fmt = args.get('format', 'csv')
+    if fmt not in FORMATS:
+        return jsonify({'error': "format must be 'csv' or 'xlsx'"}), 400
+    mimetype, extension = FORMATS[fmt]
+
+    query, params = build_query(dataset, args, owner_id)
+    rows = iter_rows(query, params)
+    # Run the query now so database errors surface before any bytes are sent
+    columns = next(rows)
+
+    chunks = (csv_chunks if fmt == 'csv' else xlsx_chunks)(columns, rows)
+    headers = {
+        'Content-Disposition': f'attachment; filename="{dataset}_{datetime.now():%Y%m%d}.{extension}"',
+        'X-Accel-Buffering': 'no',
+    }
+    if args.get('gzip') in ('1', 'true'):
+        chunks = gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+
+    return Response(stream_with_context(chunks), headers=headers, content_type=mimetype)
@@ -0,0 +1,74 @@
+"""
+Sparse fieldsets (?fields=a,b,c) for listing routes.
+
+A route describes its row shape as an ordered {field: SQL expression}
+map. requested_fields() validates ?fields= against it, select_list()
+renders only the requested expressions (plus any the route itself needs,
+e.g. sort and cursor columns), and project() trims the fetched rows back
+to what was asked for, including fields the route adds after the query.
+"""
+
+
+class FieldSelectionError(ValueError):
+    """Raised when ?fields= names a field the route does not expose."""
+
+
+def requested_fields(args, allowed):
+    """
+    Parse ?fields= into a list of field names.
+
+    Args:
+        args: Request args.
+        allowed (iterable): Field names the route exposes.
+
+    Returns:
+        list: Requested fields, or None when ?fields= is absent (all fields).
+
+    Raises:
+        FieldSelectionError: If an unknown field is requested.
+    """
+    raw = args.get('fields')
+    if not raw:
+        return None
+
+    fields = [field.strip() for field in raw.split(',') if field.strip()]
+    allowed = set(allowed)
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise FieldSelectionError(f"Unknown field(s): {', '.join(unknown)}")
+    return fields
+
+
+def select_list(columns, fields, required=()):
+    """
+    Render the SELECT list for the requested fields.
+
+    Args:
+        columns (dict): Field name -> SQL expression, in output order.
+        fields (list): Requested fields, or None for all.
+        required (iterable): Fields selected regardless (used by the route itself).
+
+    Returns:
+        str: Comma-separated "expression as field" list.
+    """
+    wanted = None if fields is None else set(fields) | set(required)
+    return ',\n                   '.join(
+        f"{expression} as {name}" for name, expression in columns.items()
+        if wanted is None or name in wanted
+    )
+
+
+def wants(fields, *names):
+    """True if any of names is requested (always True without ?fields=)."""
+    return fields is None or any(name in fields for name in names)
+
+
+def project(rows, fields):
+    """Drop every key that was not requested from rows (no-op without ?fields=)."""
+    if fields is None:
+        return rows
+    keep = set(fields)
+    for row in rows:
+        for key in [key for key in row if key not in keep]:
+            del row[key]
+    return rows
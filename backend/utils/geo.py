@@ -0,0 +1,183 @@
+"""
+Geohash encoding and search areas for "near me" venue search.
+
+venues.geohash holds the GEOHASH_PRECISION-character geohash of the
+venue's coordinates, indexed together with status. Nearby venues share
+geohash prefixes, so a radius or bounding-box search turns into a few
+LIKE 'prefix%' index ranges (cover()), then a latitude/longitude box and,
+for a radius, the exact ST_Distance_Sphere check (area_conditions()).
+"""
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# ~5m cells
+GEOHASH_PRECISION = 9
+# A cover uses the longest prefixes for which at most this many cells span the area
+MAX_COVER_CELLS = 12
+
+KM_PER_DEGREE_LAT = 111.32
+
+DEFAULT_RADIUS_KM = 10
+MAX_RADIUS_KM = 500
+
+# Kilometres from the search centre; params: (longitude, latitude)
+DISTANCE_KM_SQL = "ST_Distance_Sphere(POINT(v.longitude, v.latitude), POINT(%s, %s)) / 1000"
+
+
+class InvalidArea(ValueError):
+    """Raised when ?lat=/?lng=/?radius_km=/?bbox= do not describe a search area."""
+
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Geohash of a point."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """(height, width) of a geohash cell in degrees."""
+    lng_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def radius_box(latitude, longitude, radius_km):
+    """(south, west, north, east) box enclosing a circle; longitudes span everything near the poles."""
+    lat_delta = radius_km / KM_PER_DEGREE_LAT
+    cos_lat = math.cos(math.radians(latitude))
+    lng_delta = 180.0 if cos_lat < 0.01 else min(radius_km / (KM_PER_DEGREE_LAT * cos_lat), 180.0)
+    return (max(latitude - lat_delta, -90.0), longitude - lng_delta,
+            min(latitude + lat_delta, 90.0), longitude + lng_delta)
+
+
+def cover(south, west, north, east):
+    """
+    Geohash prefixes whose cells together contain the box.
+
+    Returns:
+        list: Prefixes, or None when the box is too large (or crosses the
+            antimeridian) for a prefix filter to help.
+    """
+    if west < -180.0 or east > 180.0:
+        return None
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = math.floor(north / height) - math.floor(south / height) + 1
+        columns = math.floor(east / width) - math.floor(west / width) + 1
+        if rows * columns > MAX_COVER_CELLS:
+            continue
+
+        prefixes = set()
+        for row in range(rows):
+            latitude = min((math.floor(south / height) + row + 0.5) * height, 90.0)
+            for column in range(columns):
+                longitude = min((math.floor(west / width) + column + 0.5) * width, 180.0)
+                prefixes.add(encode(latitude, longitude, precision))
+        return sorted(prefixes)
+    return None
+
+
+
+# ----------------------------------------------------------------------------
+# SEARCH AREAS
+# ----------------------------------------------------------------------------
+
+def _number(value, name, low, high):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise InvalidArea(f"{name} must be a number")
+    if not low <= number <= high:
+        raise InvalidArea(f"{name} must be within {low:g}..{high:g}")
+    return number
+
+
+def parse_area(args):
+    """
+    Search area from ?lat=&lng=[&radius_km=] and/or ?bbox=south,west,north,east.
+
+    A bbox whose west edge is east of its east edge crosses the antimeridian.
+
+    Returns:
+        dict: center (lat, lng) or None, radius_km, boxes [(south, west, north, east)];
+            None when the request has no area.
+
+    Raises:
+        InvalidArea: If the parameters are malformed or out of range.
+    """
+    lat, lng, bbox = args.get('lat'), args.get('lng'), args.get('bbox')
+    if not (lat or lng or bbox):
+        return None
+
+    area = {'center': None, 'radius_km': None, 'boxes': []}
+    if lat or lng:
+        area['center'] = (_number(lat, 'lat', -90, 90), _number(lng, 'lng', -180, 180))
+        area['radius_km'] = _number(args.get('radius_km', DEFAULT_RADIUS_KM), 'radius_km', 0, MAX_RADIUS_KM)
+        area['boxes'].append(radius_box(*area['center'], area['radius_km']))
+
+    if bbox:
+        parts = bbox.split(',')
+        if len(parts) != 4:
+            raise InvalidArea('bbox must be south,west,north,east')
+        south, north = _number(parts[0], 'bbox south', -90, 90), _number(parts[2], 'bbox north', -90, 90)
+        west, east = _number(parts[1], 'bbox west', -180, 180), _number(parts[3], 'bbox east', -180, 180)
+        if south > north:
+            raise InvalidArea('bbox south must not be north of bbox north')
+        area['boxes'].append((south, west, north, east + 360 if west > east else east))
+    return area
+
+
+def longitude_ranges(west, east):
+    """[(low, high)] longitude ranges of a box, split where it crosses the antimeridian."""
+    if east - west >= 360:
+        return [(-180.0, 180.0)]
+    if west < -180:
+        return [(west + 360, 180.0), (-180.0, east)]
+    if east > 180:
+        return [(west, 180.0), (-180.0, east - 360)]
+    return [(west, east)]
+
+
+def area_conditions(area):
+    """
+    WHERE conditions restricting venues (aliased v) to an area.
+
+    Returns:
+        tuple: (SQL starting with " AND", params)
+    """
+    sql, params = "", []
+
+    prefixes = cover(*area['boxes'][0])
+    if prefixes:
+        sql += " AND (" + " OR ".join(["v.geohash LIKE %s"] * len(prefixes)) + ")"
+        params.extend(f"{prefix}%" for prefix in prefixes)
+
+    for south, west, north, east in area['boxes']:
+        sql += " AND v.latitude BETWEEN %s AND %s"
+        params.extend([south, north])
+        ranges = longitude_ranges(west, east)
+        sql += " AND (" + " OR ".join(["v.longitude BETWEEN %s AND %s"] * len(ranges)) + ")"
+        for low, high in ranges:
+            params.extend([low, high])
+
+    if area['center']:
+        sql += f" AND {DISTANCE_KM_SQL} <= %s"
+        params.extend([area['center'][1], area['center'][0], area['radius_km']])
+    return sql, params
@@ -0,0 +1,132 @@
+"""
+Geocoding for venue coordinates.
+
+add_venue/update_venue resolve a venue's address and city to latitude,
+longitude and geohash with locate(). Owners can also send the exact
+coordinates (a map pin), which are used as given. The backend is selected
+by GEOCODER:
+
+- 'offline' (default): city centroids plus a stable per-address offset.
+  It needs no network and suits development, tests and synthetic data.
+  Venues in a city get distinct, reproducible points near its centre.
+- 'nominatim': the OpenStreetMap Nominatim search API. It falls back to
+  the offline geocoder when the service fails or finds nothing.
+"""
+import hashlib
+import math
+
+import requests
+from flask import current_app
+
+from utils.geo import KM_PER_DEGREE_LAT, encode
+
+# (latitude, longitude) of city centres
+CITY_CENTROIDS = {
+    'karachi': (24.8607, 67.0011),
+    'lahore': (31.5204, 74.3587),
+    'islamabad': (33.6844, 73.0479),
+    'rawalpindi': (33.5651, 73.0169),
+    'faisalabad': (31.4504, 73.1350),
+    'multan': (30.1575, 71.5249),
+    'peshawar': (34.0151, 71.5249),
+    'hyderabad': (25.3960, 68.3578),
+    'quetta': (30.1798, 66.9750),
+    'sialkot': (32.4945, 74.5229),
+    'gujranwala': (32.1877, 74.1945),
+    'sukkur': (27.7052, 68.8574),
+    'bahawalpur': (29.3544, 71.6911),
+    'abbottabad': (34.1688, 73.2215),
+}
+
+# Offline points fall within this distance of the city centre
+OFFLINE_SPREAD_KM = 8.0
+
+NOMINATIM_URL = 'https://nominatim.openstreetmap.org/search'
+
+
+class OfflineGeocoder:
+    """City centroid plus a deterministic offset derived from the address."""
+
+    def geocode(self, address, city):
+        centre = CITY_CENTROIDS.get((city or '').strip().lower())
+        if not centre:
+            return None
+
+        digest = hashlib.sha1((address or '').strip().lower().encode('utf-8')).digest()
+        # sqrt keeps the points uniform over the disc instead of bunching at the centre
+        distance = OFFLINE_SPREAD_KM * math.sqrt(int.from_bytes(digest[:4], 'big') / 2 ** 32)
+        bearing = 2 * math.pi * int.from_bytes(digest[4:8], 'big') / 2 ** 32
+        latitude = centre[0] + distance * math.cos(bearing) / KM_PER_DEGREE_LAT
+        longitude = centre[1] + distance * math.sin(bearing) / (KM_PER_DEGREE_LAT * math.cos(math.radians(centre[0])))
+        return round(latitude, 6), round(longitude, 6)
+
+
+class NominatimGeocoder:
+    """OpenStreetMap Nominatim (https://nominatim.org/release-docs/latest/api/Search/)."""
+
+    def __init__(self, user_agent, country_codes, timeout):
+        self.user_agent = user_agent
+        self.country_codes = country_codes
+        self.timeout = timeout
+
+    def geocode(self, address, city):
+        query = ', '.join(part for part in (address, city) if part)
+        if not query:
+            return None
+        params = {'q': query, 'format': 'jsonv2', 'limit': 1}
+        if self.country_codes:
+            params['countrycodes'] = self.country_codes
+        try:
+            response = requests.get(NOMINATIM_URL, params=params, timeout=self.timeout,
+                                    headers={'User-Agent': self.user_agent})
+            response.raise_for_status()
+            results = response.json()
+        except (requests.RequestException, ValueError) as e:
+            print(f"Geocoding error: {str(e)}")
+            results = []
+        if results:
+            return round(float(results[0]['lat']), 6), round(float(results[0]['lon']), 6)
+        return OfflineGeocoder().geocode(address, city)
+
+
+def get_geocoder(app=None):
+    """Return the geocoder selected by GEOCODER ('offline' or 'nominatim')."""
+    config = (app or current_app).config
+    if config.get('GEOCODER') == 'nominatim':
+        return NominatimGeocoder(config['GEOCODER_USER_AGENT'], config.get('GEOCODER_COUNTRY_CODES'),
+                                 config.get('GEOCODER_TIMEOUT', 3.0))
+    return OfflineGeocoder()
+
+
+def parse_coordinates(latitude, longitude):
+    """
+    Validate explicit coordinates from a request.
+
+    Returns:
+        tuple: (latitude, longitude), or None if neither was given.
+
+    Raises:
+        ValueError: If only one is given or either is out of range.
+    """
+    if latitude in (None, '') and longitude in (None, ''):
+        return None
+    try:
+        latitude, longitude = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        raise ValueError('latitude and longitude must both be numbers')
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError('latitude must be within -90..90 and longitude within -180..180')
+    return round(latitude, 6), round(longitude, 6)
+
+
+def locate(address, city, coordinates=None, geocoder=None):
+    """
+    Coordinates for a venue: explicit ones if given, else geocoded.
+
+    Returns:
+        dict: latitude, longitude and geohash (all None if the place is unknown).
+    """
+    point = coordinates or (geocoder or get_geocoder()).geocode(address, city)
+    if not point:
+        return {'latitude': None, 'longitude': None, 'geohash': None}
+    return {'latitude': point[0], 'longitude': point[1], 'geohash': encode(*point)}
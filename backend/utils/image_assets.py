@@ -0,0 +1,128 @@
+"""
+Content-addressed image asset index.
+
+Every ingested image is identified by the SHA-256 of its bytes. The
+image_assets table maps that hash to the stored URL and its derivatives,
+so identical photos (re-uploads, seed reruns) reuse the stored asset
+instead of being uploaded again.
+"""
+import hashlib
+from io import BytesIO
+
+from utils.db import get_db_connection
+
+
+def content_hash(data):
+    """Return the SHA-256 hex digest of image bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def get_asset(asset_hash):
+    """
+    Look up a stored asset by content hash.
+
+    Returns:
+        dict: Row with url, thumb_url, card_url, full_url, or None.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT content_hash, url, thumb_url, card_url, full_url
+        FROM image_assets WHERE content_hash = %s
+    """, (asset_hash,))
+    asset = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    return asset
+
+
+def save_asset(asset_hash, url, variants):
+    """Record a newly stored asset. Concurrent inserts of the same hash keep the first."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT IGNORE INTO image_assets (content_hash, url, thumb_url, card_url, full_url)
+        VALUES (%s, %s, %s, %s, %s)
+    """, (asset_hash, url, variants.get('thumb'), variants.get('card'), variants.get('full')))
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+
+def ingest_image(storage, data, filename, folder, execute=None):
+    """
+    Store image bytes once per unique content.
+
+    Args:
+        storage: Storage backend from utils.image_utils.get_storage().
+        data (bytes): Image bytes.
+        filename (str): Original file name (used for the extension).
+        folder (str): Storage folder for new uploads.
+        execute (callable, optional): Runner for blocking storage calls,
+            e.g. eventlet.tpool.execute. Defaults to calling directly.
+
+    Returns:
+        dict: {'content_hash', 'url', 'variants', 'reused'}; url is None
+        if the upload failed.
+    """
+    execute = execute or (lambda func, *args: func(*args))
+    asset_hash = content_hash(data)
+
+    asset = get_asset(asset_hash)
+    if asset:
+        variants = {'thumb': asset['thumb_url'], 'card': asset['card_url'], 'full': asset['full_url']}
+        return {'content_hash': asset_hash, 'url': asset['url'], 'variants': variants, 'reused': True}
+
+    file_obj = BytesIO(data)
+    file_obj.name = filename
+    url = execute(storage.upload, file_obj, folder)
+    if not url:
+        return {'content_hash': asset_hash, 'url': None, 'variants': {}, 'reused': False}
+
+    variants = execute(storage.make_variants, url, data, folder)
+    save_asset(asset_hash, url, variants)
+    return {'content_hash': asset_hash, 'url': url, 'variants': variants, 'reused': False}
+
+
+def attach_to_venue(venue_id, asset):
+    """
+    Attach a stored asset to a venue and claim the cover slot if empty.
+
+    A photo the venue already has (same content hash) is not attached twice;
+    the UNIQUE (venue_id, content_hash) key makes that hold for concurrent
+    uploads too.
+
+    Args:
+        venue_id (int): Venue ID.
+        asset (dict): Result of ingest_image().
+
+    Returns:
+        tuple: (image_id, is_duplicate)
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    # On a duplicate, LAST_INSERT_ID(image_id) makes lastrowid the existing image
+    variants = asset['variants']
+    cursor.execute("""
+        INSERT INTO venue_images (venue_id, image_url, thumb_url, card_url, full_url, content_hash)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE image_id = LAST_INSERT_ID(image_id)
+    """, (venue_id, asset['url'], variants.get('thumb'), variants.get('card'),
+          variants.get('full'), asset['content_hash']))
+    if cursor.rowcount != 1:
+        image_id = cursor.lastrowid
+        conn.commit()
+        cursor.close()
+        conn.close()
+        return image_id, True
+
+    image_id = cursor.lastrowid
+    cursor.execute("""
+        UPDATE venues SET cover_image_id = %s
+        WHERE venue_id = %s AND cover_image_id IS NULL
+    """, (image_id, venue_id))
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return image_id, False
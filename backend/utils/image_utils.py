@@ -1,7 +1,14 @@
+import os
+import time
+import uuid
+from io import BytesIO
+
 import cloudinary
 import cloudinary.uploader
 from flask import current_app
 
+from utils.metrics import cloudinary_upload_duration
+
 def configure_cloudinary(app):
     cloudinary.config(
         cloud_name=app.config.get('CLOUDINARY_CLOUD_NAME'),
@@ -9,22 +16,153 @@ def configure_cloudinary(app):
         api_secret=app.config.get('CLOUDINARY_API_SECRET')
     )
 
+
+# Responsive derivatives generated for every venue image: name -> (max width, max height)
+IMAGE_VARIANTS = {
+    'thumb': (160, 120),
+    'card': (480, 360),
+    'full': (1600, 1200),
+}
+
+
+def build_srcset(thumb_url, card_url, full_url):
+    """Build an HTML srcset string from the derivative URLs that exist."""
+    candidates = [(thumb_url, IMAGE_VARIANTS['thumb'][0]),
+                  (card_url, IMAGE_VARIANTS['card'][0]),
+                  (full_url, IMAGE_VARIANTS['full'][0])]
+    return ', '.join(f"{url} {width}w" for url, width in candidates if url) or None
+
+
+# SELECT list fragment for listing queries that LEFT JOIN venue_images ci ON ci.image_id = v.cover_image_id
+COVER_IMAGE_COLUMNS = """ci.image_url as cover_url, ci.thumb_url as cover_thumb_url,
+                   ci.card_url as cover_card_url, ci.full_url as cover_full_url"""
+
+# Response fields produced by apply_cover_image (for ?fields= projections)
+COVER_IMAGE_FIELDS = ('image_url', 'image_thumb_url', 'image_srcset')
+
+
+def apply_cover_image(row):
+    """
+    Replace the cover_* columns of a listing row with the small card image,
+    a thumbnail and srcset data for responsive <img> tags.
+    """
+    original = row.pop('cover_url', None)
+    thumb_url = row.pop('cover_thumb_url', None)
+    card_url = row.pop('cover_card_url', None)
+    full_url = row.pop('cover_full_url', None)
+
+    row['image_url'] = card_url or original
+    row['image_thumb_url'] = thumb_url or original
+    row['image_srcset'] = build_srcset(thumb_url, card_url, full_url or original)
+    return row
+
+
+class CloudinaryStorage:
+    """Stores images on Cloudinary (production backend)."""
+
+    def upload(self, file_obj, folder):
+        started = time.perf_counter()
+        outcome = 'error'
+        try:
+            upload_result = cloudinary.uploader.upload(
+                file_obj,
+                folder=folder,
+                resource_type="auto"
+            )
+            outcome = 'ok'
+        finally:
+            cloudinary_upload_duration.observe(time.perf_counter() - started, outcome)
+        return upload_result.get('secure_url')
+
+    def make_variants(self, url, data=None, folder=None):
+        """Derivatives are Cloudinary transformation URLs, rendered on first request."""
+        return {name: cloudinary_variant_url(url, name) for name in IMAGE_VARIANTS}
+
+
+def cloudinary_variant_url(url, variant):
+    """Insert a resize + auto format/quality transformation into a Cloudinary URL."""
+    if not url or '/upload/' not in url:
+        return url
+    width, height = IMAGE_VARIANTS[variant]
+    crop = 'c_limit' if variant == 'full' else 'c_fill'
+    return url.replace('/upload/', f"/upload/{crop},w_{width},h_{height},f_auto,q_auto/", 1)
+
+
+class LocalStorage:
+    """
+    Stores images on the local filesystem under IMAGE_LOCAL_ROOT.
+    Used for development and as a stand-in for Cloudinary in tests.
+    """
+
+    def __init__(self, root, base_url):
+        self.root = root
+        self.base_url = base_url.rstrip('/')
+
+    def upload(self, file_obj, folder):
+        if isinstance(file_obj, str):
+            name = os.path.basename(file_obj)
+            with open(file_obj, 'rb') as f:
+                data = f.read()
+        else:
+            name = getattr(file_obj, 'filename', None) or getattr(file_obj, 'name', None) or 'image'
+            data = file_obj.read()
+
+        ext = os.path.splitext(name)[1].lower() or '.jpg'
+        filename = f"{uuid.uuid4().hex}{ext}"
+        target_dir = os.path.join(self.root, folder)
+        os.makedirs(target_dir, exist_ok=True)
+
+        with open(os.path.join(target_dir, filename), 'wb') as f:
+            f.write(data)
+
+        return f"{self.base_url}/{folder}/{filename}"
+
+    def make_variants(self, url, data, folder):
+        """Generate WebP derivatives with Pillow; falls back to the original URL."""
+        try:
+            from PIL import Image
+        except ImportError:
+            return {name: url for name in IMAGE_VARIANTS}
+
+        stem = os.path.splitext(os.path.basename(url))[0]
+        target_dir = os.path.join(self.root, folder)
+        variants = {}
+
+        try:
+            with Image.open(BytesIO(data)) as original:
+                original = original.convert('RGB')
+                for name, size in IMAGE_VARIANTS.items():
+                    image = original.copy()
+                    image.thumbnail(size)
+                    filename = f"{stem}_{name}.webp"
+                    image.save(os.path.join(target_dir, filename), 'WEBP', quality=80, method=4)
+                    variants[name] = f"{self.base_url}/{folder}/{filename}"
+        except Exception as e:
+            print(f"Image derivative error: {str(e)}")
+            return {name: url for name in IMAGE_VARIANTS}
+
+        return variants
+
+
+def get_storage(app=None):
+    """Return the storage backend selected by IMAGE_STORAGE ('cloudinary' or 'local')."""
+    config = (app or current_app).config
+    if config.get('IMAGE_STORAGE') == 'local':
+        return LocalStorage(config['IMAGE_LOCAL_ROOT'], config['IMAGE_LOCAL_URL'])
+    return CloudinaryStorage()
+
+
 def upload_image(file_obj, folder="venues"):
     """
-    Uploads a file object to Cloudinary.
-    Returns the secure_url of the uploaded image or None if failed.
+    Uploads a file object to the configured image storage.
+    Returns the URL of the uploaded image or None if failed.
     """
     if not file_obj:
         return None
-    
+
     try:
-        upload_result = cloudinary.uploader.upload(
-            file_obj,
-            folder=folder,
-            resource_type="auto"
-        )
-        return upload_result.get('secure_url')
+        return get_storage().upload(file_obj, folder)
     except Exception as e:
-        print(f"Cloudinary upload error: {str(e)}")
-        # In production, use current_app.logger.error(f"Cloudinary upload error: {str(e)}")
+        print(f"Image upload error: {str(e)}")
+        # In production, use current_app.logger.error(f"Image upload error: {str(e)}")
         return None
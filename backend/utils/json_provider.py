@@ -0,0 +1,37 @@
+"""
+orjson-backed JSON provider for jsonify().
+
+Serializes datetimes and dates natively in C (ISO 8601; naive values are
+UTC, as Flask's default provider already assumes), keeps Decimal as a
+string like the default provider, and sorts keys so responses stay
+byte-for-byte stable. Decoding (request.json) is also done by orjson.
+"""
+import decimal
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+
+def _default(value):
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return DefaultJSONProvider.default(value)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Drop-in replacement for Flask's default JSON provider."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=OPTIONS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=OPTIONS) + b'\n',
+            mimetype=self.mimetype
+        )
@@ -0,0 +1,101 @@
+"""
+Paginated listings with filter-wide totals.
+
+Admin listings show the total row count and a money total for the whole
+filter set next to every page. fetch_page() computes both in the same
+pass as the first page it serves (COUNT/SUM window functions over the
+filtered rows) and keeps them in a small in-process TTL memo keyed by the
+listing name and filter tuple, so later pages of the same filter only run
+the page query. Totals can therefore lag writes by up to
+LISTING_TOTALS_TTL seconds.
+"""
+import threading
+import time
+
+from flask import current_app
+
+_lock = threading.Lock()
+
+# {(listing, filters): (expires_at, total, amount)}
+_totals = {}
+
+
+def _lookup(key, now):
+    with _lock:
+        cached = _totals.get(key)
+    if cached and cached[0] > now:
+        return cached[1], cached[2]
+    return None
+
+
+def _store(key, total, amount, now):
+    ttl = current_app.config.get('LISTING_TOTALS_TTL', 30)
+    max_size = current_app.config.get('LISTING_TOTALS_SIZE', 1000)
+
+    with _lock:
+        if len(_totals) >= max_size:
+            for stale in [k for k, entry in _totals.items() if entry[0] <= now]:
+                del _totals[stale]
+            if len(_totals) >= max_size:
+                del _totals[next(iter(_totals))]
+        _totals[key] = (now + ttl, total, amount)
+
+
+def fetch_page(cursor, key, query, params, sum_column, order_column, page, per_page):
+    """
+    Run a filtered listing query for one page, with filter-wide totals.
+
+    Args:
+        cursor: Database cursor.
+        key (tuple): Listing name plus every filter value that shapes the query.
+        query (str): Filtered SELECT without ORDER BY/LIMIT.
+        params (list): Parameters for query.
+        sum_column (str): Selected column to total (e.g. 'total_price'), or None.
+        order_column (str): Selected column to sort by, descending.
+        page (int): 1-based page number.
+        per_page (int): Page size.
+
+    Returns:
+        tuple: (rows, total row count, sum of sum_column or 0)
+    """
+    now = time.time()
+    amount_window = f"SUM(listing.{sum_column}) OVER ()" if sum_column else "0"
+    amount_total = f"SUM({sum_column})" if sum_column else "0"
+    offset = max(page - 1, 0) * per_page
+    cached = _lookup(key, now)
+
+    if cached:
+        cursor.execute(f"""
+            SELECT * FROM ({query}) as listing
+            ORDER BY listing.{order_column} DESC
+            LIMIT %s OFFSET %s
+        """, [*params, per_page, offset])
+        return cursor.fetchall(), cached[0], cached[1]
+
+    # Count, total and page in one pass over the filtered rows
+    cursor.execute(f"""
+        SELECT listing.*,
+               COUNT(*) OVER () as _listing_total,
+               COALESCE({amount_window}, 0) as _listing_amount
+        FROM ({query}) as listing
+        ORDER BY listing.{order_column} DESC
+        LIMIT %s OFFSET %s
+    """, [*params, per_page, offset])
+    rows = cursor.fetchall()
+
+    if rows:
+        total, amount = rows[0]['_listing_total'], rows[0]['_listing_amount']
+        for row in rows:
+            del row['_listing_total']
+            del row['_listing_amount']
+    else:
+        # Page past the end (or no matches): the window had no rows to report on
+        cursor.execute(f"""
+            SELECT COUNT(*) as total, COALESCE({amount_total}, 0) as amount
+            FROM ({query}) as listing
+        """, params)
+        result = cursor.fetchone()
+        total, amount = result['total'], result['amount']
+
+    _store(key, total, amount, now)
+    return rows, total, amount
@@ -0,0 +1,245 @@
+"""
+Monthly partitions, retention and cold archive for the logs table.
+
+logs is RANGE-partitioned by month on UNIX_TIMESTAMP(created_at), one
+partition pYYYYMM per month plus a catch-all pmax. scripts/rotate_logs.py
+(run monthly, e.g. from cron) keeps partitions ready ahead of time and
+moves partitions older than LOG_RETENTION_MONTHS to compressed JSONL
+files (LOG_ARCHIVE_DIR/logs_YYYY-MM.jsonl.gz) before dropping them, so
+the live table only ever holds the hot months. The admin log viewer reads
+the archive only when asked (?archived=1), for a bounded date range.
+
+Archive files hold their rows newest first, so a page of archived logs is
+read by streaming lines until it is filled. Each file has a
+logs_YYYY-MM.meta.json sidecar with its row count.
+"""
+import gzip
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+
+import pymysql
+
+PARTITION_PREFIX = 'p'
+CATCH_ALL = 'pmax'
+ARCHIVE_PATTERN = 'logs_{:04d}-{:02d}.jsonl.gz'
+META_SUFFIX = '.meta.json'
+
+
+def _month_add(month, count):
+    """Shift a (year, month) tuple by count months."""
+    index = month[0] * 12 + month[1] - 1 + count
+    return index // 12, index % 12 + 1
+
+
+def _partition_name(month):
+    return f"{PARTITION_PREFIX}{month[0]:04d}{month[1]:02d}"
+
+
+def _partition_month(name):
+    """(year, month) for a pYYYYMM partition name, or None for pmax."""
+    if name == CATCH_ALL:
+        return None
+    return int(name[1:5]), int(name[5:7])
+
+
+def _partition_sql(month):
+    upper = _month_add(month, 1)
+    return (f"PARTITION {_partition_name(month)} VALUES LESS THAN "
+            f"(UNIX_TIMESTAMP('{upper[0]:04d}-{upper[1]:02d}-01 00:00:00'))")
+
+
+def list_partitions(cursor):
+    """Return [(partition name, estimated rows)] for logs, oldest first."""
+    cursor.execute("""
+        SELECT partition_name as name, table_rows as row_count
+        FROM information_schema.partitions
+        WHERE table_schema = DATABASE() AND table_name = 'logs'
+          AND partition_name IS NOT NULL
+        ORDER BY partition_ordinal_position
+    """)
+    return [(row['name'], row['row_count']) for row in cursor.fetchall()]
+
+
+def partition_table(cursor):
+    """
+    Partition logs by month (initial conversion).
+
+    Covers every month from the oldest log row up to ensure_partitions'
+    look-ahead. No-op if the table is already partitioned.
+    """
+    if list_partitions(cursor):
+        return
+    cursor.execute(f"""
+        ALTER TABLE logs PARTITION BY RANGE (UNIX_TIMESTAMP(created_at)) (
+            PARTITION {CATCH_ALL} VALUES LESS THAN MAXVALUE
+        )
+    """)
+    ensure_partitions(cursor)
+
+
+def ensure_partitions(cursor, months_ahead=2):
+    """
+    Split pmax so that every month up to months_ahead from now has its own partition.
+
+    Returns:
+        list: Names of the partitions created.
+    """
+    months = [_partition_month(name) for name, _ in list_partitions(cursor)]
+    months = [month for month in months if month]
+
+    today = date.today()
+    last = _month_add((today.year, today.month), months_ahead)
+
+    if months:
+        start = _month_add(max(months), 1)
+    else:
+        cursor.execute("SELECT MIN(created_at) as oldest FROM logs")
+        oldest = cursor.fetchone()['oldest'] or today
+        start = (oldest.year, oldest.month)
+
+    new_months = []
+    month = start
+    while month <= last:
+        new_months.append(month)
+        month = _month_add(month, 1)
+
+    if new_months:
+        cursor.execute(f"""
+            ALTER TABLE logs REORGANIZE PARTITION {CATCH_ALL} INTO (
+                {', '.join(_partition_sql(month) for month in new_months)},
+                PARTITION {CATCH_ALL} VALUES LESS THAN MAXVALUE
+            )
+        """)
+    return [_partition_name(month) for month in new_months]
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat(sep=' ') if isinstance(value, datetime) else value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Unserializable value {value!r}")
+
+
+def archive_partition(conn, name, directory):
+    """
+    Write one partition to directory/logs_YYYY-MM.jsonl.gz (newest row
+    first), then drop it.
+
+    The file and its meta sidecar are written under temporary names and
+    renamed once complete, and the partition is only dropped after that,
+    so an interrupted run can simply be repeated.
+
+    Returns:
+        tuple: (archive path, rows archived)
+    """
+    year, month = _partition_month(name)
+    path = os.path.join(directory, ARCHIVE_PATTERN.format(year, month))
+    os.makedirs(directory, exist_ok=True)
+
+    rows = 0
+    stream = conn.cursor(pymysql.cursors.SSDictCursor)
+    try:
+        stream.execute(f"SELECT * FROM logs PARTITION ({name}) ORDER BY log_id DESC")
+        with gzip.open(path + '.tmp', 'wt', encoding='utf-8') as archive:
+            for row in stream:
+                archive.write(json.dumps(row, default=_json_default) + '\n')
+                rows += 1
+    finally:
+        stream.close()
+    meta_path = path[:-len('.jsonl.gz')] + META_SUFFIX
+    with open(meta_path + '.tmp', 'w', encoding='utf-8') as meta:
+        json.dump({'rows': rows}, meta)
+    os.replace(meta_path + '.tmp', meta_path)
+    os.replace(path + '.tmp', path)
+
+    cursor = conn.cursor()
+    cursor.execute(f"ALTER TABLE logs DROP PARTITION {name}")
+    cursor.close()
+    return path, rows
+
+
+def apply_retention(conn, retention_months, directory):
+    """
+    Archive and drop every monthly partition older than retention_months.
+
+    Returns:
+        list: [(partition name, archive path, rows)]
+    """
+    today = date.today()
+    cutoff = _month_add((today.year, today.month), -retention_months)
+
+    cursor = conn.cursor()
+    partitions = list_partitions(cursor)
+    cursor.close()
+
+    archived = []
+    for name, _ in partitions:
+        month = _partition_month(name)
+        if month and month < cutoff:
+            path, rows = archive_partition(conn, name, directory)
+            archived.append((name, path, rows))
+    return archived
+
+
+def archived_months(directory, date_from=None, date_to=None):
+    """Archive files overlapping [date_from, date_to] (YYYY-MM-DD strings), newest first."""
+    if not os.path.isdir(directory):
+        return []
+    first = date_from[:7] if date_from else '0000-00'
+    last = date_to[:7] if date_to else '9999-99'
+
+    files = []
+    for filename in os.listdir(directory):
+        if filename.startswith('logs_') and filename.endswith('.jsonl.gz'):
+            month = filename[5:12]
+            if first <= month <= last:
+                files.append(os.path.join(directory, filename))
+    return sorted(files, reverse=True)
+
+
+def _rows(path):
+    """Yield the rows of one archive file (stored newest first)."""
+    with gzip.open(path, 'rt', encoding='utf-8') as archive:
+        for line in archive:
+            yield json.loads(line)
+
+
+def read_archive(directory, filters, date_from, date_to, offset, limit):
+    """
+    Page of archived log rows matching filters, newest first.
+
+    Lines are streamed and reading stops as soon as the page is filled,
+    so the cost depends on the page and the date range, not the archive size.
+
+    Args:
+        directory (str): Archive directory.
+        filters (dict): Column -> required value (compared as strings).
+        date_from (str): Inclusive lower bound on created_at.
+        date_to (str): Inclusive upper bound on created_at.
+        offset (int): Matching rows to skip.
+        limit (int): Rows to return.
+
+    Returns:
+        tuple: (rows, True if more rows match after them)
+    """
+    rows = []
+    skipped = 0
+    for path in archived_months(directory, date_from, date_to):
+        for row in _rows(path):
+            created_at = row.get('created_at') or ''
+            if date_from and created_at < date_from:
+                continue
+            if date_to and created_at > date_to:
+                continue
+            if not all(str(row.get(column)) == str(value) for column, value in filters.items()):
+                continue
+            if skipped < offset:
+                skipped += 1
+            elif len(rows) < limit:
+                rows.append(row)
+            else:
+                return rows, True
+    return rows, False
@@ -4,10 +4,43 @@ Logging utility functions for VenueBook
 Provides centralized logging for all system activities
 """
 
+import json
+
+from flask import request, has_request_context
+
 from utils.db import get_db_connection
 from datetime import datetime
 
-def log_action(action_by, action_type, target_table, details):
+def insert_log(cursor, entry, created_at=None):
+    """
+    Insert a log entry built by log_action (the caller commits)
+    
+    Args:
+        created_at (datetime, optional): When the action happened; defaults to now.
+            Entries delivered through the outbox pass the time they were queued.
+    
+    Returns:
+        int: log_id of the created entry
+    """
+    cursor.execute("""
+        INSERT INTO logs (action_by, actor_role, action_type, target_table, target_id, details, payload,
+                          created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, COALESCE(%s, CURRENT_TIMESTAMP))
+    """, (
+        entry['action_by'],
+        entry['actor_role'],
+        entry['action_type'],
+        entry['target_table'],
+        entry['target_id'],
+        entry['details'],
+        json.dumps(entry['payload'], default=str) if entry['payload'] is not None else None,
+        created_at
+    ))
+    return cursor.lastrowid
+
+
+def log_action(action_by, action_type, target_table, details, target_id=None, payload=None, actor_role=None,
+               cursor=None):
     """
     Main logging function to record all system activities
     
@@ -16,54 +49,83 @@ def log_action(action_by, action_type, target_table, details):
         action_type (str): Type of action (create, update, delete, login, etc.)
         target_table (str): Database table affected
         details (str): Detailed description of the action
+        target_id (int, optional): Primary key of the affected row in target_table
+        payload (dict, optional): Structured data about the change (stored as JSON)
+        actor_role (str, optional): Role of the actor; defaults to the authenticated
+            request's role, or 'system' outside a request
+        cursor (optional): Cursor of the transaction making the change; the entry is
+            then queued in the outbox and written only if that transaction commits
     
     Returns:
-        int: log_id of created log entry, or None if failed
+        int: log_id of created log entry, or None if failed or queued
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        if actor_role is None:
+            actor_role = getattr(request, 'role', None) if has_request_context() else 'system'
         
-        query = """
-            INSERT INTO logs (action_by, action_type, target_table, details)
-            VALUES (%s, %s, %s, %s)
-        """
+        entry = {
+            'action_by': action_by,
+            'actor_role': actor_role,
+            # Convert action_type to uppercase
+            'action_type': action_type.upper() if action_type else None,
+            'target_table': target_table,
+            'target_id': target_id,
+            'details': details,
+            'payload': payload
+        }
         
-        # Convert action_type to uppercase
-        cursor.execute(query, (action_by, action_type.upper() if action_type else None, target_table, details))
-        conn.commit()
+        if cursor is not None:
+            from utils.outbox import enqueue
+            enqueue(cursor, 'audit_log', entry)
+            return None
         
-        log_id = cursor.lastrowid
+        conn = get_db_connection()
+        log_cursor = conn.cursor()
+        log_id = insert_log(log_cursor, entry)
+        conn.commit()
         
-        cursor.close()
+        log_cursor.close()
         conn.close()
         
         return log_id
         
     except Exception as e:
+        if cursor is not None:
+            # Queued inside the caller's transaction: let the caller roll back
+            raise
         print(f"Error logging action: {str(e)}")
         return None
 
 
-def log_login(user_id, email, success=True):
+def decode_payloads(rows):
+    """Parse the JSON payload column of fetched log rows in place."""
+    for row in rows:
+        if isinstance(row.get('payload'), str):
+            row['payload'] = json.loads(row['payload'])
+    return rows
+
+
+def log_login(user_id, email, success=True, role=None):
     """Log user login attempts"""
     details = f"User {email} {'successfully logged in' if success else 'failed login attempt'}"
-    return log_action(user_id if success else None, 'login', 'users', details)
+    return log_action(user_id if success else None, 'login', 'users', details,
+                      target_id=user_id, payload={'email': email, 'success': success}, actor_role=role)
 
 
 def log_signup(user_id, email, role):
     """Log new user registration"""
     details = f"New {role} account created: {email}"
-    return log_action(user_id, 'create', 'users', details)
+    return log_action(user_id, 'create', 'users', details,
+                      target_id=user_id, payload={'email': email, 'role': role}, actor_role=role)
 
 
 def log_logout(user_id, email):
     """Log user logout"""
     details = f"User {email} logged out"
-    return log_action(user_id, 'logout', 'users', details)
+    return log_action(user_id, 'logout', 'users', details, target_id=user_id)
 
 
-def log_booking_action(user_id, action_type, booking_id, details):
+def log_booking_action(user_id, action_type, booking_id, details, payload=None, cursor=None):
     """
     Log booking-related actions
     
@@ -72,11 +134,14 @@ def log_booking_action(user_id, action_type, booking_id, details):
         action_type (str): create, update, delete, cancel
         booking_id (int): Booking ID
         details (str): Action details
+        payload (dict, optional): Structured change data
+        cursor (optional): Queue through the outbox of this transaction (see log_action)
     """
-    return log_action(user_id, action_type, 'bookings', f"Booking #{booking_id}: {details}")
+    return log_action(user_id, action_type, 'bookings', f"Booking #{booking_id}: {details}",
+                      target_id=booking_id, payload=payload, cursor=cursor)
 
 
-def log_venue_action(user_id, action_type, venue_id, details):
+def log_venue_action(user_id, action_type, venue_id, details, payload=None, cursor=None):
     """
     Log venue-related actions
     
@@ -85,21 +150,26 @@ def log_venue_action(user_id, action_type, venue_id, details):
         action_type (str): create, update, delete
         venue_id (int): Venue ID
         details (str): Action details
+        payload (dict, optional): Structured change data
+        cursor (optional): Queue through the outbox of this transaction (see log_action)
     """
-    return log_action(user_id, action_type, 'venues', f"Venue #{venue_id}: {details}")
+    return log_action(user_id, action_type, 'venues', f"Venue #{venue_id}: {details}",
+                      target_id=venue_id, payload=payload, cursor=cursor)
 
 
-def log_payment_action(user_id, action_type, payment_id, details):
+def log_payment_action(user_id, action_type, payment_id, details, payload=None, cursor=None):
     """Log payment-related actions"""
-    return log_action(user_id, action_type, 'payments', f"Payment #{payment_id}: {details}")
+    return log_action(user_id, action_type, 'payments', f"Payment #{payment_id}: {details}",
+                      target_id=payment_id, payload=payload, cursor=cursor)
 
 
-def log_review_action(user_id, action_type, review_id, details):
+def log_review_action(user_id, action_type, review_id, details, payload=None, cursor=None):
     """Log review-related actions"""
-    return log_action(user_id, action_type, 'venue_reviews', f"Review #{review_id}: {details}")
+    return log_action(user_id, action_type, 'venue_reviews', f"Review #{review_id}: {details}",
+                      target_id=review_id, payload=payload, cursor=cursor)
 
 
-def log_admin_action(admin_id, action_type, target_table, details):
+def log_admin_action(admin_id, action_type, target_table, details, target_id=None, payload=None, cursor=None):
     """
     Log administrative actions
     
@@ -108,5 +178,9 @@ def log_admin_action(admin_id, action_type, target_table, details):
         action_type (str): Action type
         target_table (str): Table affected
         details (str): Action details
+        target_id (int, optional): Affected row
+        payload (dict, optional): Structured change data
+        cursor (optional): Queue through the outbox of this transaction (see log_action)
     """
-    return log_action(admin_id, action_type, target_table, f"Admin action: {details}")
+    return log_action(admin_id, action_type, target_table, f"Admin action: {details}",
+                      target_id=target_id, payload=payload, actor_role='admin', cursor=cursor)
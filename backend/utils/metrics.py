@@ -0,0 +1,258 @@
+"""
+Prometheus metrics.
+
+A small in-process registry rendered in the Prometheus text exposition
+format at /metrics. It covers:
+
+- HTTP request latency histograms and status code counters per
+  blueprint/endpoint, requests in flight, and DB time (for requests sampled
+  by utils.query_stats),
+- Socket.IO event counts and handler latency, plus connected user/session
+  gauges read from socket_handlers.connected_users at scrape time,
+- Groq call latency and token counts,
+- Cloudinary upload durations.
+
+Recording an observation is a couple of dict lookups and integer
+increments under a native lock (safe for eventlet's native thread pool).
+Label values must come from bounded sets (endpoint names, event names),
+never from user input.
+"""
+import time
+from bisect import bisect_left
+from functools import wraps
+
+from eventlet import patcher
+from flask import Response, current_app, g, request
+
+# A real OS lock: observations also come from eventlet.tpool threads
+_lock = patcher.original('threading').Lock()
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_metrics = []
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values = {} if labelnames else {(): 0}
+        _metrics.append(self)
+
+    def inc(self, *labels, amount=1):
+        with _lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        return [(self.name, list(zip(self.labelnames, labels)), value) for labels, value in self.values.items()]
+
+    type = 'counter'
+
+
+class Gauge(Counter):
+    """Gauge set directly (inc/dec) or computed at scrape time by a callback returning {labels: value}."""
+
+    type = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def samples(self):
+        if self.callback:
+            self.values = self.callback()
+        return super().samples()
+
+
+class Histogram:
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self.values = {}
+        _metrics.append(self)
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with _lock:
+            series = self.values.get(labels)
+            if series is None:
+                series = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        samples = []
+        for labels, (counts, total, count) in self.values.items():
+            pairs = list(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                samples.append((f"{self.name}_bucket", pairs + [('le', le)], cumulative))
+            samples.append((f"{self.name}_sum", pairs, total))
+            samples.append((f"{self.name}_count", pairs, count))
+        return samples
+
+
+# ----------------------------------------------------------------------------
+# METRIC DEFINITIONS
+# ----------------------------------------------------------------------------
+
+http_request_duration = Histogram(
+    'venuebook_http_request_duration_seconds', 'HTTP request latency.',
+    ('blueprint', 'endpoint', 'method'))
+http_requests = Counter(
+    'venuebook_http_requests_total', 'HTTP requests by status code.',
+    ('blueprint', 'endpoint', 'method', 'status'))
+http_requests_in_flight = Gauge(
+    'venuebook_http_requests_in_flight', 'HTTP requests currently being served.')
+http_request_db_duration = Histogram(
+    'venuebook_http_request_db_seconds', 'DB time per request (requests sampled by SQL instrumentation).',
+    ('blueprint', 'endpoint'))
+http_requests_rejected = Counter(
+    'venuebook_http_requests_rejected_total', 'Requests refused by rate limiting or load shedding.',
+    ('class', 'reason'))
+http_request_queries = Counter(
+    'venuebook_http_request_queries_total', 'SQL statements run by sampled requests.',
+    ('blueprint', 'endpoint'))
+
+socketio_events = Counter(
+    'venuebook_socketio_events_total', 'Socket.IO events handled.', ('event', 'outcome'))
+socketio_event_duration = Histogram(
+    'venuebook_socketio_event_duration_seconds', 'Socket.IO handler latency.', ('event',))
+
+groq_request_duration = Histogram(
+    'venuebook_groq_request_duration_seconds', 'Groq chat completion latency.',
+    ('call', 'outcome'), buckets=SLOW_BUCKETS)
+groq_tokens = Counter(
+    'venuebook_groq_tokens_total', 'Groq tokens used.', ('call', 'kind'))
+
+cloudinary_upload_duration = Histogram(
+    'venuebook_cloudinary_upload_duration_seconds', 'Cloudinary upload latency.',
+    ('outcome',), buckets=SLOW_BUCKETS)
+
+
+def _connected_users():
+    from socket_handlers import connected_users
+    sessions = sum(len(sids) for sids in list(connected_users.values()))
+    return {('users',): len(connected_users), ('sessions',): sessions}
+
+
+socketio_connected = Gauge(
+    'venuebook_socketio_connected', 'Connected Socket.IO users and sessions.', ('kind',),
+    callback=_connected_users)
+
+
+# ----------------------------------------------------------------------------
+# INSTRUMENTATION HELPERS
+# ----------------------------------------------------------------------------
+
+def track_socket_event(event):
+    """Decorator counting and timing a Socket.IO event handler."""
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = 'error'
+            try:
+                result = f(*args, **kwargs)
+                outcome = 'ok'
+                return result
+            finally:
+                socketio_event_duration.observe(time.perf_counter() - started, event)
+                socketio_events.inc(event, outcome)
+        return decorated
+    return decorator
+
+
+def observe_groq_completion(call, started, completion=None):
+    """Record a Groq chat completion started at `started` (perf_counter); completion is None on failure."""
+    outcome = 'ok' if completion is not None else 'error'
+    groq_request_duration.observe(time.perf_counter() - started, call, outcome)
+    usage = getattr(completion, 'usage', None)
+    if usage:
+        groq_tokens.inc(call, 'prompt', amount=usage.prompt_tokens or 0)
+        groq_tokens.inc(call, 'completion', amount=usage.completion_tokens or 0)
+
+
+# ----------------------------------------------------------------------------
+# FLASK INTEGRATION
+# ----------------------------------------------------------------------------
+
+def _request_labels():
+    return (request.blueprint or '', request.endpoint or 'unmatched')
+
+
+def start_request():
+    if request.endpoint == 'metrics':
+        return
+    g.metrics_started = time.perf_counter()
+    http_requests_in_flight.inc()
+
+
+def record_status(response):
+    g.metrics_status = response.status_code
+    return response
+
+
+def finish_request(exc=None):
+    started = g.pop('metrics_started', None)
+    if started is None:
+        return
+    http_requests_in_flight.dec()
+
+    blueprint, endpoint = _request_labels()
+    http_request_duration.observe(time.perf_counter() - started, blueprint, endpoint, request.method)
+    http_requests.inc(blueprint, endpoint, request.method, str(g.get('metrics_status', 500)))
+
+    sql_stats = g.get('sql_stats')
+    if sql_stats is not None:
+        http_request_db_duration.observe(sql_stats['db_ms'] / 1000, blueprint, endpoint)
+        http_request_queries.inc(blueprint, endpoint, amount=sql_stats['count'])
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def render():
+    """Render all metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in _metrics:
+        if getattr(metric, 'callback', None):
+            samples = metric.samples()
+        else:
+            with _lock:
+                samples = metric.samples()
+
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for name, pairs, value in samples:
+            label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in pairs)
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view():
+    token = current_app.config.get('METRICS_TOKEN')
+    if token and request.headers.get('Authorization') != f"Bearer {token}":
+        return Response('Unauthorized\n', status=401, mimetype='text/plain')
+    return Response(render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def init_app(app):
+    """Register the request hooks and the /metrics endpoint."""
+    app.before_request(start_request)
+    app.after_request(record_status)
+    app.teardown_request(finish_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
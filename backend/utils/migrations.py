@@ -0,0 +1,149 @@
+"""
+Versioned schema migrations.
+
+Migrations live in backend/migrations as NNNN_description.py modules that
+define upgrade(cursor). Applied versions are recorded in the
+schema_migrations table; scripts/migrate.py applies the pending ones in
+order.
+
+schema_realtime.sql always describes the latest schema, so migrations use
+the idempotent helpers below: running them against a database created from
+the current schema file only records the versions.
+"""
+import importlib.util
+import os
+import re
+
+from utils.db import get_db_connection
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+MIGRATION_FILE = re.compile(r'^(\d{4})_(\w+)\.py$')
+
+
+# ----------------------------------------------------------------------------
+# IDEMPOTENT HELPERS
+# ----------------------------------------------------------------------------
+
+def table_exists(cursor, table):
+    cursor.execute("""
+        SELECT COUNT(*) as count FROM information_schema.tables
+        WHERE table_schema = DATABASE() AND table_name = %s
+    """, (table,))
+    return cursor.fetchone()['count'] > 0
+
+
+def column_exists(cursor, table, column):
+    cursor.execute("""
+        SELECT COUNT(*) as count FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+    """, (table, column))
+    return cursor.fetchone()['count'] > 0
+
+
+def index_exists(cursor, table, index):
+    cursor.execute("""
+        SELECT COUNT(*) as count FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+    """, (table, index))
+    return cursor.fetchone()['count'] > 0
+
+
+def add_column(cursor, table, column, definition):
+    """ALTER TABLE ... ADD COLUMN unless the column already exists."""
+    if not column_exists(cursor, table, column):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def add_index(cursor, table, index, columns, unique=False):
+    """CREATE [UNIQUE] INDEX unless an index with that name already exists."""
+    if not index_exists(cursor, table, index):
+        cursor.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX {index} ON {table} ({columns})")
+
+
+# ----------------------------------------------------------------------------
+# RUNNER
+# ----------------------------------------------------------------------------
+
+def discover():
+    """Return [(version, name, path)] for every migration file, in version order."""
+    migrations = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append((match.group(1), match.group(2), os.path.join(MIGRATIONS_DIR, filename)))
+    return migrations
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version VARCHAR(10) PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def applied_versions(cursor):
+    ensure_migrations_table(cursor)
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row['version'] for row in cursor.fetchall()}
+
+
+def is_applied(cursor, version):
+    """True if migration version (e.g. '0001') has been applied by scripts/migrate.py."""
+    return version in applied_versions(cursor)
+
+
+def load_migration(path):
+    spec = importlib.util.spec_from_file_location(f"migration_{os.path.basename(path)[:-3]}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def get_status():
+    """Return [(version, name, applied)] for every known migration."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    applied = applied_versions(cursor)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return [(version, name, version in applied) for version, name, _ in discover()]
+
+
+def migrate(target=None):
+    """
+    Apply pending migrations in order.
+
+    Args:
+        target (str, optional): Stop after this version.
+
+    Returns:
+        list: Versions applied by this run.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    applied = applied_versions(cursor)
+    conn.commit()
+
+    newly_applied = []
+    try:
+        for version, name, path in discover():
+            if target and version > target:
+                break
+            if version in applied:
+                continue
+
+            print(f"Applying {version}_{name}...")
+            load_migration(path).upgrade(cursor)
+            cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+            # MySQL commits DDL implicitly; this commits any data changes and the version row
+            conn.commit()
+            newly_applied.append(version)
+    finally:
+        cursor.close()
+        conn.close()
+
+    return newly_applied
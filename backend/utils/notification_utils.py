@@ -2,16 +2,67 @@
 """
 Notification utility functions for VenueBook
 Provides centralized notification creation and management
+
+The notify_* builders write their notification rows through the cursor
+they are given and return them unsent; utils.outbox calls them inside
+its delivery transaction and emits the returned notifications once that
+transaction has committed.
 """
 
 from utils.db import get_db_connection
 from datetime import datetime
 from extensions import socketio
 
+
+def insert_notification(cursor, user_id, title, message, notification_type='system', booking_id=None, venue_id=None):
+    """
+    Insert a notification row (the caller commits)
+
+    Args:
+        cursor: Database cursor
+        user_id (int): User to notify
+        title (str): Notification title
+        message (str): Notification message
+        notification_type (str): Type - 'booking', 'system', or 'verification'
+        booking_id (int, optional): Related booking ID
+        venue_id (int, optional): Related venue ID
+
+    Returns:
+        dict: The notification as sent to the client by emit_notification()
+    """
+    cursor.execute("""
+        INSERT INTO notifications (user_id, title, message, type, booking_id, venue_id, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, NOW())
+    """, (user_id, title, message, notification_type, booking_id, venue_id))
+
+    notification_id = cursor.lastrowid
+    return {
+        # The Navbar keys notifications by id, the API returns notification_id
+        'id': notification_id,
+        'notification_id': notification_id,
+        'user_id': user_id,
+        'title': title,
+        'message': message,
+        'type': notification_type,
+        'booking_id': booking_id,
+        'venue_id': venue_id,
+        'is_read': 0,
+        'created_at': datetime.now().isoformat()
+    }
+
+
+def emit_notification(notification):
+    """Push a committed notification to its user's private room"""
+    try:
+        socketio.emit('new_notification', notification, room=f"user_{notification['user_id']}")
+    except Exception as socket_error:
+        print(f"Socket emit failed: {str(socket_error)}")
+
+
 def create_notification(user_id, title, message, notification_type='system', booking_id=None, venue_id=None):
     """
-    Create a new notification for a user
-    
+    Create a new notification for a user and emit it immediately
+
     Args:
         user_id (int): User to notify
         title (str): Notification title
@@ -19,401 +70,258 @@ def create_notification(user_id, title, message, notification_type='system', boo
         notification_type (str): Type - 'booking', 'system', or 'verification'
         booking_id (int, optional): Related booking ID
         venue_id (int, optional): Related venue ID
-    
+
     Returns:
         int: notification_id of created notification, or None if failed
     """
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
-        
-        query = """
-            INSERT INTO notifications (user_id, title, message, type, booking_id, venue_id, created_at)
-            VALUES (%s, %s, %s, %s, %s, %s, NOW())
-        """
-        
-        # Note: Added NOW() explicit insert to match retrieval if needed, 
-        # though DB usually handles default CURRENT_TIMESTAMP.
-        # But for socket emission we need the time.
-        
-        cursor.execute(query, (user_id, title, message, notification_type, booking_id, venue_id))
+
+        notification = insert_notification(cursor, user_id, title, message, notification_type, booking_id, venue_id)
         conn.commit()
-        
-        notification_id = cursor.lastrowid
-        
+
         cursor.close()
         conn.close()
-        
-        # Emit Real-time Notification
-        try:
-            notification_data = {
-                'notification_id': notification_id, # Frontend expects id or notification_id? Checked Navbar, it uses .id in some places but .notification_id in API? 
-                # Navbar.jsx uses: n.id in handleMarkRead(n.id) BUT API returns notification_id.
-                # Let's check api.js or Navbar map.
-                # Navbar map: key={n.id}.
-                # Let's provide both to be safe or check existing API response.
-                'id': notification_id, 
-                'notification_id': notification_id,
-                'title': title,
-                'message': message,
-                'type': notification_type,
-                'booking_id': booking_id,
-                'venue_id': venue_id,
-                'is_read': 0,
-                'created_at': datetime.now().isoformat()
-            }
-            
-            # Emit to user's private room
-            socketio.emit('new_notification', notification_data, room=f"user_{user_id}")
-            print(f"Emitted notification to user_{user_id}")
-            
-        except Exception as socket_error:
-            print(f"Socket emit failed: {str(socket_error)}")
-        
-        return notification_id
-        
+
+        emit_notification(notification)
+        return notification['notification_id']
+
     except Exception as e:
         print(f"Error creating notification: {str(e)}")
         return None
 
 
-def notify_booking_created(booking_id):
+def notify_booking_created(cursor, booking_id):
     """
     Notify venue owner when a new booking is created
-    
+
     Args:
+        cursor: Database cursor
         booking_id (int): Booking ID
+
+    Returns:
+        list: Inserted notifications
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Get booking and venue details
-        query = """
-            SELECT b.booking_id, b.event_type, b.event_date, b.slot,
-                   v.venue_id, v.venue_name, v.owner_id,
-                   u.fullname as customer_name
-            FROM bookings b
-            JOIN venues v ON b.venue_id = v.venue_id
-            JOIN users u ON b.user_id = u.user_id
-            WHERE b.booking_id = %s
-        """
-        
-        cursor.execute(query, (booking_id,))
-        booking = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
-        
-        if booking:
-            title = "New Booking Request"
-            message = f"New {booking['event_type']} booking for {booking['venue_name']} on {booking['event_date']} ({booking['slot']}) by {booking['customer_name']}"
-            
-            return create_notification(
-                user_id=booking['owner_id'],
-                title=title,
-                message=message,
-                notification_type='booking',
-                booking_id=booking_id,
-                venue_id=booking['venue_id']
-            )
-    
-    except Exception as e:
-        print(f"Error notifying booking created: {str(e)}")
-        return None
+    cursor.execute("""
+        SELECT b.booking_id, b.event_type, b.event_date, b.slot,
+               v.venue_id, v.name as venue_name, o.user_id as owner_user_id,
+               u.name as customer_name
+        FROM bookings b
+        JOIN venues v ON b.venue_id = v.venue_id
+        JOIN owners o ON v.owner_id = o.owner_id
+        JOIN users u ON b.user_id = u.user_id
+        WHERE b.booking_id = %s
+    """, (booking_id,))
+    booking = cursor.fetchone()
+
+    if not booking:
+        return []
 
+    title = "New Booking Request"
+    message = f"New {booking['event_type']} booking for {booking['venue_name']} on {booking['event_date']} ({booking['slot']}) by {booking['customer_name']}"
 
-def notify_booking_status_changed(booking_id, new_status):
+    return [insert_notification(cursor, booking['owner_user_id'], title, message, 'booking',
+                                booking_id=booking_id, venue_id=booking['venue_id'])]
+
+
+def notify_booking_status_changed(cursor, booking_id, new_status):
     """
     Notify customer when booking status changes
-    
+
     Args:
+        cursor: Database cursor
         booking_id (int): Booking ID
         new_status (str): New booking status
+
+    Returns:
+        list: Inserted notifications
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Get booking details
-        query = """
-            SELECT b.booking_id, b.user_id, b.event_type, b.event_date,
-                   v.venue_id, v.venue_name
-            FROM bookings b
-            JOIN venues v ON b.venue_id = v.venue_id
-            WHERE b.booking_id = %s
-        """
-        
-        cursor.execute(query, (booking_id,))
-        booking = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
-        
-        if booking:
-            status_messages = {
-                'confirmed': f"Your booking for {booking['venue_name']} on {booking['event_date']} has been confirmed!",
-                'cancelled': f"Your booking for {booking['venue_name']} on {booking['event_date']} has been cancelled.",
-                'completed': f"Your booking for {booking['venue_name']} is now complete. Thank you for choosing us!"
-            }
-            
-            title = f"Booking {new_status.capitalize()}"
-            message = status_messages.get(new_status, f"Your booking status has been updated to {new_status}")
-            
-            return create_notification(
-                user_id=booking['user_id'],
-                title=title,
-                message=message,
-                notification_type='booking',
-                booking_id=booking_id,
-                venue_id=booking['venue_id']
-            )
-    
-    except Exception as e:
-        print(f"Error notifying booking status change: {str(e)}")
-        return None
+    cursor.execute("""
+        SELECT b.booking_id, b.user_id, b.event_type, b.event_date,
+               v.venue_id, v.name as venue_name
+        FROM bookings b
+        JOIN venues v ON b.venue_id = v.venue_id
+        WHERE b.booking_id = %s
+    """, (booking_id,))
+    booking = cursor.fetchone()
+
+    if not booking:
+        return []
+
+    status_messages = {
+        'confirmed': f"Your booking for {booking['venue_name']} on {booking['event_date']} has been confirmed!",
+        'rejected': f"Your booking for {booking['venue_name']} on {booking['event_date']} has been declined.",
+        'cancelled': f"Your booking for {booking['venue_name']} on {booking['event_date']} has been cancelled.",
+        'completed': f"Your booking for {booking['venue_name']} is now complete. Thank you for choosing us!"
+    }
+
+    title = f"Booking {new_status.capitalize()}"
+    message = status_messages.get(new_status, f"Your booking status has been updated to {new_status}")
 
+    return [insert_notification(cursor, booking['user_id'], title, message, 'booking',
+                                booking_id=booking_id, venue_id=booking['venue_id'])]
 
-def notify_booking_completed_review_request(booking_id):
+
+def notify_booking_completed_review_request(cursor, booking_id):
     """
     Notify customer to submit a review after booking is completed
-    
+
     Args:
+        cursor: Database cursor
         booking_id (int): Booking ID
+
+    Returns:
+        list: Inserted notifications
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Get booking details
-        query = """
-            SELECT b.booking_id, b.user_id, b.event_type,
-                   v.venue_id, v.venue_name
-            FROM bookings b
-            JOIN venues v ON b.venue_id = v.venue_id
-            WHERE b.booking_id = %s
-        """
-        
-        cursor.execute(query, (booking_id,))
-        booking = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
-        
-        if booking:
-            title = "Share Your Experience"
-            message = f"How was your {booking['event_type']} at {booking['venue_name']}? Click here to leave a review and help others!"
-            
-            return create_notification(
-                user_id=booking['user_id'],
-                title=title,
-                message=message,
-                notification_type='booking',
-                booking_id=booking_id,
-                venue_id=booking['venue_id']
-            )
-    
-    except Exception as e:
-        print(f"Error notifying review request: {str(e)}")
-        return None
+    cursor.execute("""
+        SELECT b.booking_id, b.user_id, b.event_type,
+               v.venue_id, v.name as venue_name
+        FROM bookings b
+        JOIN venues v ON b.venue_id = v.venue_id
+        WHERE b.booking_id = %s
+    """, (booking_id,))
+    booking = cursor.fetchone()
+
+    if not booking:
+        return []
 
+    title = "Share Your Experience"
+    message = f"How was your {booking['event_type']} at {booking['venue_name']}? Click here to leave a review and help others!"
 
-def notify_venue_status_changed(venue_id, new_status):
+    return [insert_notification(cursor, booking['user_id'], title, message, 'booking',
+                                booking_id=booking_id, venue_id=booking['venue_id'])]
+
+
+def notify_venue_status_changed(cursor, venue_id, new_status):
     """
     Notify owner when venue status changes (approval/rejection)
-    
+
     Args:
+        cursor: Database cursor
         venue_id (int): Venue ID
         new_status (str): New venue status
+
+    Returns:
+        list: Inserted notifications
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Get venue details
-        query = """
-            SELECT venue_id, venue_name, owner_id
-            FROM venues
-            WHERE venue_id = %s
-        """
-        
-        cursor.execute(query, (venue_id,))
-        venue = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
-        
-        if venue:
-            status_messages = {
-                'approved': f"Great news! Your venue '{venue['venue_name']}' has been approved and is now live!",
-                'rejected': f"Your venue '{venue['venue_name']}' submission needs revision. Please check the details and resubmit.",
-                'pending': f"Your venue '{venue['venue_name']}' is under review."
-            }
-            
-            title = f"Venue {new_status.capitalize()}"
-            message = status_messages.get(new_status, f"Your venue status has been updated to {new_status}")
-            
-            return create_notification(
-                user_id=venue['owner_id'],
-                title=title,
-                message=message,
-                notification_type='verification',
-                venue_id=venue_id
-            )
-    
-    except Exception as e:
-        print(f"Error notifying venue status change: {str(e)}")
-        return None
+    cursor.execute("""
+        SELECT v.venue_id, v.name as venue_name, o.user_id as owner_user_id
+        FROM venues v
+        JOIN owners o ON v.owner_id = o.owner_id
+        WHERE v.venue_id = %s
+    """, (venue_id,))
+    venue = cursor.fetchone()
 
+    if not venue:
+        return []
 
-def notify_payment_received(payment_id):
+    status_messages = {
+        'approved': f"Great news! Your venue '{venue['venue_name']}' has been approved and is now live!",
+        'active': f"Great news! Your venue '{venue['venue_name']}' has been approved and is now live!",
+        'rejected': f"Your venue '{venue['venue_name']}' submission needs revision. Please check the details and resubmit.",
+        'pending': f"Your venue '{venue['venue_name']}' is under review."
+    }
+
+    title = f"Venue {new_status.capitalize()}"
+    message = status_messages.get(new_status, f"Your venue status has been updated to {new_status}")
+
+    return [insert_notification(cursor, venue['owner_user_id'], title, message, 'verification',
+                                venue_id=venue_id)]
+
+
+def notify_payment_received(cursor, payment_id):
     """
     Notify owner when payment is received
-    
+
     Args:
+        cursor: Database cursor
         payment_id (int): Payment ID
+
+    Returns:
+        list: Inserted notifications
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Get payment details
-        query = """
-            SELECT p.payment_id, p.amount, p.payment_method,
-                   b.booking_id, v.venue_id, v.venue_name, v.owner_id
-            FROM payments p
-            JOIN bookings b ON p.booking_id = b.booking_id
-            JOIN venues v ON b.venue_id = v.venue_id
-            WHERE p.payment_id = %s
-        """
-        
-        cursor.execute(query, (payment_id,))
-        payment = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
-        
-        if payment:
-            title = "Payment Received"
-            message = f"Payment of Rs. {payment['amount']:,.0f} received for {payment['venue_name']} via {payment['payment_method']}"
-            
-            return create_notification(
-                user_id=payment['owner_id'],
-                title=title,
-                message=message,
-                notification_type='booking',
-                booking_id=payment['booking_id'],
-                venue_id=payment['venue_id']
-            )
-    
-    except Exception as e:
-        print(f"Error notifying payment received: {str(e)}")
-        return None
+    cursor.execute("""
+        SELECT p.payment_id, p.amount, p.method,
+               b.booking_id, v.venue_id, v.name as venue_name, o.user_id as owner_user_id
+        FROM booking_payments p
+        JOIN bookings b ON p.booking_id = b.booking_id
+        JOIN venues v ON b.venue_id = v.venue_id
+        JOIN owners o ON v.owner_id = o.owner_id
+        WHERE p.payment_id = %s
+    """, (payment_id,))
+    payment = cursor.fetchone()
+
+    if not payment:
+        return []
 
+    title = "Payment Received"
+    message = f"Payment of Rs. {payment['amount']:,.0f} received for {payment['venue_name']} via {payment['method']}"
 
-def notify_new_review(venue_id, rating):
+    return [insert_notification(cursor, payment['owner_user_id'], title, message, 'booking',
+                                booking_id=payment['booking_id'], venue_id=payment['venue_id'])]
+
+
+def notify_new_review(cursor, venue_id, rating):
     """
     Notify owner when they receive a new review
-    
+
     Args:
+        cursor: Database cursor
         venue_id (int): Venue ID
         rating (int): Review rating
+
+    Returns:
+        list: Inserted notifications
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Get venue details
-        query = """
-            SELECT venue_id, venue_name, owner_id
-            FROM venues
-            WHERE venue_id = %s
-        """
-        
-        cursor.execute(query, (venue_id,))
-        venue = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
-        
-        if venue:
-            title = "New Review Received"
-            stars = "⭐" * rating
-            message = f"Your venue '{venue['venue_name']}' received a new {rating}-star review! {stars}"
-            
-            return create_notification(
-                user_id=venue['owner_id'],
-                title=title,
-                message=message,
-                notification_type='system',
-                venue_id=venue_id
-            )
-    
-    except Exception as e:
-        print(f"Error notifying new review: {str(e)}")
-        return None
+    cursor.execute("""
+        SELECT v.venue_id, v.name as venue_name, o.user_id as owner_user_id
+        FROM venues v
+        JOIN owners o ON v.owner_id = o.owner_id
+        WHERE v.venue_id = %s
+    """, (venue_id,))
+    venue = cursor.fetchone()
+
+    if not venue:
+        return []
+
+    title = "New Review Received"
+    stars = "⭐" * rating
+    message = f"Your venue '{venue['venue_name']}' received a new {rating}-star review! {stars}"
+
+    return [insert_notification(cursor, venue['owner_user_id'], title, message, 'system',
+                                venue_id=venue_id)]
 
 
-def notify_admins_new_venue(venue_id):
+def notify_admins_new_venue(cursor, venue_id):
     """
     Notify all admins when a new venue is submitted for approval
-    
+
     Args:
+        cursor: Database cursor
         venue_id (int): Venue ID
+
+    Returns:
+        list: Inserted notifications (one per admin)
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Get venue and owner details
-        query = """
-            SELECT v.venue_id, v.venue_name, v.city, v.type,
-                   u.user_id as owner_id, u.fullname as owner_name
-            FROM venues v
-            JOIN users u ON v.owner_id = u.user_id
-            WHERE v.venue_id = %s
-        """
-        
-        cursor.execute(query, (venue_id,))
-        venue = cursor.fetchone()
-        
-        if not venue:
-            cursor.close()
-            conn.close()
-            return None
-        
-        # Get all admin users
-        cursor.execute("""
-            SELECT user_id, fullname
-            FROM users
-            WHERE role = 'admin'
-        """)
-        admins = cursor.fetchall()
-        
-        cursor.close()
-        conn.close()
-        
-        if admins:
-            title = "New Venue Pending Approval"
-            message = f"New {venue['type']} venue '{venue['venue_name']}' in {venue['city']} submitted by {venue['owner_name']} awaits your review"
-            
-            # Create notification for each admin
-            notification_ids = []
-            for admin in admins:
-                notif_id = create_notification(
-                    user_id=admin['user_id'],
-                    title=title,
-                    message=message,
-                    notification_type='verification',
-                    venue_id=venue_id
-                )
-                if notif_id:
-                    notification_ids.append(notif_id)
-            
-            return notification_ids
-        
-        return None
-    
-    except Exception as e:
-        print(f"Error notifying admins of new venue: {str(e)}")
-        return None
+    cursor.execute("""
+        SELECT v.venue_id, v.name as venue_name, v.city, v.type,
+               u.name as owner_name
+        FROM venues v
+        JOIN owners o ON v.owner_id = o.owner_id
+        JOIN users u ON o.user_id = u.user_id
+        WHERE v.venue_id = %s
+    """, (venue_id,))
+    venue = cursor.fetchone()
+
+    if not venue:
+        return []
+
+    cursor.execute("SELECT user_id FROM users WHERE role = 'admin'")
+    admins = cursor.fetchall()
+
+    title = "New Venue Pending Approval"
+    message = f"New {venue['type']} venue '{venue['venue_name']}' in {venue['city']} submitted by {venue['owner_name']} awaits your review"
+
+    return [insert_notification(cursor, admin['user_id'], title, message, 'verification', venue_id=venue_id)
+            for admin in admins]
@@ -0,0 +1,220 @@
+"""
+Transactional outbox for post-commit side effects.
+
+Routes record side effects (owner/customer notifications, audit log
+entries) with enqueue() on the cursor of the transaction that makes the
+business change, so they are committed - or rolled back - together with
+it and the request only pays for one extra INSERT.
+
+A background dispatcher in each server process claims pending events in
+batches (SELECT ... FOR UPDATE SKIP LOCKED, so workers never share an
+event), runs their handlers on the same connection and marks them
+delivered in the same transaction as the rows the handlers write. Each
+event therefore takes effect exactly once; a failing event is rolled back
+to its savepoint and retried with exponential backoff, and parked as
+'failed' after OUTBOX_MAX_ATTEMPTS. Socket.IO notifications are emitted
+after the batch commits (a crash in between loses only the live push,
+the notification rows are already stored). Events with a dedupe_key are
+enqueued at most once, so a retried request cannot double-notify.
+"""
+import json
+
+import eventlet
+from eventlet.queue import Empty, Full, LightQueue
+from flask import current_app, g
+
+from extensions import socketio
+from utils.db import get_db_connection
+from utils.log_utils import insert_log
+from utils.notification_utils import (
+    emit_notification, notify_admins_new_venue, notify_booking_completed_review_request,
+    notify_booking_created, notify_booking_status_changed, notify_new_review,
+    notify_payment_received, notify_venue_status_changed
+)
+
+# Wakes the dispatcher as soon as a request that enqueued events has finished
+_wakeups = LightQueue(maxsize=1)
+_started = False
+
+
+def enqueue(cursor, event_type, data, dedupe_key=None):
+    """
+    Record a side effect in the caller's transaction.
+
+    Args:
+        cursor: Cursor of the transaction making the business change.
+        event_type (str): Key of HANDLERS.
+        data (dict): Handler arguments (JSON-serializable; Decimals/dates become strings).
+        dedupe_key (str, optional): Events with the same key are only ever enqueued once.
+    """
+    cursor.execute("""
+        INSERT IGNORE INTO outbox_events (event_type, payload, dedupe_key)
+        VALUES (%s, %s, %s)
+    """, (event_type, json.dumps(data, default=str), dedupe_key))
+    try:
+        g.outbox_enqueued = True
+    except RuntimeError:
+        pass
+
+
+# ----------------------------------------------------------------------------
+# HANDLERS
+# ----------------------------------------------------------------------------
+# handler(cursor, data) writes through the dispatcher's cursor and returns the
+# notifications to emit once the batch has committed. data is the enqueued
+# dict plus queued_at, the outbox row's created_at: the time of the business
+# transaction, not of the (possibly retried or backlogged) delivery.
+
+def _audit_log(cursor, data):
+    insert_log(cursor, data, created_at=data['queued_at'])
+    return []
+
+
+def _booking_status_changed(cursor, data):
+    notifications = notify_booking_status_changed(cursor, data['booking_id'], data['status'])
+    if data['status'] == 'completed':
+        notifications += notify_booking_completed_review_request(cursor, data['booking_id'])
+    return notifications
+
+
+HANDLERS = {
+    'audit_log': _audit_log,
+    'booking_created': lambda cursor, data: notify_booking_created(cursor, data['booking_id']),
+    'booking_status_changed': _booking_status_changed,
+    'payment_received': lambda cursor, data: notify_payment_received(cursor, data['payment_id']),
+    'venue_submitted': lambda cursor, data: notify_admins_new_venue(cursor, data['venue_id']),
+    'venue_status_changed': lambda cursor, data: notify_venue_status_changed(cursor, data['venue_id'], data['status']),
+    'review_created': lambda cursor, data: notify_new_review(cursor, data['venue_id'], data['rating']),
+}
+
+
+# ----------------------------------------------------------------------------
+# DISPATCHER
+# ----------------------------------------------------------------------------
+
+def dispatch_batch(batch_size=100, max_attempts=5):
+    """
+    Deliver up to batch_size due events in one transaction.
+
+    Returns:
+        tuple: (delivered count, failed count)
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT event_id, event_type, payload, attempts, created_at
+            FROM outbox_events
+            WHERE status = 'pending' AND available_at <= NOW()
+            ORDER BY event_id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        """, (batch_size,))
+        events = cursor.fetchall()
+        if not events:
+            conn.commit()
+            return 0, 0
+
+        delivered, notifications, failed = [], [], 0
+        for event in events:
+            cursor.execute("SAVEPOINT outbox_event")
+            try:
+                handler = HANDLERS[event['event_type']]
+                data = event['payload']
+                data = json.loads(data) if isinstance(data, (str, bytes)) else data
+                notifications += handler(cursor, dict(data, queued_at=event['created_at']))
+                delivered.append(event['event_id'])
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT outbox_event")
+                failed += 1
+                attempts = event['attempts'] + 1
+                cursor.execute("""
+                    UPDATE outbox_events
+                    SET attempts = %s, last_error = %s,
+                        status = IF(%s >= %s, 'failed', 'pending'),
+                        available_at = NOW() + INTERVAL %s SECOND
+                    WHERE event_id = %s
+                """, (attempts, str(e)[:1000], attempts, max_attempts, min(2 ** attempts, 300), event['event_id']))
+
+        if delivered:
+            placeholders = ', '.join(['%s'] * len(delivered))
+            cursor.execute(f"""
+                UPDATE outbox_events SET status = 'delivered', delivered_at = NOW()
+                WHERE event_id IN ({placeholders})
+            """, delivered)
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+    for notification in notifications:
+        emit_notification(notification)
+    return len(delivered), failed
+
+
+def prune_delivered(days):
+    """Delete delivered events older than days; returns the number removed."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        DELETE FROM outbox_events
+        WHERE status = 'delivered' AND delivered_at < NOW() - INTERVAL %s DAY
+    """, (days,))
+    removed = cursor.rowcount
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return removed
+
+
+def run_dispatcher(app):
+    """Background task: deliver outbox events until the process exits."""
+    with app.app_context():
+        batch_size = app.config.get('OUTBOX_BATCH_SIZE', 100)
+        max_attempts = app.config.get('OUTBOX_MAX_ATTEMPTS', 5)
+        interval = app.config.get('OUTBOX_POLL_INTERVAL', 1.0)
+
+        while True:
+            try:
+                delivered, failed = dispatch_batch(batch_size, max_attempts)
+            except Exception as e:
+                print(f"Outbox dispatch error: {str(e)}")
+                delivered = failed = 0
+
+            if delivered + failed == batch_size:
+                # Backlog: keep draining, but let other green threads run
+                eventlet.sleep(0)
+                continue
+            try:
+                _wakeups.get(timeout=interval)
+            except Empty:
+                pass
+
+
+def wake(exc=None):
+    """teardown_request hook: wake the dispatcher if the request enqueued events."""
+    if not g.pop('outbox_enqueued', False):
+        return
+    try:
+        _wakeups.put_nowait(None)
+    except Full:
+        pass
+
+
+def start_dispatcher():
+    """before_request hook: start this process's dispatcher with the first request."""
+    global _started
+    if _started or not current_app.config.get('OUTBOX_DISPATCHER_ENABLED', True):
+        return
+    _started = True
+    socketio.start_background_task(run_dispatcher, current_app._get_current_object())
+
+
+def init_app(app):
+    """Register the hooks that run and wake the outbox dispatcher."""
+    app.before_request(start_dispatcher)
+    app.teardown_request(wake)
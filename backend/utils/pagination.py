@@ -0,0 +1,86 @@
+"""
+Keyset (cursor) pagination for listing routes.
+
+Pages are ordered by (sort column DESC, id DESC). The response carries an
+opaque next_cursor encoding the last row's (sort value, id); passing it
+back as ?cursor= continues strictly after that row, so every page is an
+index range read instead of an ever-growing OFFSET.
+"""
+import base64
+import json
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+class InvalidCursor(ValueError):
+    """Raised when a ?cursor= value cannot be decoded."""
+
+
+def get_limit(args):
+    """Page size from ?limit=, clamped to 1..MAX_LIMIT."""
+    limit = args.get('limit', DEFAULT_LIMIT, type=int) or DEFAULT_LIMIT
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def encode_cursor(sort_value, row_id):
+    raw = json.dumps([str(sort_value), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Returns:
+        tuple: (sort value, id)
+
+    Raises:
+        InvalidCursor: If the token is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        sort_value, row_id = json.loads(raw)
+        return sort_value, int(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+
+def keyset_page(cursor, query, params, sort_column, id_column, token, limit):
+    """
+    Fetch one page of a filtered query in (sort_column, id_column) DESC order.
+
+    Args:
+        cursor: Database cursor.
+        query (str): Filtered SELECT ending in a WHERE clause, without ORDER BY/LIMIT.
+        params (list): Parameters for query.
+        sort_column (str): Qualified sort column (e.g. 'b.created_at').
+        id_column (str): Qualified unique tie-breaker (e.g. 'b.booking_id').
+        token (str): Cursor from the previous page, or None for the first page.
+        limit (int): Page size.
+
+    Returns:
+        tuple: (rows, next cursor or None)
+
+    Raises:
+        InvalidCursor: If token is malformed.
+    """
+    params = list(params)
+    if token:
+        sort_value, row_id = decode_cursor(token)
+        query += f" AND ({sort_column} < %s OR ({sort_column} = %s AND {id_column} < %s))"
+        params.extend([sort_value, sort_value, row_id])
+
+    query += f" ORDER BY {sort_column} DESC, {id_column} DESC LIMIT %s"
+    params.append(limit + 1)
+
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last[sort_column.split('.')[-1]], last[id_column.split('.')[-1]])
+
+    return rows, next_cursor
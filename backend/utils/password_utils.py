@@ -0,0 +1,103 @@
+"""
+Password hashing utilities.
+
+bcrypt is CPU bound and releases no control back to the eventlet hub, so
+hashing directly in a request would freeze every socket and HTTP green
+thread in the process. These helpers run bcrypt on eventlet's native
+thread pool, with a bounded number of waiting requests and a configurable
+work factor.
+"""
+import bcrypt
+from eventlet import tpool
+from eventlet.semaphore import Semaphore
+from flask import current_app
+
+_slots = None
+_pending = 0
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hashing requests are already waiting."""
+
+
+def configure_thread_pool(app):
+    """
+    Size eventlet's native thread pool; call from create_app, before anything uses tpool.
+
+    The pool is shared with photo uploads (utils/photo_pipeline.py), so it
+    gets PASSWORD_HASH_WORKERS threads for bcrypt plus PHOTO_UPLOAD_CONCURRENCY
+    for storage calls instead of eventlet's default of 20.
+    """
+    tpool.set_num_threads(app.config['PASSWORD_HASH_WORKERS'] + app.config['PHOTO_UPLOAD_CONCURRENCY'])
+
+
+def _get_slots():
+    """Create the worker semaphore lazily so it picks up the app config."""
+    global _slots
+    if _slots is None:
+        _slots = Semaphore(current_app.config['PASSWORD_HASH_WORKERS'])
+    return _slots
+
+
+def _run(func, *args):
+    """
+    Execute a bcrypt call on the native thread pool.
+
+    Raises:
+        PasswordHasherBusy: If the pending queue is full.
+    """
+    global _pending
+    if _pending >= current_app.config['PASSWORD_HASH_MAX_PENDING']:
+        raise PasswordHasherBusy('Too many concurrent password operations')
+
+    _pending += 1
+    try:
+        with _get_slots():
+            return tpool.execute(func, *args)
+    finally:
+        _pending -= 1
+
+
+def hash_password(password):
+    """
+    Hash a password with the configured bcrypt work factor.
+
+    Args:
+        password (str): Plain-text password.
+
+    Returns:
+        str: bcrypt hash.
+    """
+    salt = bcrypt.gensalt(rounds=current_app.config['BCRYPT_ROUNDS'])
+    return _run(bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+
+
+def check_password(password, hashed):
+    """
+    Verify a password against a stored bcrypt hash.
+
+    Args:
+        password (str): Plain-text password.
+        hashed (str): Stored bcrypt hash.
+
+    Returns:
+        bool: True if the password matches.
+    """
+    return _run(bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+def needs_rehash(hashed):
+    """
+    Check whether a stored hash was made with a different work factor.
+
+    Args:
+        hashed (str): Stored bcrypt hash, e.g. "$2b$12$...".
+
+    Returns:
+        bool: True if the hash should be regenerated.
+    """
+    try:
+        rounds = int(hashed.split('$')[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != current_app.config['BCRYPT_ROUNDS']
@@ -0,0 +1,113 @@
+"""
+Venue photo ingestion pipeline.
+
+Uploads venue photos after the venue transaction has committed. Files are
+uploaded concurrently on a bounded green pool (the blocking storage call
+itself runs on eventlet's native thread pool), deduplicated by content
+hash through utils.image_assets, retried with backoff, and
+attached to the venue (with thumb/card/full derivatives, the first one
+becoming the cover image) as each upload completes. Progress is pushed to
+the uploading user over Socket.IO.
+"""
+import uuid
+
+import eventlet
+from eventlet import tpool
+from flask import current_app
+
+from extensions import socketio
+from utils.image_assets import ingest_image, attach_to_venue
+from utils.image_utils import get_storage
+
+
+def read_uploads(files):
+    """
+    Copy uploaded files into memory so they outlive the request.
+
+    Args:
+        files (list): werkzeug FileStorage objects from request.files.
+
+    Returns:
+        list: (filename, bytes) tuples for non-empty files.
+    """
+    return [(f.filename, f.read()) for f in files if f]
+
+
+def start_photo_ingestion(venue_id, user_id, photos):
+    """
+    Start uploading venue photos in the background.
+
+    Args:
+        venue_id (int): Venue the photos belong to (already committed).
+        user_id (int): Uploading user, notified in room user_<id>.
+        photos (list): (filename, bytes) tuples from read_uploads().
+
+    Returns:
+        dict: Job descriptor ({'job_id', 'total'}) or None if no photos.
+    """
+    if not photos:
+        return None
+
+    job_id = uuid.uuid4().hex
+    app = current_app._get_current_object()
+    socketio.start_background_task(_run_job, app, job_id, venue_id, user_id, photos)
+
+    return {'job_id': job_id, 'total': len(photos)}
+
+
+def _ingest_with_retries(storage, filename, data, folder, retries, backoff):
+    """
+    Store one file through the content-addressed index, retrying with
+    exponential backoff. Returns the ingest_image() result or None.
+    """
+    for attempt in range(retries + 1):
+        try:
+            result = ingest_image(storage, data, filename, folder, execute=tpool.execute)
+            if result['url']:
+                return result
+        except Exception as e:
+            print(f"Photo upload error ({filename}, attempt {attempt + 1}): {str(e)}")
+
+        if attempt < retries:
+            eventlet.sleep(backoff * (2 ** attempt))
+
+    return None
+
+
+def _run_job(app, job_id, venue_id, user_id, photos):
+    """Background task: upload all photos and report progress."""
+    with app.app_context():
+        storage = get_storage(app)
+        folder = f"venues/{venue_id}"
+        retries = app.config['PHOTO_UPLOAD_RETRIES']
+        backoff = app.config['PHOTO_UPLOAD_BACKOFF']
+        room = f"user_{user_id}"
+        progress = {'job_id': job_id, 'venue_id': venue_id, 'total': len(photos),
+                    'completed': 0, 'failed': 0, 'duplicates': 0}
+
+        def upload(photo):
+            filename, data = photo
+            asset = _ingest_with_retries(storage, filename, data, folder, retries, backoff)
+            image_id, is_duplicate = None, False
+            if asset:
+                with app.app_context():
+                    try:
+                        image_id, is_duplicate = attach_to_venue(venue_id, asset)
+                    except Exception as e:
+                        print(f"Error attaching photo to venue #{venue_id}: {str(e)}")
+
+            progress['completed' if image_id else 'failed'] += 1
+            if is_duplicate:
+                progress['duplicates'] += 1
+            socketio.emit('photo_upload_progress',
+                          dict(progress, filename=filename, image_id=image_id,
+                               image_url=asset['url'] if asset else None,
+                               reused=bool(asset and asset['reused']), duplicate=is_duplicate),
+                          room=room)
+
+        pool = eventlet.GreenPool(app.config['PHOTO_UPLOAD_CONCURRENCY'])
+        for photo in photos:
+            pool.spawn_n(upload, photo)
+        pool.waitall()
+
+        socketio.emit('photo_upload_complete', progress, room=room)
@@ -0,0 +1,251 @@
+"""
+Principal cache utilities.
+
+Keeps a small in-process TTL cache of resolved request principals keyed by
+the JWT token id (``jti``), so authenticated routes can read owner_id and
+account status without querying the database on every request.
+
+Account changes are recorded in users.claims_changed_at inside the admin
+transaction (mark_claims_changed). Each worker polls that column as it
+resolves principals, at most every PRINCIPAL_CHANGES_POLL_INTERVAL seconds,
+and evicts the cached principals of changed users, so a token
+issued before the change is re-resolved from the database in every worker,
+not just the one that handled the admin request.
+"""
+import threading
+import time
+
+from flask import current_app
+
+from utils.db import get_db_connection
+
+_lock = threading.Lock()
+
+# {token_id: (expires_at, principal)}
+_principals = {}
+# {user_id: set(token_id)} - lets us evict every cached token of a user
+_user_tokens = {}
+# {user_id: changed_at} - tokens issued before this moment carry stale claims
+_changed_users = {}
+# Time of the last users.claims_changed_at poll (0 = never)
+_synced_at = 0
+
+# Overlap between polls, for changes committed after their NOW() was taken
+# and for clock skew between the app and the database
+SYNC_OVERLAP = 60
+
+
+def build_claims(user):
+    """
+    Build the principal claims embedded in a JWT for a user row.
+
+    Args:
+        user (dict): Row containing user_id, email, role, status and owner_id.
+
+    Returns:
+        dict: Claims describing the authenticated principal.
+    """
+    return {
+        'user_id': user['user_id'],
+        'email': user.get('email'),
+        'role': user['role'],
+        'owner_id': user.get('owner_id'),
+        'status': user.get('status') or 'active',
+        'verification_status': user.get('verification_status')
+    }
+
+
+def load_principal(user_id):
+    """
+    Resolve a principal from the database.
+
+    Args:
+        user_id (int): User ID from the token.
+
+    Returns:
+        dict: Principal claims, or None if the user no longer exists.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT u.user_id, u.email, u.role, u.status,
+               o.owner_id, o.verification_status
+        FROM users u
+        LEFT JOIN owners o ON o.user_id = u.user_id
+        WHERE u.user_id = %s
+    """, (user_id,))
+    user = cursor.fetchone()
+    cursor.close()
+    conn.close()
+
+    return build_claims(user) if user else None
+
+
+def resolve_principal(token_data):
+    """
+    Return the principal for a decoded token, using the cache when possible.
+
+    Tokens that already carry principal claims are trusted until the account
+    changes; older tokens, or tokens issued before an account change, are
+    resolved from the database once and then cached.
+
+    Args:
+        token_data (dict): Verified JWT payload.
+
+    Returns:
+        dict: Principal claims, or None if the user no longer exists.
+    """
+    token_id = token_data.get('jti')
+    user_id = token_data['user_id']
+    now = time.time()
+
+    # Before the cache lookup: the poll evicts cached principals of changed
+    # users, so a revocation applies within the poll interval, not the TTL
+    _sync_changes(now)
+
+    if token_id:
+        with _lock:
+            cached = _principals.get(token_id)
+        if cached and cached[0] > now:
+            return cached[1]
+
+    with _lock:
+        changed_at = _changed_users.get(user_id)
+
+    has_claims = 'owner_id' in token_data and 'status' in token_data
+    is_stale = changed_at is not None and token_data.get('iat', 0) <= changed_at
+
+    if has_claims and not is_stale:
+        principal = build_claims(token_data)
+    else:
+        principal = load_principal(user_id)
+        if principal is None:
+            return None
+
+    if token_id:
+        _store(token_id, user_id, principal, now)
+
+    return principal
+
+
+def _sync_changes(now):
+    """Merge recent users.claims_changed_at values into _changed_users, at most once per poll interval."""
+    global _synced_at
+    interval = current_app.config.get('PRINCIPAL_CHANGES_POLL_INTERVAL', 5)
+    max_age = current_app.config.get('JWT_EXPIRY_DAYS', 7) * 86400
+
+    with _lock:
+        if now - _synced_at < interval:
+            return
+        # A fresh process reads every change that can still match a live token
+        since = _synced_at - SYNC_OVERLAP if _synced_at else now - max_age
+        previous, _synced_at = _synced_at, now
+
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT user_id, UNIX_TIMESTAMP(claims_changed_at) as changed_at
+            FROM users
+            WHERE claims_changed_at >= FROM_UNIXTIME(%s)
+        """, (int(since),))
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+    except Exception as e:
+        print(f"Principal changes poll failed: {str(e)}")
+        with _lock:
+            _synced_at = previous
+        return
+
+    with _lock:
+        for row in rows:
+            changed_at = float(row['changed_at'])
+            if changed_at > _changed_users.get(row['user_id'], 0):
+                _changed_users[row['user_id']] = changed_at
+                for token_id in list(_user_tokens.get(row['user_id'], ())):
+                    _evict(token_id)
+
+        for key in [k for k, changed_at in _changed_users.items() if changed_at < now - max_age]:
+            del _changed_users[key]
+
+
+def _store(token_id, user_id, principal, now):
+    """Insert a principal into the cache, evicting expired entries when full."""
+    ttl = current_app.config.get('PRINCIPAL_CACHE_TTL', 60)
+    max_size = current_app.config.get('PRINCIPAL_CACHE_SIZE', 10000)
+
+    with _lock:
+        if len(_principals) >= max_size:
+            for key in [k for k, (expires_at, _) in _principals.items() if expires_at <= now]:
+                _evict(key)
+            if len(_principals) >= max_size:
+                _evict(next(iter(_principals)))
+
+        _principals[token_id] = (now + ttl, principal)
+        _user_tokens.setdefault(user_id, set()).add(token_id)
+
+
+def _evict(token_id):
+    """Drop a single token from the cache. Caller must hold the lock."""
+    entry = _principals.pop(token_id, None)
+    if entry:
+        tokens = _user_tokens.get(entry[1]['user_id'])
+        if tokens:
+            tokens.discard(token_id)
+            if not tokens:
+                del _user_tokens[entry[1]['user_id']]
+
+
+def invalidate_token(token_id):
+    """
+    Remove a single token's principal from the cache (e.g. on logout).
+
+    Args:
+        token_id (str): JWT token id.
+    """
+    if not token_id:
+        return
+    with _lock:
+        _evict(token_id)
+
+
+def mark_claims_changed(cursor, user_id):
+    """
+    Record an account change in the caller's transaction.
+
+    Other workers pick it up on their next poll; call invalidate_user()
+    after the commit to apply it in this worker immediately.
+
+    Args:
+        cursor: Cursor of the transaction that changes the account.
+        user_id (int): User whose account changed.
+    """
+    cursor.execute("UPDATE users SET claims_changed_at = NOW() WHERE user_id = %s", (user_id,))
+
+
+def invalidate_user(user_id):
+    """
+    Invalidate every cached principal of a user in this worker.
+
+    Tokens issued before this call are re-resolved from the database on
+    their next request. The change must also be recorded with
+    mark_claims_changed() so that other workers apply it.
+
+    Args:
+        user_id (int): User whose account changed.
+    """
+    if user_id is None:
+        return
+
+    now = time.time()
+    max_age = current_app.config.get('JWT_EXPIRY_DAYS', 7) * 86400
+
+    with _lock:
+        for token_id in list(_user_tokens.get(user_id, ())):
+            _evict(token_id)
+        _changed_users[user_id] = now
+
+        # Markers older than the token lifetime can no longer match any token
+        for key in [k for k, changed_at in _changed_users.items() if changed_at < now - max_age]:
+            del _changed_users[key]
@@ -0,0 +1,149 @@
+"""
+Per-request SQL instrumentation.
+
+When a request is sampled, utils.db.get_db_connection() hands out
+connections whose cursors record every statement: count, total DB time,
+rows returned and the slowest statement. The totals are returned in a
+Server-Timing header, and statements slower than the threshold are written
+to the slow-query log together with their EXPLAIN plan.
+
+Unsampled requests get plain DictCursors, so the cost when disabled is one
+flag check per request. The settings can be changed at runtime through
+PUT /api/admin/sql-stats.
+"""
+import logging
+import random
+import time
+
+import pymysql
+from flask import g, has_request_context
+
+slow_query_logger = logging.getLogger('venuebook.slow_queries')
+
+# Runtime settings, initialised from the app config by init_app()
+settings = {
+    'enabled': False,
+    'sample_rate': 1.0,
+    'slow_query_ms': 200.0,
+}
+
+EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE')
+
+
+class InstrumentedCursor(pymysql.cursors.DictCursor):
+    """DictCursor that records timings into the current request's stats."""
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            record_statement(self, elapsed_ms)
+
+
+def current_stats():
+    """Return the stats dict of the current request, or None if it is not sampled."""
+    if not has_request_context():
+        return None
+    return g.get('sql_stats')
+
+
+def cursor_class():
+    """Cursor class for new connections: instrumented only inside sampled requests."""
+    return InstrumentedCursor if current_stats() is not None else pymysql.cursors.DictCursor
+
+
+def record_statement(cursor, elapsed_ms):
+    stats = current_stats()
+    if stats is None:
+        return
+
+    statement = cursor._executed or ''
+    stats['count'] += 1
+    stats['db_ms'] += elapsed_ms
+    stats['rows'] += max(cursor.rowcount or 0, 0)
+    if elapsed_ms > stats['slowest_ms']:
+        stats['slowest_ms'] = elapsed_ms
+        stats['slowest_sql'] = statement[:500]
+    if 'statements' in stats:
+        # Full statement capture, enabled by tools such as scripts/check_query_plans.py
+        stats['statements'].append(statement)
+
+    if elapsed_ms >= settings['slow_query_ms']:
+        log_slow_query(cursor.connection, statement, elapsed_ms)
+
+
+def explain(connection, statement):
+    """Run EXPLAIN for a statement on the connection that ran it; returns the plan rows or None."""
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+    try:
+        with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+            cursor.execute(f"EXPLAIN {statement}")
+            return cursor.fetchall()
+    except pymysql.MySQLError:
+        return None
+
+
+def log_slow_query(connection, statement, elapsed_ms):
+    from flask import request
+
+    plan = explain(connection, statement)
+    lines = [f"{elapsed_ms:.1f}ms {request.method} {request.path}", statement.strip()]
+    for row in plan or []:
+        lines.append("  EXPLAIN table={table} type={type} key={key} rows={rows} extra={extra}".format(
+            table=row.get('table'), type=row.get('type'), key=row.get('key'),
+            rows=row.get('rows'), extra=row.get('Extra')))
+    slow_query_logger.warning('\n'.join(lines))
+
+
+def start_request():
+    """before_request hook: decide whether this request is sampled."""
+    if settings['enabled'] and random.random() < settings['sample_rate']:
+        g.sql_stats = {'count': 0, 'db_ms': 0.0, 'rows': 0, 'slowest_ms': 0.0, 'slowest_sql': None,
+                       'started': time.perf_counter()}
+
+
+def add_server_timing(response):
+    """after_request hook: report the request's SQL totals in a Server-Timing header."""
+    stats = current_stats()
+    if stats is None:
+        return response
+
+    total_ms = (time.perf_counter() - stats['started']) * 1000
+    timings = [
+        f'db;dur={stats["db_ms"]:.2f};desc="{stats["count"]} queries, {stats["rows"]} rows"',
+        f'db-slowest;dur={stats["slowest_ms"]:.2f}',
+        f'app;dur={total_ms:.2f}',
+    ]
+    response.headers.add('Server-Timing', ', '.join(timings))
+    return response
+
+
+def update_settings(enabled=None, sample_rate=None, slow_query_ms=None):
+    """Change the instrumentation settings at runtime; returns the new settings."""
+    if enabled is not None:
+        settings['enabled'] = bool(enabled)
+    if sample_rate is not None:
+        settings['sample_rate'] = min(max(float(sample_rate), 0.0), 1.0)
+    if slow_query_ms is not None:
+        settings['slow_query_ms'] = max(float(slow_query_ms), 0.0)
+    return dict(settings)
+
+
+def init_app(app):
+    """Load the settings from config, register the request hooks and set up the slow-query log."""
+    update_settings(app.config['SQL_STATS_ENABLED'], app.config['SQL_STATS_SAMPLE_RATE'],
+                    app.config['SLOW_QUERY_MS'])
+
+    if not slow_query_logger.handlers:
+        log_file = app.config.get('SLOW_QUERY_LOG')
+        handler = logging.FileHandler(log_file) if log_file else logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s SLOW QUERY %(message)s'))
+        slow_query_logger.addHandler(handler)
+        slow_query_logger.setLevel(logging.WARNING)
+        slow_query_logger.propagate = False
+
+    app.before_request(start_request)
+    app.after_request(add_server_timing)
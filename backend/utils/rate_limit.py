@@ -0,0 +1,254 @@
+"""
+Rate limiting and load shedding.
+
+Every API request is put in an endpoint class (bot, auth, analytics,
+write, default) and checked against a token bucket per class and caller:
+the user id from a valid JWT, otherwise the client IP. Buckets live in
+process memory by default; RATE_LIMIT_BACKEND='mysql' keeps them in a
+shared MEMORY table instead, so the limits hold across workers.
+
+Independently of the buckets, a process serving SHED_MAX_IN_FLIGHT
+requests at once is saturated, and classes are shed by priority as it
+fills up: bot traffic first, then analytics, and booking/chat writes
+only at the hard limit. Shed requests get 503 with Retry-After.
+"""
+import math
+import random
+import threading
+import time
+
+from flask import current_app, g, jsonify, request
+
+from utils.db import get_db_connection
+from utils.decorators import decode_request_token
+from utils.metrics import http_requests_rejected
+
+# endpoint -> class; anything not listed is 'default'
+ENDPOINT_CLASSES = {
+    'ai.ask_ai': 'bot',
+    'auth.login': 'auth',
+    'auth.signup': 'auth',
+    'owner.get_owner_dashboard': 'analytics',
+    'owner.get_owner_analytics': 'analytics',
+    'owner.export_owner_report': 'analytics',
+    'admin.get_admin_dashboard': 'analytics',
+    'admin.get_admin_analytics': 'analytics',
+    'admin.get_admin_users': 'analytics',
+    'admin.get_admin_owners': 'analytics',
+    'admin.get_admin_venues': 'analytics',
+    'admin.get_admin_bookings': 'analytics',
+    'admin.get_admin_payments': 'analytics',
+    'admin.get_admin_logs': 'analytics',
+    'admin.get_admin_reviews': 'analytics',
+    'admin.export_admin_report': 'analytics',
+    'bookings.create_booking': 'write',
+    'venues.create_review': 'write',
+    'users.create_conversation': 'write',
+}
+
+# class -> (burst, tokens per minute); overridable with RATE_LIMITS="bot=5/10,auth=10/10"
+DEFAULT_LIMITS = {
+    'bot': (5, 10),
+    'auth': (10, 10),
+    'analytics': (30, 60),
+    'write': (20, 60),
+    'default': (120, 600),
+}
+
+# class -> share of SHED_MAX_IN_FLIGHT above which its requests are shed
+SHED_THRESHOLDS = {
+    'bot': 0.5,
+    'analytics': 0.75,
+    'default': 0.9,
+    'auth': 0.9,
+    'write': 1.0,
+}
+
+EXEMPT_ENDPOINTS = ('metrics', 'static', 'local_media')
+
+_in_flight = 0
+
+
+# ----------------------------------------------------------------------------
+# BACKENDS
+# ----------------------------------------------------------------------------
+
+class MemoryBackend:
+    """Token buckets in a process-local dict (one set of limits per worker)."""
+
+    def __init__(self, max_size=100000):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self.max_size = max_size
+
+    def take(self, key, burst, per_second):
+        """Take one token from key's bucket; returns (allowed, seconds until a token is available)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            if key not in self._buckets and len(self._buckets) >= self.max_size:
+                self._prune(now)
+            self._buckets[key] = (tokens, now)
+        return allowed, 0 if allowed else (1 - tokens) / per_second
+
+    def _prune(self, now):
+        # With the default limits a bucket idle for a minute is full again, so dropping it is free
+        for key in [k for k, (_, updated) in self._buckets.items() if now - updated > 60]:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_size:
+            del self._buckets[next(iter(self._buckets))]
+
+
+class MySQLBackend:
+    """
+    Token buckets in the rate_limit_buckets MEMORY table, shared by all workers.
+
+    The refill and the conditional take are single statements, so
+    concurrent workers never hand out the same token.
+    """
+
+    PRUNE_PROBABILITY = 0.001
+
+    def take(self, key, burst, per_second):
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO rate_limit_buckets (bucket_key, tokens, updated_at)
+                VALUES (%s, %s, NOW(6))
+                ON DUPLICATE KEY UPDATE
+                    tokens = LEAST(%s, tokens + TIMESTAMPDIFF(MICROSECOND, updated_at, NOW(6)) / 1000000 * %s),
+                    updated_at = NOW(6)
+            """, (key, burst, burst, per_second))
+            cursor.execute("""
+                UPDATE rate_limit_buckets SET tokens = tokens - 1
+                WHERE bucket_key = %s AND tokens >= 1
+            """, (key,))
+            allowed = cursor.rowcount == 1
+
+            retry_after = 0
+            if not allowed:
+                cursor.execute("SELECT tokens FROM rate_limit_buckets WHERE bucket_key = %s", (key,))
+                row = cursor.fetchone()
+                retry_after = (1 - (row['tokens'] if row else 0)) / per_second
+
+            if random.random() < self.PRUNE_PROBABILITY:
+                cursor.execute("DELETE FROM rate_limit_buckets WHERE updated_at < NOW(6) - INTERVAL 1 HOUR")
+            conn.commit()
+            return allowed, retry_after
+        finally:
+            cursor.close()
+            conn.close()
+
+
+_backends = {}
+
+
+def _get_backend():
+    """Create the configured backend lazily so it picks up the app config."""
+    name = current_app.config.get('RATE_LIMIT_BACKEND', 'memory')
+    if name not in _backends:
+        _backends[name] = MySQLBackend() if name == 'mysql' else MemoryBackend()
+    return _backends[name]
+
+
+def _limits():
+    limits = dict(DEFAULT_LIMITS)
+    for item in (current_app.config.get('RATE_LIMITS') or '').split(','):
+        if '=' in item:
+            limit_class, value = item.split('=', 1)
+            burst, per_minute = value.split('/')
+            limits[limit_class.strip()] = (int(burst), int(per_minute))
+    return limits
+
+
+# ----------------------------------------------------------------------------
+# CHECKS
+# ----------------------------------------------------------------------------
+
+def endpoint_class(endpoint):
+    return ENDPOINT_CLASSES.get(endpoint, 'default')
+
+
+def caller_identity():
+    """'user:<id>' for a request with a valid JWT, otherwise 'ip:<address>'."""
+    user_id = getattr(request, 'user_id', None)
+    if user_id is None:
+        # The JWT is decoded once per request and reused by token_required
+        data = decode_request_token()
+        user_id = data.get('user_id') if data else None
+    if user_id is not None:
+        return f"user:{user_id}"
+    return f"ip:{request.remote_addr}"
+
+
+def check(limit_class, identity, in_flight=None):
+    """
+    Decide whether a call of limit_class by identity may proceed.
+
+    Args:
+        limit_class (str): Endpoint class (a key of DEFAULT_LIMITS).
+        identity (str): Caller key, e.g. 'user:12' or 'ip:10.0.0.1'.
+        in_flight (int, optional): Requests currently being served (defaults to this process's count).
+
+    Returns:
+        tuple: (status, error message, retry after seconds) when rejected, else None.
+    """
+    if not current_app.config.get('RATE_LIMIT_ENABLED', True):
+        return None
+
+    in_flight = _in_flight if in_flight is None else in_flight
+    max_in_flight = current_app.config.get('SHED_MAX_IN_FLIGHT', 200)
+    if in_flight > max_in_flight * SHED_THRESHOLDS.get(limit_class, 0.9):
+        http_requests_rejected.inc(limit_class, 'shed')
+        return 503, 'Server busy, please try again', 1
+
+    burst, per_minute = _limits().get(limit_class, DEFAULT_LIMITS['default'])
+    try:
+        allowed, retry_after = _get_backend().take(f"{limit_class}:{identity}", burst, per_minute / 60)
+    except Exception as e:
+        # Fail open: an unavailable shared backend must not take the API down with it
+        print(f"Rate limit backend error: {str(e)}")
+        return None
+
+    if allowed:
+        return None
+    http_requests_rejected.inc(limit_class, 'rate_limited')
+    return 429, 'Too many requests, please slow down', max(1, math.ceil(retry_after))
+
+
+# ----------------------------------------------------------------------------
+# FLASK INTEGRATION
+# ----------------------------------------------------------------------------
+
+def start_request():
+    global _in_flight
+    if request.method == 'OPTIONS' or request.endpoint in EXEMPT_ENDPOINTS:
+        return None
+
+    _in_flight += 1
+    g.rate_limit_counted = True
+
+    rejection = check(endpoint_class(request.endpoint), caller_identity(), _in_flight - 1)
+    if rejection:
+        status, error, retry_after = rejection
+        response = jsonify({'error': error})
+        response.headers['Retry-After'] = str(retry_after)
+        return response, status
+    return None
+
+
+def finish_request(exc=None):
+    global _in_flight
+    if g.pop('rate_limit_counted', False):
+        _in_flight -= 1
+
+
+def init_app(app):
+    """Register the request hooks that apply rate limits and load shedding."""
+    app.before_request(start_request)
+    app.teardown_request(finish_request)
@@ -0,0 +1,190 @@
+"""
+"Similar venues" and "recommended for you", served from memory.
+
+Neighbour lists are precomputed offline (utils/venue_similarity.py, run
+nightly by scripts/build_recommendations.py) into venue_similarities.
+Each process keeps that table and the listing cards of active venues in
+memory, so serving a request is a few dictionary lookups:
+
+- similar_venues(venue_id) is a stored neighbour list,
+- recommend(history) adds up the neighbour scores of the venues a user has
+  booked or reviewed, weighted like the offline job, and skips those venues.
+
+The snapshot is reloaded in a background task once it is older than
+RECOMMENDATIONS_RELOAD_INTERVAL seconds; requests keep using the previous
+snapshot meanwhile. Only the first request of a process waits for a load.
+"""
+import heapq
+import math
+import threading
+import time
+from operator import itemgetter
+
+from flask import current_app
+
+from extensions import socketio
+from utils.db import get_db_connection
+from utils.image_utils import COVER_IMAGE_COLUMNS, apply_cover_image
+
+# Interaction weight of a user for a venue: log1p(bookings) + REVIEW_WEIGHT * rating / 5
+REVIEW_WEIGHT = 0.5
+
+# Most recent venues of a user that feed "recommended for you"
+HISTORY_LIMIT = 50
+
+_lock = threading.Lock()
+_loading = False
+
+# Replaced as a whole by _load(), never mutated
+_snapshot = {'loaded_at': 0, 'neighbours': {}, 'cards': {}, 'popular': []}
+
+
+def interaction_weight(bookings, rating):
+    """Weight of one user/venue interaction (bookings not rejected, best review rating or None)."""
+    return math.log1p(bookings or 0) + (REVIEW_WEIGHT * rating / 5 if rating else 0)
+
+
+def _load():
+    """Read venue_similarities and the active venue cards into a new snapshot."""
+    conn = get_db_connection(read_only=True)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"""
+            SELECT v.venue_id, v.name, v.city, v.type, v.capacity, v.base_price,
+                   v.rating, v.review_count, {COVER_IMAGE_COLUMNS}
+            FROM venues v
+            LEFT JOIN venue_images ci ON ci.image_id = v.cover_image_id
+            WHERE v.status = 'active'
+        """)
+        cards = {row['venue_id']: apply_cover_image(row) for row in cursor.fetchall()}
+
+        cursor.execute("""
+            SELECT venue_id, neighbour_id, score
+            FROM venue_similarities
+            ORDER BY venue_id, position
+        """)
+        neighbours = {}
+        for row in cursor.fetchall():
+            if row['neighbour_id'] in cards:
+                neighbours.setdefault(row['venue_id'], []).append((row['neighbour_id'], float(row['score'])))
+    finally:
+        cursor.close()
+        conn.close()
+
+    # Fallback for users without history: best rated, then most reviewed
+    popular = sorted(cards, key=lambda venue_id: (float(cards[venue_id]['rating'] or 0),
+                                                  cards[venue_id]['review_count']), reverse=True)
+    return {
+        'loaded_at': time.time(),
+        'neighbours': neighbours,
+        'cards': cards,
+        'popular': popular[:100],
+    }
+
+
+def _reload(app):
+    """Background task: replace the snapshot."""
+    global _snapshot, _loading
+    try:
+        with app.app_context():
+            _snapshot = _load()
+    except Exception as e:
+        print(f"Recommendations reload failed: {str(e)}")
+    finally:
+        with _lock:
+            _loading = False
+
+
+def _current():
+    """The current snapshot, loading it on first use and refreshing it in the background when stale."""
+    global _loading
+    snapshot = _snapshot
+    if time.time() - snapshot['loaded_at'] < current_app.config.get('RECOMMENDATIONS_RELOAD_INTERVAL', 900):
+        return snapshot
+
+    with _lock:
+        if _loading:
+            return snapshot
+        _loading = True
+
+    if not snapshot['loaded_at']:
+        _reload(current_app._get_current_object())
+        return _snapshot
+    socketio.start_background_task(_reload, current_app._get_current_object())
+    return snapshot
+
+
+def _cards(snapshot, scored):
+    return [dict(snapshot['cards'][venue_id], score=round(score, 4)) for venue_id, score in scored]
+
+
+def similar_venues(venue_id, limit=6):
+    """
+    Precomputed neighbours of a venue, most similar first.
+
+    Returns:
+        list: Venue cards with a 'score' field.
+    """
+    snapshot = _current()
+    return _cards(snapshot, snapshot['neighbours'].get(venue_id, [])[:limit])
+
+
+def user_history(user_id):
+    """
+    [(venue_id, weight)] for the venues a user booked (not rejected) or reviewed,
+    most recent first.
+    """
+    conn = get_db_connection(read_only=True)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT venue_id, SUM(bookings) as bookings, MAX(rating) as rating, MAX(last_at) as last_at
+            FROM (
+                SELECT venue_id, COUNT(*) as bookings, NULL as rating, MAX(created_at) as last_at
+                FROM bookings
+                WHERE user_id = %s AND status != 'rejected'
+                GROUP BY venue_id
+                UNION ALL
+                SELECT venue_id, 0, MAX(rating), MAX(review_date)
+                FROM venue_reviews
+                WHERE user_id = %s
+                GROUP BY venue_id
+            ) h
+            GROUP BY venue_id
+            ORDER BY last_at DESC
+            LIMIT %s
+        """, (user_id, user_id, HISTORY_LIMIT))
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+    return [(row['venue_id'], interaction_weight(row['bookings'], row['rating'])) for row in rows]
+
+
+def recommend(history, limit=10):
+    """
+    Venues to recommend for an interaction history.
+
+    Args:
+        history (list): [(venue_id, weight)] as returned by user_history().
+        limit (int): Number of venues to return.
+
+    Returns:
+        tuple: (venue cards with a 'score' field, True if personalized). Popular
+            venues fill the list when the history has too few neighbours.
+    """
+    snapshot = _current()
+    seen = {venue_id for venue_id, _ in history}
+
+    scores = {}
+    for venue_id, weight in history:
+        for neighbour_id, score in snapshot['neighbours'].get(venue_id, ()):
+            if neighbour_id not in seen:
+                scores[neighbour_id] = scores.get(neighbour_id, 0) + weight * score
+    picked = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+    personalized = bool(picked)
+
+    if len(picked) < limit:
+        taken = seen | {venue_id for venue_id, _ in picked}
+        picked += [(venue_id, 0.0) for venue_id in snapshot['popular'] if venue_id not in taken][:limit - len(picked)]
+    return _cards(snapshot, picked), personalized
@@ -0,0 +1,79 @@
+"""
+Incremental venue rating aggregates.
+
+venues carries review_count, rating_sum and a star histogram
+(rating_1 .. rating_5) next to the rating average, all maintained by a
+single-row UPDATE per review insert or delete in the same transaction as
+the review. Rating a venue therefore costs the same whether it has ten
+reviews or ten thousand, and the detail page can show the breakdown
+without scanning venue_reviews.
+"""
+
+HISTOGRAM_COLUMNS = {star: f"rating_{star}" for star in range(1, 6)}
+
+
+def record_review(cursor, venue_id, rating, delta=1):
+    """
+    Apply one review (delta=1) or its removal (delta=-1) to the venue's aggregates.
+
+    Raises:
+        ValueError: If rating is not a whole number of stars from 1 to 5.
+    """
+    if rating not in HISTOGRAM_COLUMNS:
+        raise ValueError('Rating must be 1 to 5 stars')
+    star_column = HISTOGRAM_COLUMNS[rating]
+
+    # MySQL applies single-table SET assignments left to right, so rating sees the new totals
+    cursor.execute(f"""
+        UPDATE venues
+        SET review_count = review_count + %s,
+            rating_sum = rating_sum + %s,
+            {star_column} = {star_column} + %s,
+            rating = IF(review_count > 0, rating_sum / review_count, 0)
+        WHERE venue_id = %s
+    """, (delta, delta * rating, delta, venue_id))
+
+
+def rating_summary(venue):
+    """
+    Pop the aggregate columns from a venues row and return them as a summary.
+
+    Returns:
+        dict: {'count', 'average', 'histogram': {'1'..'5': count}}
+    """
+    count = venue.pop('review_count', 0) or 0
+    total = venue.pop('rating_sum', 0) or 0
+    histogram = {str(star): venue.pop(column, 0) or 0 for star, column in HISTOGRAM_COLUMNS.items()}
+    return {
+        'count': count,
+        'average': round(total / count, 2) if count else 0,
+        'histogram': histogram,
+    }
+
+
+def rebuild(cursor, venue_id=None):
+    """
+    Recompute the aggregates from venue_reviews (all venues, or one).
+
+    Venues without reviews keep their current rating.
+    """
+    where = "WHERE v.venue_id = %s" if venue_id else ""
+    cursor.execute(f"""
+        UPDATE venues v
+        LEFT JOIN (
+            SELECT venue_id, COUNT(*) as review_count, SUM(rating) as rating_sum,
+                   SUM(rating = 1) as r1, SUM(rating = 2) as r2, SUM(rating = 3) as r3,
+                   SUM(rating = 4) as r4, SUM(rating = 5) as r5
+            FROM venue_reviews
+            GROUP BY venue_id
+        ) r ON r.venue_id = v.venue_id
+        SET v.review_count = COALESCE(r.review_count, 0),
+            v.rating_sum = COALESCE(r.rating_sum, 0),
+            v.rating_1 = COALESCE(r.r1, 0),
+            v.rating_2 = COALESCE(r.r2, 0),
+            v.rating_3 = COALESCE(r.r3, 0),
+            v.rating_4 = COALESCE(r.r4, 0),
+            v.rating_5 = COALESCE(r.r5, 0),
+            v.rating = IF(r.review_count > 0, r.rating_sum / r.review_count, v.rating)
+        {where}
+    """, (venue_id,) if venue_id else None)
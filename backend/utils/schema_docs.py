@@ -10,14 +10,14 @@ Total Tables: 16
 === CORE TABLES ===
 
 1. users
-   - user_id (PK), name, email, phone, role (user/owner/admin/bot), created_at
+   - user_id (PK), name, email, phone, role (user/owner/admin/bot), status (active/blocked), created_at
 
 2. owners  
    - owner_id (PK), user_id (FK), business_name, verification_status, joined_at
 
 3. venues
    - venue_id (PK), owner_id (FK), name, type, address, city, capacity
-   - base_price, rating, description, status (active/inactive/pending/rejected), created_at
+   - base_price, rating, description, status (active/inactive/pending/rejected), cover_image_id, created_at
 
 4. bookings
    - booking_id (PK), user_id (FK), venue_id (FK), event_date, slot (full-day/morning/evening)
@@ -33,7 +33,7 @@ Total Tables: 16
 === VENUE DETAILS ===
 
 7. venue_images
-   - image_id (PK), venue_id (FK), image_url, uploaded_at
+   - image_id (PK), venue_id (FK), image_url, thumb_url, card_url, full_url, uploaded_at
 
 8. venue_facilities
    - facility_id (PK), facility_name, extra_price
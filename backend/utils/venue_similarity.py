@@ -0,0 +1,417 @@
+"""
+Offline item-item venue similarity (NumPy).
+
+refresh() is run nightly by scripts/build_recommendations.py and stores the
+TOP_K most similar venues of every active venue in venue_similarities,
+which utils/recommendations.py serves from memory. The score of venue j for
+venue i is
+
+    COOCCURRENCE_WEIGHT * cosine of their user interaction vectors
+    + (1 - COOCCURRENCE_WEIGHT) * cosine of their attribute vectors
+    + RATING_PRIOR * rating_j / 5
+
+- interactions: log1p(bookings not rejected) + REVIEW_WEIGHT * rating / 5
+  per user and venue; co-occurrence is computed from (venue, venue) pairs
+  of each user's venues, so it never builds the user x venue matrix,
+- attributes: city and type one-hot, capacity and price band one-hot with
+  half weight on the neighbouring bands.
+
+Incremental runs recompute only the rows of dirty venues: new venues,
+venues whose attributes or rating changed (venue_similarity_inputs keeps
+a signature per venue) and venues booked or reviewed since the previous
+run started. A score between two clean venues cannot have changed, so a
+clean row is patched by merging fresh scores for the dirty columns into
+its stored list, and recomputed only when that merge cannot guarantee its
+top-K (a stored dirty neighbour dropped below the old K-th score).
+Bookings rejected and co-reviews deleted after the fact are only picked
+up by a --full run.
+"""
+import numpy as np
+
+from utils.recommendations import interaction_weight
+
+TOP_K = 20
+COOCCURRENCE_WEIGHT = 0.7
+RATING_PRIOR = 0.05
+
+ATTRIBUTE_WEIGHTS = {'city': 1.0, 'type': 1.0, 'capacity': 0.7, 'price': 0.7}
+# Band edges (guests, PKR); a venue's adjacent bands get ADJACENT_BAND of its weight
+CAPACITY_BANDS = (100, 250, 500, 1000)
+PRICE_BANDS = (100000, 250000, 500000, 1000000)
+ADJACENT_BAND = 0.5
+
+# Users with more venues only contribute their MAX_VENUES_PER_USER strongest ones
+MAX_VENUES_PER_USER = 100
+# Rows scored per NumPy block (BLOCK_ROWS x venues float32 matrices)
+BLOCK_ROWS = 512
+# Above this share of dirty venues an incremental run recomputes everything
+FULL_REFRESH_FRACTION = 0.25
+
+
+# ----------------------------------------------------------------------------
+# VECTORS
+# ----------------------------------------------------------------------------
+
+def _band(values, edges):
+    return np.digitize(np.nan_to_num(np.asarray(values, dtype=np.float64)), edges)
+
+
+def signature(venue):
+    """Attribute signature stored in venue_similarity_inputs; a change makes the venue dirty."""
+    capacity = int(_band([venue['capacity'] or 0], CAPACITY_BANDS)[0])
+    price = int(_band([venue['base_price'] or 0], PRICE_BANDS)[0])
+    return f"{venue['city'] or ''}|{venue['type'] or ''}|{capacity}|{price}|{float(venue['rating'] or 0):.1f}"
+
+
+def _categories(values, weight):
+    """One-hot columns of a categorical attribute; missing values match nothing."""
+    values = np.array([value or '' for value in values], dtype=object)
+    labels, codes = np.unique(values, return_inverse=True)
+    matrix = np.zeros((len(values), len(labels)), dtype=np.float32)
+    matrix[np.arange(len(values)), codes] = weight
+    matrix[values == ''] = 0
+    return matrix
+
+
+def _bands(values, edges, weight):
+    """One-hot band columns with ADJACENT_BAND weight on the bands either side."""
+    bands = _band(values, edges)
+    rows = np.arange(len(bands))
+    matrix = np.zeros((len(bands), len(edges) + 1), dtype=np.float32)
+    matrix[rows, bands] = weight
+    lower, upper = bands > 0, bands < len(edges)
+    matrix[rows[lower], bands[lower] - 1] = weight * ADJACENT_BAND
+    matrix[rows[upper], bands[upper] + 1] = weight * ADJACENT_BAND
+    return matrix
+
+
+def attribute_vectors(venues):
+    """Unit-length attribute vectors, one row per venue."""
+    matrix = np.hstack([
+        _categories([venue['city'] for venue in venues], ATTRIBUTE_WEIGHTS['city']),
+        _categories([venue['type'] for venue in venues], ATTRIBUTE_WEIGHTS['type']),
+        _bands([venue['capacity'] or 0 for venue in venues], CAPACITY_BANDS, ATTRIBUTE_WEIGHTS['capacity']),
+        _bands([venue['base_price'] or 0 for venue in venues], PRICE_BANDS, ATTRIBUTE_WEIGHTS['price']),
+    ])
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1)
+
+
+def cooccurrence(users, venues, weights, n_venues):
+    """
+    Cosine similarity of venue interaction vectors, as CSR arrays.
+
+    Args:
+        users, venues, weights: One entry per (user, venue) interaction;
+            venues are row indexes 0..n_venues-1.
+
+    Returns:
+        tuple: (indptr, columns, values) - row i holds columns[indptr[i]:indptr[i + 1]].
+    """
+    users = np.asarray(users, dtype=np.int64)
+    venues = np.asarray(venues, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.float64)
+
+    # Group by user, strongest first, and cap heavy users
+    order = np.lexsort((-weights, users))
+    users, venues, weights = users[order], venues[order], weights[order]
+    starts = np.flatnonzero(np.r_[True, users[1:] != users[:-1]]) if len(users) else np.array([], dtype=np.int64)
+    counts = np.diff(np.r_[starts, len(users)])
+    rank = np.arange(len(users)) - np.repeat(starts, counts)
+    keep = rank < MAX_VENUES_PER_USER
+    users, venues, weights = users[keep], venues[keep], weights[keep]
+    counts = np.minimum(counts, MAX_VENUES_PER_USER)
+    starts = np.r_[0, np.cumsum(counts)[:-1]] if len(counts) else starts
+
+    # Every ordered pair of venues of the same user
+    per_item = np.repeat(counts, counts)
+    left = np.repeat(np.arange(len(users)), per_item)
+    offset = np.arange(len(left)) - np.repeat(np.cumsum(per_item) - per_item, per_item)
+    right = np.repeat(np.repeat(starts, counts), per_item) + offset
+    pairs = venues[left] != venues[right]
+    left, right = left[pairs], right[pairs]
+
+    keys, inverse = np.unique(venues[left] * n_venues + venues[right], return_inverse=True)
+    dots = np.bincount(inverse, weights=weights[left] * weights[right])
+    norms = np.sqrt(np.bincount(venues, weights=weights ** 2, minlength=n_venues))
+    rows, columns = keys // n_venues, keys % n_venues
+    values = (dots / (norms[rows] * norms[columns])).astype(np.float32)
+
+    indptr = np.searchsorted(rows, np.arange(n_venues + 1))
+    return indptr, columns, values
+
+
+def scores(rows, columns, vectors, cooc, prior):
+    """
+    Dense similarity scores of rows x columns (venue indexes); a venue never scores itself.
+    """
+    block = (1 - COOCCURRENCE_WEIGHT) * (vectors[rows] @ vectors[columns].T)
+
+    indptr, cooc_columns, cooc_values = cooc
+    starts, lengths = indptr[rows], indptr[rows + 1] - indptr[rows]
+    entries = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+    position = np.full(len(prior), -1)
+    position[columns] = np.arange(len(columns))
+    block_rows = np.repeat(np.arange(len(rows)), lengths)
+    block_columns = position[cooc_columns[entries]]
+    inside = block_columns >= 0
+    block[block_rows[inside], block_columns[inside]] += COOCCURRENCE_WEIGHT * cooc_values[entries[inside]]
+
+    block += RATING_PRIOR * prior[columns]
+    self_rows = np.flatnonzero(position[rows] >= 0)
+    block[self_rows, position[rows[self_rows]]] = -np.inf
+    return block
+
+
+def top_k(block, candidates, k):
+    """
+    The k best positive scores per row, best first.
+
+    Args:
+        block: Scores, one row per venue.
+        candidates: Venue index of each column (1-D), or per cell (same shape as block).
+
+    Returns:
+        tuple: (venue indexes, scores), both rows x k; missing entries are -1 / -inf.
+    """
+    k = min(k, block.shape[1])
+    best = np.argpartition(-block, k - 1, axis=1)[:, :k] if k < block.shape[1] else np.tile(np.arange(k), (len(block), 1))
+    best_scores = np.take_along_axis(block, best, axis=1)
+    venues = np.take_along_axis(candidates, best, axis=1) if candidates.ndim == 2 else candidates[best]
+
+    # Best first, ties by venue so full and incremental runs store the same order
+    order = np.lexsort((venues, -best_scores), axis=1)
+    venues = np.take_along_axis(venues, order, axis=1)
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+    missing = ~(best_scores > 0)
+    venues[missing] = -1
+    best_scores[missing] = -np.inf
+    return venues, best_scores
+
+
+# ----------------------------------------------------------------------------
+# REFRESH
+# ----------------------------------------------------------------------------
+
+def _blocks(rows):
+    for start in range(0, len(rows), BLOCK_ROWS):
+        yield rows[start:start + BLOCK_ROWS]
+
+
+def _compute_rows(rows, vectors, cooc, prior, k, results):
+    everything = np.arange(len(prior))
+    for block_rows in _blocks(rows):
+        venues, block_scores = top_k(scores(block_rows, everything, vectors, cooc, prior), everything, k)
+        for row, row_venues, row_scores in zip(block_rows, venues, block_scores):
+            results[int(row)] = (row_venues, row_scores)
+
+
+def _merge_rows(rows, dirty, stored, vectors, cooc, prior, k, results):
+    """
+    Patch clean rows with fresh scores for the dirty columns.
+
+    Returns:
+        ndarray: Rows whose top-K could not be proven and need a full recompute.
+    """
+    is_dirty = np.zeros(len(prior), dtype=bool)
+    is_dirty[dirty] = True
+    unproven = []
+
+    for block_rows in _blocks(rows):
+        old_venues = np.array([stored[int(row)][0] for row in block_rows])
+        old_scores = np.array([stored[int(row)][1] for row in block_rows])
+
+        kept_scores = np.where((old_venues >= 0) & ~is_dirty[np.maximum(old_venues, 0)], old_scores, -np.inf)
+        fresh = scores(block_rows, dirty, vectors, cooc, prior)
+        candidates = np.hstack([old_venues, np.broadcast_to(dirty, fresh.shape)])
+        venues, block_scores = top_k(np.hstack([kept_scores, fresh]), candidates, k)
+
+        # Venues never stored score at most the old K-th score (or 0 when the list was short)
+        bound = np.where(old_scores[:, -1] > -np.inf, old_scores[:, -1], 0)
+        proven = np.maximum(block_scores[:, -1], 0) >= bound
+        for row, row_venues, row_scores, ok in zip(block_rows, venues, block_scores, proven):
+            if ok:
+                results[int(row)] = (row_venues, row_scores)
+            else:
+                unproven.append(int(row))
+    return np.array(unproven, dtype=np.int64)
+
+
+def _load_inputs(cursor):
+    cursor.execute("""
+        SELECT venue_id, city, type, capacity, base_price, rating
+        FROM venues
+        WHERE status = 'active'
+        ORDER BY venue_id
+    """)
+    venues = cursor.fetchall()
+
+    cursor.execute("""
+        SELECT user_id, venue_id, SUM(bookings) as bookings, MAX(rating) as rating
+        FROM (
+            SELECT user_id, venue_id, COUNT(*) as bookings, NULL as rating
+            FROM bookings
+            WHERE status != 'rejected'
+            GROUP BY user_id, venue_id
+            UNION ALL
+            SELECT user_id, venue_id, 0, MAX(rating)
+            FROM venue_reviews
+            GROUP BY user_id, venue_id
+        ) i
+        GROUP BY user_id, venue_id
+    """)
+    interactions = cursor.fetchall()
+    return venues, interactions
+
+
+def _touched_since(cursor, since):
+    cursor.execute("""
+        SELECT DISTINCT venue_id FROM bookings WHERE created_at >= %s
+        UNION
+        SELECT DISTINCT venue_id FROM venue_reviews WHERE review_date >= %s
+    """, (since, since))
+    return {row['venue_id'] for row in cursor.fetchall()}
+
+
+def _stored_neighbours(cursor, index, k):
+    """
+    {row: (venue indexes, scores)} of the stored lists, padded with -1 / -inf
+    to k entries; neighbours that are no longer active keep their score but
+    get index -2.
+    """
+    cursor.execute("SELECT venue_id, neighbour_id, score FROM venue_similarities ORDER BY venue_id, position")
+    lists = {}
+    for row in cursor.fetchall():
+        if row['venue_id'] in index:
+            lists.setdefault(index[row['venue_id']], []).append((index.get(row['neighbour_id'], -2), row['score']))
+
+    stored = {}
+    for row, entries in lists.items():
+        entries = entries[:k]
+        venues = np.full(k, -1, dtype=np.int64)
+        values = np.full(k, -np.inf, dtype=np.float32)
+        venues[:len(entries)] = [venue for venue, _ in entries]
+        values[:len(entries)] = [score for _, score in entries]
+        stored[row] = (venues, values)
+    return stored
+
+
+def _write(cursor, venue_ids, rows, results, stored):
+    """Replace the stored lists that changed; returns how many were written."""
+    changed = []
+    for row in rows:
+        venues, values = results[row]
+        old = stored.get(row)
+        if old is None or not np.array_equal(old[0], venues) or not np.allclose(old[1], values, equal_nan=True):
+            changed.append(row)
+
+    for start in range(0, len(changed), BLOCK_ROWS):
+        batch = changed[start:start + BLOCK_ROWS]
+        placeholders = ', '.join(['%s'] * len(batch))
+        cursor.execute(f"DELETE FROM venue_similarities WHERE venue_id IN ({placeholders})",
+                       [venue_ids[row] for row in batch])
+        values = [
+            (venue_ids[row], position, venue_ids[venue], float(score))
+            for row in batch
+            for position, (venue, score) in enumerate(zip(*results[row]))
+            if venue >= 0
+        ]
+        if values:
+            cursor.executemany("""
+                INSERT INTO venue_similarities (venue_id, position, neighbour_id, score)
+                VALUES (%s, %s, %s, %s)
+            """, values)
+    return len(changed)
+
+
+def refresh(cursor, full=False, k=TOP_K):
+    """
+    Recompute venue neighbours and store the lists that changed.
+
+    The caller commits. Incremental unless full is set, there is no previous
+    run, or too many venues are dirty.
+
+    Returns:
+        dict: Run summary (mode, venues, recomputed, merged, written).
+    """
+    cursor.execute("SELECT NOW() as now")
+    started_at = cursor.fetchone()['now']
+    cursor.execute("""
+        SELECT started_at FROM venue_similarity_runs
+        WHERE finished_at IS NOT NULL
+        ORDER BY run_id DESC
+        LIMIT 1
+    """)
+    previous = cursor.fetchone()
+
+    venues, interactions = _load_inputs(cursor)
+    venue_ids = [venue['venue_id'] for venue in venues]
+    index = {venue_id: row for row, venue_id in enumerate(venue_ids)}
+    signatures = [signature(venue) for venue in venues]
+
+    cursor.execute("SELECT venue_id, signature FROM venue_similarity_inputs")
+    stored_signatures = {row['venue_id']: row['signature'] for row in cursor.fetchall()}
+    gone = [venue_id for venue_id in stored_signatures if venue_id not in index]
+
+    vectors = attribute_vectors(venues)
+    prior = np.array([float(venue['rating'] or 0) / 5 for venue in venues], dtype=np.float32)
+    known = [row for row in interactions if row['venue_id'] in index]
+    cooc = cooccurrence(
+        [row['user_id'] for row in known],
+        [index[row['venue_id']] for row in known],
+        [interaction_weight(float(row['bookings'] or 0), row['rating']) for row in known],
+        len(venues)
+    )
+
+    all_rows = np.arange(len(venues))
+    results = {}
+    if full or not previous:
+        dirty = all_rows
+    else:
+        touched = _touched_since(cursor, previous['started_at'])
+        dirty = np.array([
+            row for row, venue_id in enumerate(venue_ids)
+            if stored_signatures.get(venue_id) != signatures[row] or venue_id in touched
+        ], dtype=np.int64)
+        # Gone venues only change rows that listed them, which the merge handles
+        if len(dirty) > FULL_REFRESH_FRACTION * len(venues):
+            dirty = all_rows
+
+    stored = _stored_neighbours(cursor, index, k)
+    mode = 'full' if len(dirty) == len(venues) else 'incremental'
+    _compute_rows(dirty, vectors, cooc, prior, k, results)
+
+    merged, recomputed = 0, len(dirty)
+    if mode == 'incremental':
+        clean = np.setdiff1d(all_rows, dirty)
+        never_stored = np.array([row for row in clean if int(row) not in stored], dtype=np.int64)
+        clean = np.setdiff1d(clean, never_stored)
+        unproven = _merge_rows(clean, dirty, stored, vectors, cooc, prior, k, results)
+        recompute = np.concatenate([never_stored, unproven])
+        _compute_rows(recompute, vectors, cooc, prior, k, results)
+        merged, recomputed = len(clean) - len(unproven), recomputed + len(recompute)
+
+    written = _write(cursor, venue_ids, [int(row) for row in all_rows], results, stored)
+
+    for start in range(0, len(gone), BLOCK_ROWS):
+        batch = gone[start:start + BLOCK_ROWS]
+        placeholders = ', '.join(['%s'] * len(batch))
+        cursor.execute(f"DELETE FROM venue_similarities WHERE venue_id IN ({placeholders})", batch)
+        cursor.execute(f"DELETE FROM venue_similarity_inputs WHERE venue_id IN ({placeholders})", batch)
+
+    changed_signatures = [
+        (venue_id, signatures[row]) for row, venue_id in enumerate(venue_ids)
+        if stored_signatures.get(venue_id) != signatures[row]
+    ]
+    if changed_signatures:
+        cursor.executemany("""
+            INSERT INTO venue_similarity_inputs (venue_id, signature) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE signature = VALUES(signature)
+        """, changed_signatures)
+
+    cursor.execute("""
+        INSERT INTO venue_similarity_runs (started_at, finished_at, mode, venues, recomputed, written)
+        VALUES (%s, NOW(), %s, %s, %s, %s)
+    """, (started_at, mode, len(venues), recomputed, written))
+
+    return {'mode': mode, 'venues': len(venues), 'recomputed': recomputed, 'merged': merged, 'written': written}
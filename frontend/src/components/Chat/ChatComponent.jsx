@@ -283,9 +283,11 @@ const FloatingChat = () => {
             partnerId = activeConversation.user_id;
         }
 
-        if (partnerId) {
-            socket.emit('request_status', { user_id: partnerId });
-        }
+        if (!partnerId) return;
+
+        // Subscriptions live on the server socket, so renew them after a reconnect
+        const subscribe = () => socket.emit('subscribe_presence', { user_ids: [partnerId] });
+        subscribe();
 
         const handleStatusUpdate = (data) => {
             if (String(data.user_id) === String(partnerId)) {
@@ -293,8 +295,11 @@ const FloatingChat = () => {
             }
         };
 
+        socket.on('connect', subscribe);
         socket.on('user_status', handleStatusUpdate);
         return () => {
+            socket.emit('unsubscribe_presence', { user_ids: [partnerId] });
+            socket.off('connect', subscribe);
             socket.off('user_status', handleStatusUpdate);
         };
     }, [socket, activeConversation, user]);
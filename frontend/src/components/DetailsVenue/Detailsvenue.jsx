@@ -10,6 +10,7 @@ import VenueAbout from './VenueAbout';
 import VenueFacilities from './VenueFacilities';
 import VenueReviews from './VenueReviews';
 import BookingSection from './BookingSection';
+import SimilarVenues from './SimilarVenues';
 
 const VenueDetails = () => {
   const { id } = useParams();
@@ -102,20 +103,13 @@ const VenueDetails = () => {
                 <VenueFacilities facilities={venue.facilities} />
               )}
 
-              {venue.reviews && venue.reviews.length > 0 && (
-                <VenueReviews
-                  reviews={venue.reviews}
-                  venueId={id}
-                  onReviewAdded={fetchVenueDetails}
-                />
-              )}
-              {(!venue.reviews || venue.reviews.length === 0) && (
-                <VenueReviews
-                  reviews={[]}
-                  venueId={id}
-                  onReviewAdded={fetchVenueDetails}
-                />
-              )}
+              <VenueReviews
+                reviews={venue.reviews || []}
+                nextCursor={venue.reviews_next_cursor || null}
+                summary={venue.rating_summary || null}
+                venueId={id}
+                onReviewAdded={fetchVenueDetails}
+              />
             </div>
 
             {/* Right Column - Booking Section */}
@@ -123,6 +117,8 @@ const VenueDetails = () => {
               <BookingSection venue={venue} />
             </div>
           </div>
+
+          <SimilarVenues venueId={id} />
         </main>
 
         <Footer />
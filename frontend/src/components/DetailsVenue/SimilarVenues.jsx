@@ -0,0 +1,57 @@
+// src/components/DetailsVenue/SimilarVenues.jsx
+import { useEffect, useState } from 'react';
+import PropTypes from 'prop-types';
+import VenueCard from '../venues/VenueCard';
+import { venueService } from '../../services/api';
+
+const FALLBACK_IMAGE = 'https://images.unsplash.com/photo-1570129477492-45c003edd2be?q=80&w=1470&auto=format&fit=crop';
+
+const SimilarVenues = ({ venueId }) => {
+  const [venues, setVenues] = useState([]);
+
+  useEffect(() => {
+    let cancelled = false;
+    venueService.getSimilarVenues(venueId)
+      .then((data) => {
+        if (cancelled) return;
+        setVenues((data.venues || []).map((venue) => ({
+          id: venue.venue_id,
+          name: venue.name,
+          image: venue.image_url || FALLBACK_IMAGE,
+          rating: parseFloat(venue.rating) || 0,
+          price: parseFloat(venue.base_price) || 0,
+          city: venue.city,
+          type: venue.type,
+          capacity: venue.capacity?.toString() || '',
+        })));
+      })
+      .catch((err) => console.error('Error fetching similar venues:', err));
+    return () => {
+      cancelled = true;
+    };
+  }, [venueId]);
+
+  if (venues.length === 0) {
+    return null;
+  }
+
+  return (
+    <section className="mt-12">
+      <h2 className="text-2xl font-bold text-gray-900 mb-8 flex items-center gap-3">
+        <span className="w-1.5 h-8 bg-blue-600 rounded-full"></span>
+        Similar Venues
+      </h2>
+      <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-8">
+        {venues.map((venue, index) => (
+          <VenueCard key={venue.id} venue={venue} index={index} />
+        ))}
+      </div>
+    </section>
+  );
+};
+
+SimilarVenues.propTypes = {
+  venueId: PropTypes.string.isRequired,
+};
+
+export default SimilarVenues;
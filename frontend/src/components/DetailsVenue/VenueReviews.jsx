@@ -1,16 +1,37 @@
 // src/components/DetailsVenue/VenueReviews.jsx
 import PropTypes from 'prop-types';
 import { Star, User, Send, X } from 'lucide-react';
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 import { venueService } from '../../services/api';
 
-const VenueReviews = ({ reviews, venueId, onReviewAdded }) => {
+const VenueReviews = ({ reviews, nextCursor, summary, venueId, onReviewAdded }) => {
+  const [items, setItems] = useState(reviews);
+  const [cursor, setCursor] = useState(nextCursor);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [showForm, setShowForm] = useState(false);
   const [rating, setRating] = useState(5);
   const [reviewText, setReviewText] = useState('');
   const [submitting, setSubmitting] = useState(false);
   const [error, setError] = useState('');
 
+  useEffect(() => {
+    setItems(reviews);
+    setCursor(nextCursor);
+  }, [reviews, nextCursor]);
+
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const data = await venueService.getVenueReviews(venueId, cursor);
+      setItems((prev) => [...prev, ...(data.items || [])]);
+      setCursor(data.next_cursor || null);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleSubmit = async (e) => {
     e.preventDefault();
     const token = localStorage.getItem('token');
@@ -107,15 +128,42 @@ const VenueReviews = ({ reviews, venueId, onReviewAdded }) => {
         </form>
       )}
 
+      {summary && summary.count > 0 && (
+        <div className="mb-8 flex flex-col sm:flex-row gap-6 items-start sm:items-center">
+          <div className="text-center">
+            <div className="text-4xl font-bold text-gray-900">{summary.average.toFixed(1)}</div>
+            <div className="text-sm text-gray-500">{summary.count} review{summary.count === 1 ? '' : 's'}</div>
+          </div>
+          <div className="flex-1 w-full space-y-1">
+            {[5, 4, 3, 2, 1].map((star) => {
+              const count = summary.histogram[star] || 0;
+              return (
+                <div key={star} className="flex items-center gap-2 text-sm">
+                  <span className="w-3 text-gray-600">{star}</span>
+                  <Star className="w-3 h-3 fill-yellow-400 text-yellow-400" />
+                  <div className="flex-1 h-2 bg-gray-100 rounded-full overflow-hidden">
+                    <div
+                      className="h-full bg-yellow-400"
+                      style={{ width: `${(count / summary.count) * 100}%` }}
+                    />
+                  </div>
+                  <span className="w-10 text-right text-gray-500">{count}</span>
+                </div>
+              );
+            })}
+          </div>
+        </div>
+      )}
+
       <div className="space-y-6">
-        {reviews.length === 0 ? (
+        {items.length === 0 ? (
           <div className="text-center py-8 text-gray-500 italic">
             No reviews yet. Be the first to review!
           </div>
         ) : (
-          reviews.map((review, index) => (
+          items.map((review) => (
             <div
-              key={index}
+              key={review.review_id}
               className="group p-6 rounded-2xl bg-gray-50 hover:bg-white border border-transparent hover:border-gray-100 hover:shadow-md transition-all duration-300"
             >
               <div className="flex items-start justify-between mb-4">
@@ -147,17 +195,36 @@ const VenueReviews = ({ reviews, venueId, onReviewAdded }) => {
           ))
         )}
       </div>
+
+      {cursor && (
+        <div className="mt-6 text-center">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="px-6 py-2 bg-blue-50 text-blue-600 font-bold rounded-lg hover:bg-blue-100 transition-all disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : 'Load more reviews'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
 
 VenueReviews.propTypes = {
   reviews: PropTypes.arrayOf(PropTypes.shape({
+    review_id: PropTypes.number,
     user_name: PropTypes.string,
     review_date: PropTypes.string,
     rating: PropTypes.number,
     review_text: PropTypes.string,
   })).isRequired,
+  nextCursor: PropTypes.string,
+  summary: PropTypes.shape({
+    count: PropTypes.number,
+    average: PropTypes.number,
+    histogram: PropTypes.objectOf(PropTypes.number),
+  }),
   venueId: PropTypes.string.isRequired,
   onReviewAdded: PropTypes.func.isRequired,
 };
@@ -14,7 +14,9 @@ const UserBookingsPage = () => {
     const { user, isAuthenticated } = useAuth();
     const navigate = useNavigate();
     const [bookings, setBookings] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [filterStatus, setFilterStatus] = useState('all');
     const [searchTerm, setSearchTerm] = useState('');
     const [selectedBooking, setSelectedBooking] = useState(null);
@@ -34,6 +36,7 @@ const UserBookingsPage = () => {
                 const data = await userService.getUserBookings(userId, {}, token);
                 // Ensure we handle the response format correctly
                 setBookings(Array.isArray(data) ? data : data.bookings || []);
+                setNextCursor(data.next_cursor || null);
             } catch (error) {
                 console.error("Error fetching bookings:", error);
             } finally {
@@ -46,6 +49,21 @@ const UserBookingsPage = () => {
         }
     }, [user, isAuthenticated, navigate]);
 
+    const loadMore = async () => {
+        try {
+            setLoadingMore(true);
+            const token = localStorage.getItem('token');
+            const userId = user.user_id || user.id;
+            const data = await userService.getUserBookings(userId, { cursor: nextCursor }, token);
+            setBookings(prev => [...prev, ...(data.bookings || [])]);
+            setNextCursor(data.next_cursor || null);
+        } catch (error) {
+            console.error("Error fetching bookings:", error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     // Filter and Search Logic
     const filteredBookings = bookings.filter(booking => {
         const matchesStatus = filterStatus === 'all' || booking.status === filterStatus;
@@ -242,6 +260,17 @@ const UserBookingsPage = () => {
                                 </div>
                             </div>
                         ))}
+                        {nextCursor && (
+                            <div className="text-center pt-2">
+                                <button
+                                    onClick={loadMore}
+                                    disabled={loadingMore}
+                                    className="px-6 py-2 bg-blue-50 text-blue-600 font-bold rounded-lg hover:bg-blue-100 transition-all disabled:opacity-50"
+                                >
+                                    {loadingMore ? 'Loading...' : 'Load more'}
+                                </button>
+                            </div>
+                        )}
                     </div>
                 )}
             </main>
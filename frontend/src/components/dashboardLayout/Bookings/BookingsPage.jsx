@@ -7,7 +7,9 @@ import { CustomDropdown, DateRangeFilter } from '../common/DashboardFilters';
 
 const BookingsPage = () => {
     const [bookings, setBookings] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [showFilters, setShowFilters] = useState(false);
 
     // Search & Filter State
@@ -29,9 +31,9 @@ const BookingsPage = () => {
 
     const { user } = useAuth ? useAuth() : {};
 
-    const fetchBookings = async () => {
+    const fetchBookings = async (cursor = null) => {
         try {
-            setLoading(true);
+            cursor ? setLoadingMore(true) : setLoading(true);
             const token = localStorage.getItem('token');
 
             if (!token || !user) {
@@ -46,16 +48,19 @@ const BookingsPage = () => {
             if (filters.status && filters.status !== "All Statuses") filterParams.status = filters.status;
             if (filters.date_start) filterParams.date_start = filters.date_start;
             if (filters.date_end) filterParams.date_end = filters.date_end;
+            if (cursor) filterParams.cursor = cursor;
 
             const ownerId = user.owner_id || user.user_id;
             const data = await ownerService.getBookings(ownerId, filterParams, token);
 
-            setBookings(data.bookings || []);
+            setBookings(prev => cursor ? [...prev, ...(data.bookings || [])] : (data.bookings || []));
+            setNextCursor(data.next_cursor || null);
         } catch (error) {
             console.error("Error fetching bookings:", error);
-            setBookings([]);
+            if (!cursor) setBookings([]);
         } finally {
             setLoading(false);
+            setLoadingMore(false);
         }
     };
 
@@ -382,6 +387,17 @@ const BookingsPage = () => {
                         </tbody>
                     </table>
                 </div>
+                {nextCursor && !loading && (
+                    <div className="p-4 border-t border-gray-100 text-center">
+                        <button
+                            onClick={() => fetchBookings(nextCursor)}
+                            disabled={loadingMore}
+                            className="px-6 py-2 bg-blue-50 text-blue-600 font-bold rounded-lg hover:bg-blue-100 transition-all disabled:opacity-50"
+                        >
+                            {loadingMore ? 'Loading...' : 'Load more'}
+                        </button>
+                    </div>
+                )}
             </div>
 
             {/* Booking Details Modal */}
@@ -392,7 +408,7 @@ const BookingsPage = () => {
                         setShowBookingDetails(false);
                         setSelectedBooking(null);
                     }}
-                    onUpdateStatus={fetchBookings}
+                    onUpdateStatus={() => fetchBookings()}
                 />
             )}
         </div>
@@ -7,7 +7,9 @@ import PaymentDetailsModal from '../modals/PaymentDetailsModal';
 
 const PaymentsPage = () => {
     const [payments, setPayments] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [error, setError] = useState(null);
     const [showFilters, setShowFilters] = useState(false);
     const [showExportMenu, setShowExportMenu] = useState(false);
@@ -28,9 +30,9 @@ const PaymentsPage = () => {
 
     const { user } = useAuth ? useAuth() : {};
 
-    const fetchPayments = async () => {
+    const fetchPayments = async (cursor = null) => {
         try {
-            setLoading(true);
+            cursor ? setLoadingMore(true) : setLoading(true);
             setError(null);
             const token = localStorage.getItem('token');
 
@@ -47,6 +49,7 @@ const PaymentsPage = () => {
             if (filters.method && filters.method !== "All Methods") filterParams.method = filters.method;
             if (filters.date_start) filterParams.date_start = filters.date_start;
             if (filters.date_end) filterParams.date_end = filters.date_end;
+            if (cursor) filterParams.cursor = cursor;
 
             let data;
             if (user.role === 'admin') {
@@ -60,13 +63,15 @@ const PaymentsPage = () => {
                 return;
             }
 
-            setPayments(data.payments || []);
+            setPayments(prev => cursor ? [...prev, ...(data.payments || [])] : (data.payments || []));
+            setNextCursor(data.next_cursor || null);
         } catch (error) {
             console.error("Error fetching payments:", error);
             setError(error.message || 'Failed to load payments');
-            setPayments([]);
+            if (!cursor) setPayments([]);
         } finally {
             setLoading(false);
+            setLoadingMore(false);
         }
     };
 
@@ -377,6 +382,17 @@ const PaymentsPage = () => {
                         </tbody>
                     </table>
                 </div>
+                {nextCursor && !loading && (
+                    <div className="p-4 border-t border-gray-100 text-center">
+                        <button
+                            onClick={() => fetchPayments(nextCursor)}
+                            disabled={loadingMore}
+                            className="px-6 py-2 bg-blue-50 text-blue-600 font-bold rounded-lg hover:bg-blue-100 transition-all disabled:opacity-50"
+                        >
+                            {loadingMore ? 'Loading...' : 'Load more'}
+                        </button>
+                    </div>
+                )}
             </div>
 
             {/* Payment Details Modal */}
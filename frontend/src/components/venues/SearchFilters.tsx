@@ -1,5 +1,5 @@
 // src/components/venues/SearchFilters.jsx
-import { Search, ChevronDown, MapPin, Building2, Users, DollarSign, Check } from "lucide-react";
+import { Search, ChevronDown, MapPin, Building2, Users, DollarSign, Check, LocateFixed } from "lucide-react";
 import { useState, useRef, useEffect } from "react";
 import { venueService } from "../../services/api";
 
@@ -14,10 +14,14 @@ export interface FilterState {
   type: string;
   capacity: string;
   range: string;
+  distance: string;
+  lat?: number;
+  lng?: number;
 }
 
 const capacities = ["All Capacity", "50-100", "100-200", "200-500", "500+"];
 const ranges = ["All Range", "Under 50,000", "50,000 - 100,000", "100,000 - 200,000", "200,000+"];
+const distances = ["Anywhere", "Within 5 km", "Within 10 km", "Within 25 km", "Within 50 km"];
 
 // --- SearchFilters Component ---
 const SearchFilters = ({ onSearch, onFilterChange }: SearchFiltersProps) => {
@@ -27,7 +31,9 @@ const SearchFilters = ({ onSearch, onFilterChange }: SearchFiltersProps) => {
     type: "All Types",
     capacity: "All Capacity",
     range: "All Range",
+    distance: "Anywhere",
   });
+  const [locationError, setLocationError] = useState<string | null>(null);
 
   const [cityOptions, setCityOptions] = useState(["All Cities"]);
   const [typeOptions, setTypeOptions] = useState(["All Types"]);
@@ -55,6 +61,35 @@ const SearchFilters = ({ onSearch, onFilterChange }: SearchFiltersProps) => {
     onFilterChange(newFilters);
   };
 
+  // "Near me" needs the browser's location; without it the filter stays at "Anywhere"
+  const handleDistanceChange = (value: string) => {
+    setLocationError(null);
+    if (value === "Anywhere") {
+      const { lat, lng, ...rest } = filters;
+      const newFilters = { ...rest, distance: value };
+      setFilters(newFilters);
+      onFilterChange(newFilters);
+      return;
+    }
+    if (!navigator.geolocation) {
+      setLocationError("Your browser does not support location access.");
+      return;
+    }
+    navigator.geolocation.getCurrentPosition(
+      (position) => {
+        const newFilters = {
+          ...filters,
+          distance: value,
+          lat: position.coords.latitude,
+          lng: position.coords.longitude,
+        };
+        setFilters(newFilters);
+        onFilterChange(newFilters);
+      },
+      () => setLocationError("Allow location access to search venues near you.")
+    );
+  };
+
   return (
     <div className="relative mb-10 group z-30">
       {/* Background Layer - Handles glassmorphism and clips blobs */}
@@ -98,7 +133,7 @@ const SearchFilters = ({ onSearch, onFilterChange }: SearchFiltersProps) => {
         </div>
 
         {/* Filter Dropdowns */}
-        <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-4 gap-6">
+        <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-5 gap-6">
           <CustomDropdown
             icon={<MapPin className="w-5 h-5" />}
             label="City"
@@ -127,7 +162,17 @@ const SearchFilters = ({ onSearch, onFilterChange }: SearchFiltersProps) => {
             options={ranges}
             onChange={(value) => handleFilterChange("range", value)}
           />
+          <CustomDropdown
+            icon={<LocateFixed className="w-5 h-5" />}
+            label="Near Me"
+            value={filters.distance}
+            options={distances}
+            onChange={handleDistanceChange}
+          />
         </div>
+        {locationError && (
+          <p className="mt-4 text-sm font-medium text-red-600">{locationError}</p>
+        )}
       </div>
     </div>
   );
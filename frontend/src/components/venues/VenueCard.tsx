@@ -12,6 +12,7 @@ export interface Venue {
   city: string;
   type: string;
   capacity: string;
+  distance?: number;
 }
 
 interface VenueCardProps {
@@ -80,7 +81,10 @@ const VenueCard = ({ venue, index }: VenueCardProps) => {
               <div className="p-1.5 rounded-full bg-gray-50 text-gray-400 group-hover:bg-blue-50 group-hover:text-blue-500 transition-colors">
                 <MapPin className="h-4 w-4 shrink-0" />
               </div>
-              <span className="line-clamp-1 font-medium">{venue.city}</span>
+              <span className="line-clamp-1 font-medium">
+                {venue.city}
+                {venue.distance != null && ` · ${venue.distance} km away`}
+              </span>
             </div>
 
             <div className="flex items-center gap-3 text-sm text-gray-500 group-hover:text-gray-700 transition-colors">
@@ -20,6 +20,7 @@ interface Venue {
     city: string;
     type: string;
     capacity: string;
+    distance?: number;
 }
 
 interface PaginationInfo {
@@ -35,6 +36,7 @@ const Venues = () => {
         type: "All Types",
         capacity: "All Capacity",
         range: "All Range",
+        distance: "Anywhere",
     });
     const [sortBy, setSortBy] = useState<string>("popularity");
     const [currentPage, setCurrentPage] = useState<number>(1);
@@ -73,8 +75,9 @@ const Venues = () => {
                     break;
                 case "popularity":
                 default:
-                    sort_by = "rating";
-                    sort_order = "desc";
+                    // Near me results come nearest first
+                    sort_by = filters.lat != null ? "distance" : "rating";
+                    sort_order = filters.lat != null ? "asc" : "desc";
             }
 
             const apiFilters = {
@@ -96,7 +99,8 @@ const Venues = () => {
                 price: parseFloat(venue.base_price) || 0,
                 city: venue.city,
                 type: venue.type,
-                capacity: venue.capacity?.toString() || "100-200"
+                capacity: venue.capacity?.toString() || "100-200",
+                distance: venue.distance_km ?? undefined
             }));
 
             setVenues(transformedVenues);
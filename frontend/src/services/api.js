@@ -67,6 +67,13 @@ const convertToAPIFilters = (filters) => {
     }
   }
 
+  if (filters.distance && filters.distance !== "Anywhere" && filters.lat != null && filters.lng != null) {
+    // "Within 10 km" -> radius_km=10
+    apiFilters.lat = filters.lat;
+    apiFilters.lng = filters.lng;
+    apiFilters.radius_km = parseInt(filters.distance.replace("Within ", ""), 10);
+  }
+
   if (filters.sort_by) {
     apiFilters.sort_by = filters.sort_by;
     apiFilters.sort_order = filters.sort_order || 'desc';
@@ -148,6 +155,17 @@ export const venueService = {
     const response = await fetch(`${API_BASE_URL}/api/venues/filters`);
     return handleResponse(response);
   },
+  getSimilarVenues: async (venueId, limit = 6) => {
+    const response = await fetch(`${API_BASE_URL}/api/venues/${venueId}/similar?limit=${limit}`);
+    return handleResponse(response);
+  },
+  getVenueReviews: async (venueId, cursor = null, rating = null) => {
+    const params = new URLSearchParams();
+    if (cursor) params.append('cursor', cursor);
+    if (rating) params.append('rating', rating);
+    const response = await fetch(`${API_BASE_URL}/api/venues/${venueId}/reviews?${params.toString()}`);
+    return handleResponse(response);
+  },
   submitReview: async (venueId, reviewData, token) => {
     const response = await fetch(`${API_BASE_URL}/api/venues/${venueId}/reviews`, {
       method: 'POST',